@@ -0,0 +1,125 @@
+"""
+Benchmarks for parsing numeric lists into arrays.
+
+Compares parsing comma separated numbers into a :class:`list` against
+:class:`array.array`, :class:`numpy.ndarray` when NumPy is installed, and
+:class:`twelvefactor.SequenceView`, measuring the time per parse and the
+memory held by the result, writing the results as JSON. Items of a
+:class:`~twelvefactor.SequenceView` are only converted on access, so its time
+only covers encoding the value, and its memory includes the scanned offsets.
+
+.. code-block:: shell
+
+    python -m benchmarks.bench_arrays --output bench.json
+
+"""
+
+import itertools
+import random
+import sys
+import typing
+
+import twelvefactor
+
+from . import common
+
+SIZES = [100, 10000, 100000]
+
+SUBTYPES: typing.Dict[str, type] = {"int": int, "float": float}
+
+
+def types() -> typing.Dict[str, type]:
+    """
+    Get the collection types to compare.
+
+    :return: a mapping of names to types
+
+    """
+    result: typing.Dict[str, type] = {"list": list}
+    result.update((t.__module__, t) for t in twelvefactor.ARRAYS)
+    result["view"] = twelvefactor.SequenceView
+
+    return result
+
+
+def value(subtype: type, size: int) -> str:
+    """
+    Build a comma separated value of random numbers.
+
+    :param subtype: the type of the numbers
+    :param size: the number of numbers
+    :return: the raw value
+
+    """
+    numbers = (subtype(random.randrange(1 << 31)) for _ in range(size))
+
+    return ", ".join(str(n) for n in numbers)
+
+
+def footprint(result: typing.Any) -> int:
+    """
+    Measure the memory held by a parsed collection.
+
+    :param result: the parsed collection
+    :return: the size in bytes, including boxed elements of lists and the
+             buffers of views
+
+    """
+    size = sys.getsizeof(result)
+
+    if isinstance(result, twelvefactor.SequenceView):
+        size += sys.getsizeof(result.data) + sys.getsizeof(result.offsets)
+
+    if isinstance(result, list):
+        size += sum(sys.getsizeof(item) for item in result)
+
+    return size
+
+
+def run(
+    sizes: typing.Sequence[int], repeat: int
+) -> typing.List[common.Result]:
+    """
+    Run every benchmark.
+
+    :param sizes: the numbers of elements to benchmark
+    :param repeat: the number of runs per benchmark
+    :return: the results
+
+    """
+    config = twelvefactor.Config()
+    results = []
+
+    for (subtype_name, subtype), size, (type_name, type_) in itertools.product(
+        SUBTYPES.items(), sizes, types().items()
+    ):
+        raw = value(subtype, size)
+        parse = config.parser(type_, subtype)
+        timing = common.measure(lambda: parse(raw), repeat)
+
+        results.append(
+            dict(
+                timing,
+                type=type_name,
+                subtype=subtype_name,
+                elements=size,
+                bytes=footprint(parse(raw)),
+            )
+        )
+
+    return results
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> None:
+    parser = common.parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--elements", action="append", type=int, dest="sizes")
+
+    args = parser.parse_args(argv)
+
+    results = run(sizes=args.sizes or SIZES, repeat=args.repeat)
+
+    common.write(args.output, "arrays", results)
+
+
+if __name__ == "__main__":
+    main()
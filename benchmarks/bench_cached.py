@@ -0,0 +1,101 @@
+"""
+Benchmarks for :meth:`twelvefactor.Config.cached` against parsing.
+
+Measures loading values from a warm cache file against parsing them, for
+plain integer lists and for values post-processed by a mapper, writing the
+results as JSON.
+
+.. code-block:: shell
+
+    python -m benchmarks.bench_cached --output bench.json
+
+"""
+
+import collections
+import tempfile
+import typing
+
+import twelvefactor
+
+from . import common
+
+SIZES = [10, 100, 1000]
+
+
+def histogram(value: object) -> object:
+    """
+    Count the occurrences of each item, standing in for a slow mapper.
+
+    :param value: the parsed list
+    :return: the counts
+
+    """
+    return collections.Counter(typing.cast(typing.List[int], value))
+
+
+SCHEMAS: typing.Dict[str, twelvefactor.SchemaItem] = {
+    "list": {"type": list, "subtype": int},
+    "mapper": {"type": list, "subtype": int, "mapper": histogram},
+}
+
+
+def environ(keys: int) -> typing.Dict[str, str]:
+    """
+    Build an environment of integer lists.
+
+    :param keys: the number of variables
+    :return: the environment
+
+    """
+    raw = ",".join(str(i % 10) for i in range(100))
+
+    return {"KEY_{0}".format(i): raw for i in range(keys)}
+
+
+def run(
+    sizes: typing.Sequence[int], repeat: int
+) -> typing.List[common.Result]:
+    """
+    Run every benchmark.
+
+    :param sizes: the numbers of keys to benchmark
+    :param repeat: the number of runs per benchmark
+    :return: the results
+
+    """
+    results = []
+
+    for size in sizes:
+        config = twelvefactor.Config(environ=environ(size))
+
+        for name, item in SCHEMAS.items():
+            schema: twelvefactor.Schema = {key: item for key in config.environ}
+
+            with tempfile.TemporaryDirectory() as directory:
+                funcs = {
+                    "parse": lambda: config(schema),
+                    "cached": lambda: config.cached(schema, directory),
+                }
+
+                for mode, func in funcs.items():
+                    timing = common.measure(func, repeat)
+                    results.append(
+                        dict(timing, mode=mode, schema=name, keys=size)
+                    )
+
+    return results
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> None:
+    parser = common.parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--keys", action="append", type=int, dest="sizes")
+
+    args = parser.parse_args(argv)
+
+    results = run(sizes=args.sizes or SIZES, repeat=args.repeat)
+
+    common.write(args.output, "cached", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmarks for splitting collections with :class:`twelvefactor.Tokenizer`.
+
+Compares the default split and strip path against tokenizers with a custom
+delimiter, quoting, and escaping over long values, and against the
+equivalent nested collection, writing the results as JSON.
+
+.. code-block:: shell
+
+    python -m benchmarks.bench_collections --output bench.json
+
+"""
+
+import random
+import string
+import typing
+
+import twelvefactor
+
+from . import common
+
+SIZES = [100, 10000, 100000]
+
+TOKENIZERS: typing.Dict[str, typing.Optional[twelvefactor.Tokenizer]] = {
+    "split": None,
+    "delimiter": twelvefactor.Tokenizer(";"),
+    "quote": twelvefactor.Tokenizer(quote='"'),
+    "escape": twelvefactor.Tokenizer(quote='"', escape="\\"),
+}
+
+
+def value(tokenizer: twelvefactor.Tokenizer, size: int) -> str:
+    """
+    Build a delimited value of random words.
+
+    Every tenth word is quoted when the tokenizer quotes items.
+
+    :param tokenizer: the tokenizer the value is for
+    :param size: the number of words
+    :return: the raw value
+
+    """
+    words = (
+        "".join(random.choices(string.ascii_letters, k=8)) for _ in range(size)
+    )
+
+    if tokenizer.quote is not None:
+        words = (
+            tokenizer.quote + w + tokenizer.quote if i % 10 == 0 else w
+            for i, w in enumerate(words)
+        )
+
+    return (tokenizer.delimiter + " ").join(words)
+
+
+def run(
+    sizes: typing.Sequence[int], repeat: int
+) -> typing.List[common.Result]:
+    """
+    Run every benchmark.
+
+    :param sizes: the numbers of elements to benchmark
+    :param repeat: the number of runs per benchmark
+    :return: the results
+
+    """
+    config = twelvefactor.Config()
+    results = []
+
+    for size in sizes:
+        for name, tokenizer in TOKENIZERS.items():
+            raw = value(tokenizer or twelvefactor.Tokenizer(), size)
+            parse = config.parser(list, tokenizer=tokenizer)
+            timing = common.measure(lambda: parse(raw), repeat)
+
+            results.append(dict(timing, tokenizer=name, elements=size))
+
+        nested = twelvefactor.Tokenizer(";", subdelimiter=":")
+        raw = "; ".join("host{0}:{1}".format(i, 8000 + i) for i in range(size))
+        parse = config.parser(list, tuple, nested)
+        timing = common.measure(lambda: parse(raw), repeat)
+
+        results.append(dict(timing, tokenizer="nested", elements=size))
+
+    return results
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> None:
+    parser = common.parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--elements", action="append", type=int, dest="sizes")
+
+    args = parser.parse_args(argv)
+
+    results = run(sizes=args.sizes or SIZES, repeat=args.repeat)
+
+    common.write(args.output, "collections", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Benchmarks for :class:`twelvefactor.Config`.
+
+Measures :meth:`~twelvefactor.Config.__call__`,
+:meth:`~twelvefactor.Config.get`, and :meth:`~twelvefactor.Config.parse` over
+synthetic schemas and environments, writing the results as JSON.
+
+.. code-block:: shell
+
+    python -m benchmarks.bench_config --output bench.json
+
+"""
+
+import typing
+
+import twelvefactor
+
+from . import common
+
+TYPES: typing.Dict[str, typing.Tuple[type, type, str]] = {
+    "str": (str, str, "value"),
+    "bool": (bool, str, "true"),
+    "int": (int, str, "12345"),
+    "float": (float, str, "123.45"),
+    "complex": (complex, str, "1+2j"),
+    "list": (list, int, "12345"),
+    "tuple": (tuple, int, "12345"),
+    "set": (set, int, "12345"),
+    "frozenset": (frozenset, int, "12345"),
+}
+
+SCHEMA_SIZES = [10, 100, 1000, 10000]
+
+ENVIRON_SIZES = [100, 1000, 10000, 50000]
+
+
+def value(type_name: str, elements: int) -> str:
+    """
+    Build a raw environment value for a type.
+
+    :param type_name: the name of the type in :data:`TYPES`
+    :param elements: the number of elements for collection types
+    :return: the raw value
+
+    """
+    type_, _, raw = TYPES[type_name]
+
+    if issubclass(type_, twelvefactor.COLLECTIONS):
+        return ",".join(raw for _ in range(elements))
+
+    return raw
+
+
+def schema(type_name: str, size: int) -> twelvefactor.Schema:
+    """
+    Build a schema of a single type.
+
+    :param type_name: the name of the type in :data:`TYPES`
+    :param size: the number of keys
+    :return: the schema
+
+    """
+    type_, subtype, _ = TYPES[type_name]
+
+    return {
+        "KEY_{0}".format(i): {"type": type_, "subtype": subtype}
+        for i in range(size)
+    }
+
+
+def environ(
+    type_name: str, schema_size: int, size: int, elements: int
+) -> typing.Dict[str, str]:
+    """
+    Build an environment holding values for a schema plus unrelated filler.
+
+    :param type_name: the name of the type in :data:`TYPES`
+    :param schema_size: the number of keys in the schema
+    :param size: the total number of variables
+    :param elements: the number of elements for collection types
+    :return: the environment
+
+    """
+    raw = value(type_name, elements)
+    result = {"KEY_{0}".format(i): raw for i in range(schema_size)}
+    result.update(
+        ("FILLER_{0}".format(i), "filler") for i in range(size - schema_size)
+    )
+
+    return result
+
+
+def bench_parse(type_name: str, elements: int, repeat: int) -> common.Result:
+    type_, subtype, _ = TYPES[type_name]
+    parser = twelvefactor.Config(environ={})
+    raw = value(type_name, elements)
+
+    timing = common.measure(lambda: parser.parse(raw, type_, subtype), repeat)
+
+    return dict(timing, method="parse", type=type_name, elements=elements)
+
+
+def bench_get(
+    type_name: str, environ_size: int, elements: int, repeat: int
+) -> common.Result:
+    type_, subtype, _ = TYPES[type_name]
+    parser = twelvefactor.Config(
+        environ=environ(type_name, 1, environ_size, elements)
+    )
+
+    timing = common.measure(
+        lambda: parser.get("KEY_0", type_=type_, subtype=subtype), repeat
+    )
+
+    return dict(
+        timing,
+        method="get",
+        type=type_name,
+        environ_size=environ_size,
+        elements=elements,
+    )
+
+
+def bench_call(
+    type_name: str,
+    schema_size: int,
+    environ_size: int,
+    elements: int,
+    repeat: int,
+) -> common.Result:
+    parser = twelvefactor.Config(
+        environ=environ(type_name, schema_size, environ_size, elements)
+    )
+    config_schema = schema(type_name, schema_size)
+
+    timing = common.measure(lambda: parser(config_schema), repeat)
+
+    return dict(
+        timing,
+        method="__call__",
+        type=type_name,
+        schema_size=schema_size,
+        environ_size=environ_size,
+        elements=elements,
+    )
+
+
+def run(
+    types: typing.Sequence[str],
+    schema_sizes: typing.Sequence[int],
+    environ_sizes: typing.Sequence[int],
+    elements: int,
+    repeat: int,
+) -> typing.List[common.Result]:
+    """
+    Run every benchmark.
+
+    Combinations where the schema is larger than the environment are skipped.
+
+    :param types: the names of the types to benchmark
+    :param schema_sizes: the schema sizes to benchmark
+    :param environ_sizes: the environment sizes to benchmark
+    :param elements: the number of elements for collection types
+    :param repeat: the number of runs per benchmark
+    :return: the results
+
+    """
+    results = [bench_parse(t, elements, repeat) for t in types]
+    results += [
+        bench_get(t, e, elements, repeat) for t in types for e in environ_sizes
+    ]
+    results += [
+        bench_call(t, s, e, elements, repeat)
+        for t in types
+        for s in schema_sizes
+        for e in environ_sizes
+        if s <= e
+    ]
+
+    return results
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> None:
+    parser = common.parser(__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--type", action="append", choices=sorted(TYPES), dest="types"
+    )
+    parser.add_argument(
+        "--schema-size", action="append", type=int, dest="schema_sizes"
+    )
+    parser.add_argument(
+        "--environ-size", action="append", type=int, dest="environ_sizes"
+    )
+    parser.add_argument(
+        "--elements",
+        type=int,
+        default=1000,
+        help="number of elements in collection values",
+    )
+
+    args = parser.parse_args(argv)
+
+    results = run(
+        types=args.types or list(TYPES),
+        schema_sizes=args.schema_sizes or SCHEMA_SIZES,
+        environ_sizes=args.environ_sizes or ENVIRON_SIZES,
+        elements=args.elements,
+        repeat=args.repeat,
+    )
+
+    common.write(args.output, "config", results)
+
+
+if __name__ == "__main__":
+    main()
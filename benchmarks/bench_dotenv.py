@@ -0,0 +1,165 @@
+"""
+Benchmarks for :func:`twelvefactor.read_dotenv`.
+
+Compares the single pass tokenizer against a line by line parser over
+generated :code:`.env` files, writing the results as JSON.
+
+.. code-block:: shell
+
+    python -m benchmarks.bench_dotenv --output bench.json
+
+"""
+
+import os
+import tempfile
+import typing
+import unittest.mock as mock
+
+import twelvefactor
+
+from . import common
+
+SIZES = [1000, 10000, 100000]
+
+LINES = [
+    "# comment",
+    "export KEY_{0}=value_{0}",
+    "KEY_{0} = 'single quoted {0}'  # comment",
+    'KEY_{0}="double \\"quoted\\" {0}"',
+    "KEY_{0}=unquoted value {0} # comment",
+    "",
+]
+
+
+def contents(size: int) -> str:
+    """
+    Generate the contents of a :code:`.env` file.
+
+    :param size: the number of lines
+    :return: the contents
+
+    """
+    return "\n".join(LINES[i % len(LINES)].format(i) for i in range(size))
+
+
+def read_lines(path: str) -> typing.Dict[str, str]:
+    """
+    Read a :code:`.env` file one line at a time.
+
+    The baseline the tokenizer is compared to, supporting the same syntax
+    without multi-line values.
+
+    :param path: the path of the file
+    :return: a dictionary of the variables defined
+
+    """
+    values = {}
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+
+            if not line or line.startswith("#"):
+                continue
+
+            if line.startswith("export "):
+                line = line[7:]
+
+            key, _, value = line.partition("=")
+            values[key.strip()] = unquote(value.strip())
+
+    return values
+
+
+def unquote(value: str) -> str:
+    """
+    Remove the quotes and comment from a value.
+
+    :param value: the raw value
+    :return: the value
+
+    """
+    if value[:1] == "'":
+        end = value.index("'", 1)
+        return value[1:end]
+
+    if value[:1] == '"':
+        end = value.index('"', 1)
+
+        while value[end - 1] == "\\":
+            end = value.index('"', end + 1)
+
+        return value[1:end].replace('\\"', '"').replace("\\n", "\n")
+
+    return value.split(" #", 1)[0].rstrip()
+
+
+def bench(
+    name: str,
+    func: typing.Callable[[str], typing.Dict[str, str]],
+    path: str,
+    size: int,
+    repeat: int,
+    mmap: bool = False,
+) -> common.Result:
+    threshold = 0 if mmap else twelvefactor.MMAP_THRESHOLD
+
+    with mock.patch("twelvefactor.MMAP_THRESHOLD", threshold):
+        timing = common.measure(lambda: func(path), repeat)
+
+    return dict(timing, method=name, lines=size, bytes=os.path.getsize(path))
+
+
+def run(
+    sizes: typing.Sequence[int], repeat: int
+) -> typing.List[common.Result]:
+    """
+    Run every benchmark.
+
+    :param sizes: the numbers of lines to benchmark
+    :param repeat: the number of runs per benchmark
+    :return: the results
+
+    """
+    results = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            path = os.path.join(directory, "{0}.env".format(size))
+
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(contents(size))
+
+            assert read_lines(path) == twelvefactor.read_dotenv(path)
+
+            results += [
+                bench("read_lines", read_lines, path, size, repeat),
+                bench(
+                    "read_dotenv", twelvefactor.read_dotenv, path, size, repeat
+                ),
+                bench(
+                    "read_dotenv_mmap",
+                    twelvefactor.read_dotenv,
+                    path,
+                    size,
+                    repeat,
+                    mmap=True,
+                ),
+            ]
+
+    return results
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> None:
+    parser = common.parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", action="append", type=int, dest="sizes")
+
+    args = parser.parse_args(argv)
+
+    results = run(sizes=args.sizes or SIZES, repeat=args.repeat)
+
+    common.write(args.output, "dotenv", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Benchmarks for :meth:`twelvefactor.Config.materialize` against dictionaries.
+
+Measures the memory held by each copy of the config values, and the time to
+build the values and to read one of them by attribute or by key, for a
+:class:`dict` and a :class:`twelvefactor.ConfigObject`, writing the results
+as JSON.
+
+.. code-block:: shell
+
+    python -m benchmarks.bench_materialize --output bench.json
+
+"""
+
+import gc
+import operator
+import tracemalloc
+import typing
+
+import twelvefactor
+
+from . import common
+
+SIZES = [10, 100, 1000]
+
+COPIES = 1000
+
+
+def environ(keys: int) -> typing.Dict[str, str]:
+    """
+    Build an environment of integers.
+
+    :param keys: the number of variables
+    :return: the environment
+
+    """
+    return {"KEY_{0}".format(i): str(i) for i in range(keys)}
+
+
+def memory(build: typing.Callable[[], object], copies: int) -> float:
+    """
+    Measure the memory allocated by each result of a function.
+
+    The config values themselves are shared between the results, so only the
+    container holding them is measured.
+
+    :param build: the function building a container of the config values
+    :param copies: the number of results to keep alive while measuring
+    :return: the bytes allocated per result
+
+    """
+    results: typing.List[object] = [None] * copies
+
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+
+        for i in range(copies):
+            results[i] = build()
+
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return (after - before) / copies
+
+
+def measure(
+    funcs: typing.Mapping[str, typing.Callable[[], object]], repeat: int
+) -> common.Result:
+    """
+    Measure the memory and timings of a mode.
+
+    :param funcs: the functions of the mode, :code:`copy` is measured for
+                  memory and the others are timed
+    :param repeat: the number of runs per benchmark
+    :return: the bytes per copy, and the best and median seconds per call of
+             each timed function
+
+    """
+    result: common.Result = {}
+
+    for name, func in funcs.items():
+        if name == "copy":
+            result["bytes"] = memory(func, COPIES)
+        else:
+            timing = common.measure(func, repeat)
+            result[name] = timing["best"]
+            result[name + "_median"] = timing["median"]
+
+    return result
+
+
+def run(
+    sizes: typing.Sequence[int], repeat: int
+) -> typing.List[common.Result]:
+    """
+    Run every benchmark.
+
+    :param sizes: the numbers of keys to benchmark
+    :param repeat: the number of runs per benchmark
+    :return: the results
+
+    """
+    results = []
+
+    for size in sizes:
+        config = twelvefactor.Config(environ=environ(size))
+        schema: twelvefactor.Schema = {key: int for key in config.environ}
+        compiled = config.compile(schema)
+        values = compiled()
+        key = "KEY_{0}".format(size // 2)
+        items, objects = dict(values), compiled.materialize()
+        item, attr = operator.itemgetter(key), operator.attrgetter(key)
+
+        modes: typing.Dict[
+            str, typing.Dict[str, typing.Callable[[], object]]
+        ] = {
+            "dict": {
+                "copy": lambda: dict(values),
+                "build": compiled,
+                "read": lambda: item(items),
+            },
+            "object": {
+                "copy": lambda: compiled.type(**values),
+                "build": compiled.materialize,
+                "read": lambda: attr(objects),
+            },
+            "object-mapping": {"read": lambda: item(objects)},
+        }
+
+        for mode, funcs in modes.items():
+            results.append(dict(measure(funcs, repeat), mode=mode, keys=size))
+
+    return results
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> None:
+    parser = common.parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--keys", action="append", type=int, dest="sizes")
+
+    args = parser.parse_args(argv)
+
+    results = run(sizes=args.sizes or SIZES, repeat=args.repeat)
+
+    common.write(args.output, "materialize", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+Benchmarks for :meth:`twelvefactor.Config.preload` with forked workers.
+
+Forks worker processes that either parse the config themselves or share a
+copy preloaded by their parent, and reports the boot time and the aggregate
+proportional (PSS) and unique (USS) set size of the workers as JSON.  Memory
+is read from ``/proc/self/smaps_rollup``, so it is only reported on Linux.
+
+.. code-block:: shell
+
+    python -m benchmarks.bench_preload --workers 8 --output bench.json
+
+"""
+
+import gc
+import json
+import os
+import statistics
+import time
+import typing
+
+import twelvefactor
+
+from . import common
+
+Load = typing.Callable[[], typing.Mapping[str, typing.Any]]
+
+MODES = ["parse", "preload", "preload-nofreeze"]
+
+WORKERS = 4
+
+KEYS = 1000
+
+
+def environ(keys: int) -> typing.Dict[str, str]:
+    """
+    Build an environment of integer lists.
+
+    :param keys: the number of variables
+    :return: the environment
+
+    """
+    raw = ",".join(str(i) for i in range(100))
+
+    return {"KEY_{0}".format(i): raw for i in range(keys)}
+
+
+def memory() -> typing.Dict[str, int]:
+    """
+    Read the memory of the current process.
+
+    :return: the proportional and unique set size in kB, or an empty dict when
+             ``/proc/self/smaps_rollup`` is not available
+
+    """
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            lines = [line.split() for line in f]
+    except OSError:
+        return {}
+
+    sizes = {s[0].rstrip(":"): int(s[1]) for s in lines if len(s) == 3}
+
+    return {
+        "pss": sizes["Pss"],
+        "uss": sizes["Private_Clean"] + sizes["Private_Dirty"],
+    }
+
+
+def worker(load: Load, started: float, report: int, release: int) -> None:
+    """
+    Load the config in a worker and report its boot time and memory.
+
+    Every value is touched before memory is read, and the worker waits for
+    ``release`` to close so that all workers are alive while they measure.
+
+    :param load: the function loading the config
+    :param started: the monotonic time before the worker was forked
+    :param report: the pipe to write the JSON report to
+    :param release: the pipe to wait on before exiting
+
+    """
+    values = load()
+    boot = time.monotonic() - started
+
+    for value in values.values():
+        len(value)
+
+    gc.collect()
+
+    os.write(report, (json.dumps(dict(memory(), boot=boot)) + "\n").encode())
+    os.read(release, 1)
+
+
+def spawn(load: Load, workers: int) -> typing.List[common.Result]:
+    """
+    Fork workers and collect their reports.
+
+    :param load: the function loading the config
+    :param workers: the number of workers
+    :return: the report of every worker
+
+    """
+    report_r, report_w = os.pipe()
+    release_r, release_w = os.pipe()
+    pids = []
+
+    for _ in range(workers):
+        started = time.monotonic()
+        pid = os.fork()
+
+        if pid == 0:
+            try:
+                os.close(report_r)
+                os.close(release_w)
+                worker(load, started, report_w, release_r)
+            finally:
+                os._exit(0)
+
+        pids.append(pid)
+
+    os.close(report_w)
+    os.close(release_r)
+
+    with os.fdopen(report_r) as reports:
+        results = [json.loads(reports.readline()) for _ in range(workers)]
+
+    os.close(release_w)
+
+    for pid in pids:
+        os.waitpid(pid, 0)
+
+    return results
+
+
+def loader(mode: str, keys: int) -> Load:
+    """
+    Set up the config in the parent for a mode.
+
+    :param mode: the name of the mode in :data:`MODES`
+    :param keys: the number of variables
+    :return: the function loading the config in a worker
+
+    """
+    config = twelvefactor.Config(environ=environ(keys))
+    schema: twelvefactor.Schema = {
+        key: {"type": list, "subtype": int} for key in config.environ
+    }
+
+    if mode == "parse":
+        return lambda: config(schema)
+
+    preloader = config.preload(schema, freeze=mode == "preload")
+
+    return lambda: preloader.current
+
+
+def summarize(
+    mode: str, keys: int, reports: typing.List[common.Result]
+) -> common.Result:
+    """
+    Aggregate the reports of the workers of a mode.
+
+    :param mode: the name of the mode
+    :param keys: the number of variables
+    :param reports: the report of every worker
+    :return: the result
+
+    """
+    boots = [r["boot"] for r in reports]
+    result = {
+        "mode": mode,
+        "keys": keys,
+        "workers": len(reports),
+        "boot_best": min(boots),
+        "boot_median": statistics.median(boots),
+    }
+
+    for size in ("pss", "uss"):
+        if all(size in r for r in reports):
+            result[size] = sum(r[size] for r in reports)
+
+    return result
+
+
+def run(mode: str, keys: int, workers: int) -> common.Result:
+    """
+    Run a mode in a forked master process.
+
+    Each mode gets its own master so that :func:`gc.freeze` and the parsed
+    values of one mode do not leak into the next.
+
+    :param mode: the name of the mode in :data:`MODES`
+    :param keys: the number of variables
+    :param workers: the number of workers
+    :return: the result
+
+    """
+    read, write = os.pipe()
+    pid = os.fork()
+
+    if pid == 0:
+        try:
+            os.close(read)
+            reports = spawn(loader(mode, keys), workers)
+
+            with os.fdopen(write, "w") as output:
+                json.dump(summarize(mode, keys, reports), output)
+        finally:
+            os._exit(0)
+
+    os.close(write)
+
+    with os.fdopen(read) as output:
+        result: common.Result = json.load(output)
+
+    os.waitpid(pid, 0)
+
+    return result
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> None:
+    parser = common.parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--keys", action="append", type=int)
+
+    args = parser.parse_args(argv)
+
+    results = [
+        dict(run(mode, keys, args.workers), repeat=repeat)
+        for keys in args.keys or [KEYS]
+        for mode in MODES
+        for repeat in range(args.repeat)
+    ]
+
+    common.write(args.output, "preload", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmarks for :meth:`twelvefactor.Config.attach` against parsing.
+
+Measures the startup cost of a worker which parses the environment itself
+against one which attaches a block written by
+:meth:`~twelvefactor.Config.share`, either reading every value or none,
+writing the results as JSON.
+
+.. code-block:: shell
+
+    python -m benchmarks.bench_shared --output bench.json
+
+"""
+
+import typing
+
+import twelvefactor
+
+from . import common
+
+SIZES = [10, 100, 1000]
+
+
+def environ(keys: int) -> typing.Dict[str, str]:
+    """
+    Build an environment of integer lists.
+
+    :param keys: the number of variables
+    :return: the environment
+
+    """
+    raw = ",".join(str(i) for i in range(100))
+
+    return {"KEY_{0}".format(i): raw for i in range(keys)}
+
+
+def attach(
+    config: twelvefactor.Config, schema: twelvefactor.Schema, name: str
+) -> typing.Callable[[], object]:
+    """
+    Build a function attaching a block and reading every value.
+
+    :param config: the config to attach with
+    :param schema: the schema of the block
+    :param name: the name of the block
+    :return: the function
+
+    """
+
+    def read() -> object:
+        shared = config.attach(schema, name)
+        values = dict(shared)
+        shared.close()
+
+        return values
+
+    return read
+
+
+def run(
+    sizes: typing.Sequence[int], repeat: int
+) -> typing.List[common.Result]:
+    """
+    Run every benchmark.
+
+    :param sizes: the numbers of keys to benchmark
+    :param repeat: the number of runs per benchmark
+    :return: the results
+
+    """
+    results = []
+
+    for size in sizes:
+        config = twelvefactor.Config(environ=environ(size))
+        schema: twelvefactor.Schema = {
+            key: {"type": list, "subtype": int} for key in config.environ
+        }
+        block = config.share(schema)
+
+        funcs = {
+            "parse": lambda: config(schema),
+            "attach": lambda: config.attach(schema, block.name).close(),
+            "attach-read": attach(config, schema, block.name),
+        }
+
+        for name, func in funcs.items():
+            timing = common.measure(func, repeat)
+            results.append(dict(timing, mode=name, keys=size))
+
+        block.close()
+        block.unlink()
+
+    return results
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> None:
+    parser = common.parser(__doc__.strip().splitlines()[0])
+    parser.add_argument("--keys", action="append", type=int, dest="sizes")
+
+    args = parser.parse_args(argv)
+
+    results = run(sizes=args.sizes or SIZES, repeat=args.repeat)
+
+    common.write(args.output, "shared", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import json
+import platform
+import statistics
+import sys
+import timeit
+import typing
+
+Result = typing.Dict[str, typing.Any]
+
+
+def measure(
+    func: typing.Callable[[], object], repeat: int
+) -> typing.Dict[str, typing.Any]:
+    """
+    Time a function.
+
+    The number of calls per run is picked automatically so that each run takes
+    at least 0.2 seconds.
+
+    :param func: the function to time
+    :param repeat: the number of runs
+    :return: the number of calls per run, and the best and median seconds per
+             call
+
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+
+    return {
+        "number": number,
+        "best": min(times),
+        "median": statistics.median(times),
+    }
+
+
+def parser(description: str) -> argparse.ArgumentParser:
+    """
+    Create an argument parser with the options shared by every benchmark.
+
+    :param description: description of the benchmark
+    :return: the argument parser
+
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="number of runs per benchmark"
+    )
+    parser.add_argument(
+        "--output",
+        type=argparse.FileType("w"),
+        default=sys.stdout,
+        help="file to write the JSON results to",
+    )
+
+    return parser
+
+
+def write(
+    output: typing.TextIO, benchmark: str, results: typing.List[Result]
+) -> None:
+    """
+    Write benchmark results as JSON.
+
+    :param output: the file to write to
+    :param benchmark: the name of the benchmark suite
+    :param results: the results to write
+
+    """
+    json.dump(
+        {
+            "benchmark": benchmark,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "results": results,
+        },
+        output,
+        indent=2,
+    )
+    output.write("\n")
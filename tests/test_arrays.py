@@ -0,0 +1,72 @@
+import array
+import typing
+
+import hypothesis
+import hypothesis.strategies as st
+import pytest
+
+import twelvefactor
+
+int64 = st.integers(min_value=-(2**63), max_value=2**63 - 1)
+
+
+@hypothesis.given(values=st.lists(int64))
+def test_it_should_parse_int_arrays(values: typing.List[int]) -> None:
+    config = twelvefactor.Config()
+    value = ", ".join(str(v) for v in values)
+
+    result = config.parse(value, array.array, int)
+
+    assert result == array.array("q", values)
+    assert list(result) == config.parse(value, list, int)
+
+
+@hypothesis.given(
+    values=st.lists(st.floats(allow_nan=False, allow_infinity=False))
+)
+def test_it_should_parse_float_arrays(values: typing.List[float]) -> None:
+    config = twelvefactor.Config()
+    value = ",".join(repr(v) for v in values)
+
+    assert config.parse(value, array.array, float) == array.array("d", values)
+
+
+@pytest.mark.parametrize(
+    "value,subtype",
+    [("1,,2", int), ("1.5", int), (str(2**63), int), ("a", float)],
+)
+def test_it_should_throw_on_invalid_items(
+    value: str, subtype: typing.Type[typing.Any]
+) -> None:
+    with pytest.raises(twelvefactor.ConfigError):
+        twelvefactor.Config().parse(value, array.array, subtype)
+
+
+def test_it_should_throw_on_unsupported_subtypes() -> None:
+    with pytest.raises(twelvefactor.ConfigError, match="Unsupported array"):
+        twelvefactor.Config().parse("1", array.array, str)
+
+
+def test_it_should_generate_array_parsers() -> None:
+    config = twelvefactor.Config(environ={"PORTS": "80, 443"})
+    schema: twelvefactor.Schema = {
+        "PORTS": {"type": array.array, "subtype": int},
+        "WEIGHTS": {"type": array.array, "subtype": float, "default": None},
+    }
+
+    expected = {"PORTS": array.array("q", [80, 443]), "WEIGHTS": None}
+
+    assert config(schema) == expected
+    assert config.codegen(schema)() == expected
+    assert "twelvefactor._" not in config.generate(schema, standalone=True)
+
+
+@hypothesis.given(values=st.lists(int64))
+def test_it_should_parse_numpy_arrays(values: typing.List[int]) -> None:
+    numpy = pytest.importorskip("numpy")
+
+    value = ",".join(str(v) for v in values)
+    result = twelvefactor.Config().parse(value, numpy.ndarray, int)
+
+    assert result.dtype == numpy.int64
+    assert result.tolist() == values
@@ -0,0 +1,120 @@
+import asyncio
+import time
+import typing
+
+import hypothesis
+import hypothesis.strategies as st
+import pytest
+
+import twelvefactor
+
+
+def run(coroutine: typing.Awaitable[typing.Any]) -> typing.Any:
+    loop = asyncio.new_event_loop()
+
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+@hypothesis.given(
+    environ=st.dictionaries(keys=st.text(), values=st.integers())
+)
+def test_it_should_match_call(environ: typing.Dict[str, int]) -> None:
+    config = twelvefactor.Config(
+        environ={k: str(v) for k, v in environ.items()}
+    )
+
+    schema = {k: int for k in environ}
+
+    assert run(config.aload(schema)) == config(schema)
+
+
+def test_it_should_await_coroutine_mappers() -> None:
+    async def double(value: object) -> object:
+        await asyncio.sleep(0)
+        return typing.cast(int, value) * 2
+
+    config = twelvefactor.Config(environ={"PORT": "80"})
+
+    assert run(config.aget("PORT", type_=int, mapper=double)) == 160
+    assert run(config.aget("PORT", type_=int, mapper=str)) == "80"
+    assert run(config.aget("HOST", default="", mapper=double)) == ""
+
+
+def test_it_should_fetch_missing_values_from_sources() -> None:
+    async def source(key: str) -> typing.Optional[str]:
+        return {"PORT": "8000", "HOST": "example.com"}.get(key)
+
+    config = twelvefactor.Config(environ={"HOST": "localhost"})
+    schema: twelvefactor.Schema = {
+        "HOST": str,
+        "PORT": int,
+        "DEBUG": {"default": False},
+    }
+
+    assert run(config.aload(schema, source=source)) == {
+        "HOST": "localhost",
+        "PORT": 8000,
+        "DEBUG": False,
+    }
+
+    with pytest.raises(twelvefactor.ConfigError):
+        run(config.aget("SECRET_KEY", source=source))
+
+
+def test_it_should_load_keys_concurrently() -> None:
+    async def slow(value: object) -> object:
+        await asyncio.sleep(0.1)
+        return value
+
+    config = twelvefactor.Config(environ={})
+    schema: twelvefactor.Schema = {
+        str(i): {"default": i, "mapper": slow} for i in range(10)
+    }
+
+    start = time.perf_counter()
+    values = run(config.aload(schema))
+
+    assert time.perf_counter() - start < 0.5
+    assert list(values.items()) == [(str(i), i) for i in range(10)]
+
+
+def test_it_should_limit_concurrency() -> None:
+    running = []
+    peak = []
+
+    async def track(value: object) -> object:
+        running.append(value)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(value)
+        return value
+
+    config = twelvefactor.Config(environ={})
+    schema: twelvefactor.Schema = {
+        str(i): {"default": i, "mapper": track} for i in range(10)
+    }
+
+    run(config.aload(schema, limit=3))
+
+    assert max(peak) == 3
+
+
+def test_it_should_not_cache_coroutine_mappers() -> None:
+    calls = []
+
+    async def double(value: object) -> object:
+        calls.append(value)
+        return typing.cast(int, value) * 2
+
+    config = twelvefactor.Config(environ={"PORT": "80"})
+    schema: twelvefactor.Schema = {
+        "PORT": {"type": int, "mapper": double, "cache_mapper": True}
+    }
+
+    assert run(config.aload(schema)) == {"PORT": 160}
+    assert run(config.aload(schema)) == {"PORT": 160}
+    assert len(calls) == 2
+    assert twelvefactor.mapper_cache(double) is None
@@ -0,0 +1,109 @@
+import typing
+
+import hypothesis
+import hypothesis.strategies as st
+import pytest
+
+import twelvefactor
+
+
+@hypothesis.given(value=st.integers())
+def test_it_should_match_uncached_parse(value: int) -> None:
+    config = twelvefactor.Config(cache_size=10)
+
+    assert config.parse(str(value), int) == value
+    assert config.parse(str(value), int) == value
+
+
+def test_it_should_be_disabled_by_default() -> None:
+    config = twelvefactor.Config()
+
+    assert config.cache is None
+
+
+def test_it_should_count_hits_and_misses() -> None:
+    config = twelvefactor.Config(cache_size=10)
+    cache = typing.cast(twelvefactor.LRUCache, config.cache)
+
+    config.parse("true", bool)
+    config.parse("true", bool)
+    config.parse("true", str)
+
+    assert cache.hits == 1
+    assert cache.misses == 2
+    assert len(cache) == 2
+
+
+def test_it_should_evict_least_recently_used() -> None:
+    config = twelvefactor.Config(cache_size=2)
+    cache = typing.cast(twelvefactor.LRUCache, config.cache)
+
+    config.parse("1", int)
+    config.parse("2", int)
+    config.parse("1", int)
+    config.parse("3", int)
+
+    assert cache.evictions == 1
+    assert ("1", int, str) in cache.data
+    assert ("2", int, str) not in cache.data
+
+
+def test_it_should_return_fresh_copies_of_mutable_values() -> None:
+    config = twelvefactor.Config(cache_size=10)
+
+    first = config.parse("1,2,3", list, int)
+    first.append(4)
+
+    second = config.parse("1,2,3", list, int)
+    second.append(5)
+
+    assert config.parse("1,2,3", list, int) == [1, 2, 3]
+    assert second is not first
+
+
+def test_it_should_share_immutable_values() -> None:
+    config = twelvefactor.Config(cache_size=10)
+
+    first = config.parse("1,2,3", tuple, int)
+
+    assert config.parse("1,2,3", tuple, int) is first
+
+
+def test_it_should_not_cache_errors() -> None:
+    config = twelvefactor.Config(cache_size=10)
+
+    for _ in range(2):
+        with pytest.raises(twelvefactor.ConfigError):
+            config.parse("abc", int)
+
+    assert len(typing.cast(twelvefactor.LRUCache, config.cache)) == 0
+
+
+def test_it_should_cache_compiled_schemas() -> None:
+    config = twelvefactor.Config(
+        environ={"FOO": "1,2", "BAR": "1,2"}, cache_size=10
+    )
+    cache = typing.cast(twelvefactor.LRUCache, config.cache)
+
+    compiled = config.compile(
+        {
+            "FOO": {"type": list, "subtype": int},
+            "BAR": {"type": list, "subtype": int},
+        }
+    )
+
+    result = compiled()
+
+    assert result == {"FOO": [1, 2], "BAR": [1, 2]}
+    assert result["FOO"] is not result["BAR"]
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_it_should_clear() -> None:
+    cache = twelvefactor.LRUCache(10)
+
+    cache.set("foo", "bar")
+    cache.clear()
+
+    assert cache.get("foo") is None
@@ -0,0 +1,213 @@
+import concurrent.futures
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import threading
+import typing
+
+import pytest
+
+import twelvefactor
+
+calls: typing.List[object] = []
+
+SCRIPT = """
+import json
+import sys
+
+import twelvefactor
+
+calls = []
+
+
+def scale(n):
+    return lambda v: v * n
+
+
+schema = {
+    "PORT": {"type": int, "mapper": lambda v: calls.append(v) or v + %d},
+    "WORKERS": {"type": int, "mapper": scale(2)},
+}
+values = twelvefactor.Config(environ={"PORT": "80", "WORKERS": "2"}).cached(
+    schema, sys.argv[1]
+)
+print(json.dumps([values, len(calls)]))
+"""
+
+
+def hosts(value: object) -> object:
+    calls.append(value)
+
+    return tuple(typing.cast(typing.List[str], value))
+
+
+SCHEMA: twelvefactor.Schema = {
+    "PORT": int,
+    "HOSTS": {"type": list, "mapper": hosts},
+    "WORKER": {"type": int, "persist": False},
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_calls() -> None:
+    calls.clear()
+
+
+def test_it_should_load_cached_values(tmp_path: pathlib.Path) -> None:
+    environ = {"PORT": "80", "HOSTS": "a, b", "WORKER": "1"}
+    expected = {"PORT": 80, "HOSTS": ("a", "b"), "WORKER": 1}
+    config = twelvefactor.Config(environ=environ)
+
+    assert config.cached(SCHEMA, tmp_path) == expected
+    assert config.cached(SCHEMA, tmp_path) == expected
+    assert len(calls) == 1
+    assert [p.suffix for p in tmp_path.iterdir()] == [".pickle"]
+
+    environ["WORKER"] = "2"
+
+    assert config.compile(SCHEMA).cached(str(tmp_path))["WORKER"] == 2
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize(
+    "environ,schema",
+    [
+        ({"PORT": "81", "HOSTS": "a"}, SCHEMA),
+        ({"PORT": "80", "HOSTS": "a, c"}, SCHEMA),
+        ({"PORT": "80", "HOSTS": "a"}, dict(SCHEMA, PORT=str)),
+    ],
+)
+def test_it_should_not_load_stale_values(
+    tmp_path: pathlib.Path,
+    environ: typing.Dict[str, str],
+    schema: twelvefactor.Schema,
+) -> None:
+    twelvefactor.Config(
+        environ={"PORT": "80", "HOSTS": "a", "WORKER": "1"}
+    ).cached(SCHEMA, tmp_path)
+
+    config = twelvefactor.Config(environ=dict(environ, WORKER="1"))
+
+    assert config.cached(schema, tmp_path) == config(schema)
+    assert len(calls) == 3
+
+
+def test_it_should_not_load_stale_files(tmp_path: pathlib.Path) -> None:
+    secret = tmp_path / "secret"
+    config = twelvefactor.Config(environ={"SECRET_FILE": str(secret)})
+    schema: twelvefactor.Schema = {"SECRET": {"file": True}}
+
+    secret.write_text("a")
+
+    assert config.cached(schema, tmp_path / "cache") == {"SECRET": "a"}
+
+    secret.write_text("bc")
+
+    assert config.cached(schema, tmp_path / "cache") == {"SECRET": "bc"}
+
+
+def test_it_should_ignore_invalid_caches(tmp_path: pathlib.Path) -> None:
+    config = twelvefactor.Config(environ={"PORT": "80"})
+
+    config.cached({"PORT": int}, tmp_path)
+
+    for path in tmp_path.iterdir():
+        path.write_bytes(path.read_bytes()[:-1])
+
+    assert config.cached({"PORT": int}, tmp_path) == {"PORT": 80}
+    assert config.cached({"PORT": int}, tmp_path / "x" / "y") == {"PORT": 80}
+    assert config.cached({"PORT": int}, tmp_path / "x" / "y") == {"PORT": 80}
+
+    unwritable = tmp_path / "file"
+    unwritable.write_text("")
+
+    assert config.cached({"PORT": int}, unwritable) == {"PORT": 80}
+
+
+def test_it_should_support_concurrent_writers(tmp_path: pathlib.Path) -> None:
+    config = twelvefactor.Config(environ={"PORT": "80", "HOSTS": "a, b"})
+    schema: twelvefactor.Schema = dict(
+        SCHEMA, WORKER={"type": int, "default": 0}
+    )
+
+    with concurrent.futures.ThreadPoolExecutor(8) as executor:
+        results = list(
+            executor.map(lambda _: config.cached(schema, tmp_path), range(32))
+        )
+
+    assert all(
+        r == {"PORT": 80, "HOSTS": ("a", "b"), "WORKER": 0} for r in results
+    )
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def lock(value: object) -> object:
+    calls.append(value)
+
+    return threading.Lock()
+
+
+@pytest.mark.parametrize(
+    "item",
+    [
+        {"mapper": lambda v: lambda: v},
+        {"mapper": lock},
+        {"type": twelvefactor.SequenceView, "subtype": int},
+    ],
+)
+def test_it_should_not_cache_unpicklable_values(
+    tmp_path: pathlib.Path, item: twelvefactor.SchemaItem
+) -> None:
+    config = twelvefactor.Config(environ={"PORT": "80", "HOSTS": "a, b"})
+    schema: twelvefactor.Schema = {"PORT": item, "HOSTS": SCHEMA["HOSTS"]}
+
+    first = config.cached(schema, tmp_path)["PORT"]
+    second = config.cached(schema, tmp_path)
+
+    assert type(second["PORT"]) is type(first)
+    assert second["HOSTS"] == ("a", "b")
+    assert calls.count(["a", "b"]) == 1
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def run(
+    script: pathlib.Path, increment: int, directory: pathlib.Path
+) -> object:
+    script.write_text(SCRIPT % increment)
+    environ = dict(
+        os.environ, PYTHONPATH=os.path.dirname(twelvefactor.__file__)
+    )
+    output = subprocess.check_output(
+        [sys.executable, str(script), str(directory)], env=environ
+    )
+
+    return json.loads(output)
+
+
+def test_it_should_load_cached_values_in_other_processes(
+    tmp_path: pathlib.Path,
+) -> None:
+    script = tmp_path / "script.py"
+    cache = tmp_path / "cache"
+    values = {"PORT": 81, "WORKERS": 4}
+
+    assert run(script, 1, cache) == [values, 1]
+    assert run(script, 1, cache) == [values, 0]
+    assert len(list(cache.iterdir())) == 1
+    assert run(script, 2, cache) == [dict(values, PORT=82), 1]
+
+
+def test_it_should_not_load_values_of_other_versions(
+    tmp_path: pathlib.Path,
+) -> None:
+    config = twelvefactor.Config(
+        environ={"PORT": "80", "HOSTS": "a", "WORKER": "1"}
+    )
+
+    config.cached(SCHEMA, tmp_path, version="1")
+    config.compile(SCHEMA).cached(tmp_path, version="1")
+    config.cached(SCHEMA, tmp_path, version="2")
+
+    assert len(calls) == 2
@@ -0,0 +1,109 @@
+import typing
+import unittest.mock as mock
+
+import hypothesis
+import hypothesis.strategies as st
+import pytest
+
+import twelvefactor
+
+SIMPLE_OBJECTS: typing.List[st.SearchStrategy[typing.Any]] = [
+    st.booleans(),
+    st.text(),
+    st.integers(),
+    st.floats(allow_nan=False),
+]
+
+SIMPLE_SCHEMA = st.lists(
+    elements=st.tuples(
+        # KEY
+        st.text(),
+        # VALUE
+        st.one_of(SIMPLE_OBJECTS),
+    ),
+    unique_by=lambda x: x[0],
+)
+
+
+@hypothesis.given(
+    schema=st.shared(SIMPLE_SCHEMA, key="data").map(
+        lambda x: {k: type(v) for k, v in x}
+    ),
+    environ=st.shared(SIMPLE_SCHEMA, key="data").map(
+        lambda x: {k: str(v) for k, v in x}
+    ),
+)
+def test_it_should_match_call(
+    schema: twelvefactor.Schema, environ: typing.Dict[str, str]
+) -> None:
+    config = twelvefactor.Config(environ=environ)
+
+    assert config.compile(schema)() == config(schema)
+
+
+@hypothesis.given(
+    value=st.lists(elements=st.integers().filter(lambda x: x >= 0), min_size=1)
+)
+def test_it_should_handle_collections(value: typing.List[int]) -> None:
+    config = twelvefactor.Config()
+
+    compiled = config.compile(
+        {"FOO": {"key": "BAR", "type": tuple, "subtype": int}}
+    )
+
+    result = compiled({"BAR": " , ".join(str(v) for v in value)})
+
+    assert result == {"FOO": tuple(value)}
+
+
+@hypothesis.given(environ=st.dictionaries(keys=st.text(), values=st.text()))
+def test_it_should_use_config_environ_by_default(
+    environ: typing.Dict[str, str],
+) -> None:
+    config = twelvefactor.Config(environ=environ)
+
+    compiled = config.compile({k: str for k in environ})
+
+    assert compiled() == environ
+
+
+def test_it_should_be_reusable_across_environments() -> None:
+    config = twelvefactor.Config()
+
+    compiled = config.compile({"PORT": int})
+
+    assert compiled({"PORT": "80"}) == {"PORT": 80}
+    assert compiled({"PORT": "443"}) == {"PORT": 443}
+
+
+def test_it_should_apply_defaults_and_mappers() -> None:
+    config = twelvefactor.Config()
+    mapper = mock.Mock(return_value="mapped")
+
+    compiled = config.compile(
+        {"FOO": {"default": "abc", "mapper": mapper}, "BAR": {"default": 1}}
+    )
+
+    assert compiled({}) == {"FOO": "mapped", "BAR": 1}
+
+    mapper.assert_called_once_with("abc")
+
+
+def test_it_should_throw_on_missing_values() -> None:
+    config = twelvefactor.Config()
+
+    compiled = config.compile({"FOO": str})
+
+    with pytest.raises(twelvefactor.ConfigError) as e:
+        compiled({})
+
+    assert str(e.value) == "Unknown environment variable: FOO"
+
+
+def test_it_should_throw_on_invalid_values() -> None:
+    config = twelvefactor.Config()
+
+    compiled = config.compile({"FOO": {"type": list, "subtype": int}})
+
+    with pytest.raises(twelvefactor.ConfigError):
+        compiled({"FOO": "1,a"})
@@ -3,6 +3,7 @@ import unittest.mock as mock
 
 import hypothesis
 import hypothesis.strategies as st
+import pytest
 
 import twelvefactor
 
@@ -25,3 +26,51 @@ def test_it_should_uses_os_environ_by_default() -> None:
 
 def test_config() -> None:
     assert isinstance(twelvefactor.config, twelvefactor.Config)
+
+
+@hypothesis.given(environ=st.dictionaries(keys=st.text(), values=st.text()))
+def test_it_should_snapshot_environment(
+    environ: typing.Dict[str, str]
+) -> None:
+    source = dict(environ)
+
+    config = twelvefactor.Config(environ=source, snapshot=True)
+
+    source["FOO"] = "bar"
+
+    assert config.environ == environ
+    assert config.source is source
+
+
+def test_it_should_refresh_snapshot() -> None:
+    source = {"FOO": "abc"}
+
+    config = twelvefactor.Config(environ=source, snapshot=True)
+    compiled = config.compile({"FOO": str})
+
+    source["FOO"] = "def"
+
+    assert config.get("FOO") == "abc"
+    assert compiled() == {"FOO": "abc"}
+
+    config.refresh()
+
+    assert config.get("FOO") == "def"
+    assert compiled() == {"FOO": "def"}
+
+
+def test_it_should_freeze_snapshot() -> None:
+    config = twelvefactor.Config(environ={"FOO": "abc"}, snapshot=True)
+
+    with pytest.raises(TypeError):
+        config.environ["FOO"] = "def"  # type: ignore
+
+
+def test_it_should_not_snapshot_by_default() -> None:
+    source = {"FOO": "abc"}
+
+    config = twelvefactor.Config(environ=source)
+
+    config.refresh()
+
+    assert config.environ is source
@@ -0,0 +1,137 @@
+import pathlib
+import typing
+import unittest.mock as mock
+
+import hypothesis
+import hypothesis.strategies as st
+import pytest
+
+import twelvefactor
+
+KEYS = st.from_regex(r"\A[A-Za-z_][A-Za-z0-9_]*\Z")
+
+
+@hypothesis.given(
+    values=st.dictionaries(
+        keys=KEYS,
+        values=st.text(
+            alphabet=st.characters(blacklist_categories=("Cs",)),
+        ),
+    )
+)
+def test_it_should_parse_double_quoted_values(
+    values: typing.Dict[str, str],
+) -> None:
+    text = "\n".join(
+        '{0}="{1}"'.format(k, v.replace("\\", "\\\\").replace('"', '\\"'))
+        for k, v in values.items()
+    )
+
+    assert twelvefactor.parse_dotenv(text) == values
+
+
+@hypothesis.given(
+    values=st.dictionaries(
+        keys=KEYS, values=st.from_regex(r"\A[^\s#'\"][^\n]*[^\s]\Z")
+    )
+)
+def test_it_should_parse_unquoted_values(
+    values: typing.Dict[str, str],
+) -> None:
+    text = "\n".join("{0}={1}".format(k, v) for k, v in values.items())
+
+    assert twelvefactor.parse_dotenv(text) == {
+        k: v.split(" #")[0].split("\t#")[0].rstrip(" \t")
+        for k, v in values.items()
+    }
+
+
+def test_it_should_parse_dotenv_syntax() -> None:
+    text = "\n".join(
+        [
+            "# comment",
+            "",
+            "export A=1",
+            "B = 'single # quoted'  # comment",
+            'C="line\\nbreak" # comment',
+            "D=a#b",
+            "E= # comment",
+            "F=unquoted value  # comment",
+            'G="multi',
+            'line"',
+            "H=",
+            "I=windows\r",
+        ]
+    )
+
+    assert twelvefactor.parse_dotenv(text) == {
+        "A": "1",
+        "B": "single # quoted",
+        "C": "line\nbreak",
+        "D": "a#b",
+        "E": "",
+        "F": "unquoted value",
+        "G": "multi\nline",
+        "H": "",
+        "I": "windows",
+    }
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ('A="x\x00y\\\\z"', "x\x00y\\z"),
+        ('A="\\\\n"', "\\n"),
+        ('A="\\q\\t"', "\\q\t"),
+    ],
+)
+def test_it_should_unescape_double_quoted_values(
+    text: str, expected: str
+) -> None:
+    assert twelvefactor.parse_dotenv(text) == {"A": expected}
+
+
+def test_it_should_parse_bytes() -> None:
+    assert twelvefactor.parse_dotenv('A="café"'.encode()) == {"A": "café"}
+
+
+@pytest.mark.parametrize("text", ["A=1\nnot valid", b"A=1\nnot valid"])
+def test_it_should_throw_on_invalid_lines(
+    text: typing.Union[str, bytes],
+) -> None:
+    with pytest.raises(twelvefactor.ConfigError) as e:
+        twelvefactor.parse_dotenv(text)
+
+    assert str(e.value) == "Invalid .env line 2: not valid"
+
+
+def test_it_should_read_files(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / ".env"
+    path.write_text("A=1\nB='2'\n")
+
+    assert twelvefactor.read_dotenv(path) == {"A": "1", "B": "2"}
+
+
+def test_it_should_memory_map_large_files(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / ".env"
+    path.write_text("A=1\nB='2'\n")
+
+    with mock.patch("twelvefactor.MMAP_THRESHOLD", 0):
+        assert twelvefactor.read_dotenv(path) == {"A": "1", "B": "2"}
+
+
+def test_it_should_layer_with_the_environment(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / ".env"
+    path.write_text("A=1\nB=2\n")
+
+    environ = twelvefactor.dotenv(path, environ={"B": "3", "C": "4"})
+
+    assert dict(environ) == {"A": "1", "B": "3", "C": "4"}
+
+    environ = twelvefactor.dotenv(path, environ={"B": "3"}, override=True)
+
+    assert dict(environ) == {"A": "1", "B": "2"}
+
+    config = twelvefactor.Config(environ=environ)
+
+    assert config({"A": int, "B": int}) == {"A": 1, "B": 2}
@@ -0,0 +1,75 @@
+import concurrent.futures
+import threading
+import time
+import typing
+
+import hypothesis
+import hypothesis.strategies as st
+import pytest
+
+import twelvefactor
+
+
+@hypothesis.given(
+    environ=st.dictionaries(keys=st.text(), values=st.integers()),
+    executor=st.sampled_from([1, 4]),
+)
+def test_it_should_match_call(
+    environ: typing.Dict[str, int], executor: int
+) -> None:
+    config = twelvefactor.Config(
+        environ={k: str(v) for k, v in environ.items()}
+    )
+
+    schema = {k: int for k in environ}
+    values = config(schema, executor=executor)
+
+    assert values == config(schema)
+    assert list(values) == list(schema)
+
+
+def test_it_should_run_mappers_in_parallel() -> None:
+    barrier = threading.Barrier(4, timeout=5)
+
+    def wait(value: object) -> object:
+        barrier.wait()
+        return value
+
+    config = twelvefactor.Config(environ={})
+    schema: twelvefactor.Schema = {
+        str(i): {"default": i, "mapper": wait} for i in range(4)
+    }
+
+    with concurrent.futures.ThreadPoolExecutor(4) as executor:
+        assert config(schema, executor=executor) == {
+            str(i): i for i in range(4)
+        }
+
+
+def test_it_should_throw_the_first_error_in_schema_order() -> None:
+    def slow(value: object) -> object:
+        time.sleep(0.05)
+        raise ValueError("slow")
+
+    def fast(value: object) -> object:
+        raise ValueError("fast")
+
+    config = twelvefactor.Config(environ={"FOO": "1", "BAR": "2"})
+    compiled = config.compile(
+        {
+            "FOO": {"mapper": slow},
+            "BAR": {"mapper": fast},
+            "BAZ": {"type": int},
+        }
+    )
+
+    with pytest.raises(twelvefactor.ConfigError, match="^FOO: slow$") as e:
+        compiled(executor=2)
+
+    assert isinstance(e.value.__cause__, ValueError)
+
+    with pytest.raises(
+        twelvefactor.ConfigError,
+        match="^BAZ: Unknown environment variable: BAZ$",
+    ):
+        config({"FOO": str, "BAZ": int}, executor=2)
@@ -0,0 +1,127 @@
+import os
+import pathlib
+import unittest.mock as mock
+
+import hypothesis
+import hypothesis.strategies as st
+import pytest
+
+import twelvefactor
+
+
+def secret(path: pathlib.Path, value: str) -> str:
+    path.write_text(value, encoding="utf-8")
+    return str(path)
+
+
+@hypothesis.given(
+    value=st.text(alphabet=st.characters(blacklist_characters="\r"))
+)
+def test_it_should_read_files(value: str) -> None:
+    with mock.patch("builtins.open", mock.mock_open(read_data=value + "\n")):
+        with mock.patch("twelvefactor._signature", return_value=(0, 0)):
+            assert twelvefactor.FileCache().read("secret") == value
+
+
+def test_it_should_get_values_from_files(tmp_path: pathlib.Path) -> None:
+    environ = {"PORT_FILE": secret(tmp_path / "port", "8000\n")}
+    config = twelvefactor.Config(environ=environ)
+
+    assert config.get("PORT", type_=int, file=True) == 8000
+    assert config.get("PORT", default=80, file=False) == 80
+    assert config.get("HOST", default="localhost", file=True) == "localhost"
+
+
+def test_it_should_apply_mappers(tmp_path: pathlib.Path) -> None:
+    environ = {"HOSTS_FILE": secret(tmp_path / "hosts", "a, b\n")}
+    config = twelvefactor.Config(environ=environ)
+    mapper = mock.Mock(side_effect=sorted)
+    schema: twelvefactor.Schema = {
+        "HOSTS": {"type": list, "mapper": mapper, "file": True}
+    }
+
+    assert config(schema) == {"HOSTS": ["a", "b"]}
+    assert config.compile(schema)() == {"HOSTS": ["a", "b"]}
+    assert config.codegen(schema)() == {"HOSTS": ["a", "b"]}
+    assert dict(config.lazy(schema)) == {"HOSTS": ["a", "b"]}
+    assert config.getter("HOSTS", type_=list, file=True)(environ) == [
+        "a",
+        "b",
+    ]
+
+
+def test_it_should_throw_when_both_are_set(tmp_path: pathlib.Path) -> None:
+    environ = {"KEY": "abc", "KEY_FILE": secret(tmp_path / "key", "def")}
+    config = twelvefactor.Config(environ=environ)
+
+    with pytest.raises(
+        twelvefactor.ConfigError, match="Both KEY and KEY_FILE"
+    ):
+        config.get("KEY", file=True)
+
+    assert config.get("KEY") == "abc"
+
+
+def test_it_should_throw_on_missing_files(tmp_path: pathlib.Path) -> None:
+    config = twelvefactor.Config(environ={"KEY_FILE": str(tmp_path / "key")})
+
+    with pytest.raises(twelvefactor.ConfigError, match="Unable to read file"):
+        config({"KEY": {"file": True}})
+
+
+def test_it_should_only_read_changed_files(tmp_path: pathlib.Path) -> None:
+    environ = {
+        "FOO_FILE": secret(tmp_path / "foo", "1"),
+        "BAR_FILE": secret(tmp_path / "bar", "2"),
+    }
+    config = twelvefactor.Config(environ=environ)
+    reloader = config.reloader(
+        {
+            "FOO": {"type": int, "file": True},
+            "BAR": {"type": int, "file": True},
+        }
+    )
+
+    assert reloader.reload() == ({"FOO": 1, "BAR": 2}, {"FOO", "BAR"})
+
+    with mock.patch("builtins.open", side_effect=open) as opened:
+        assert reloader.reload() == ({"FOO": 1, "BAR": 2}, set())
+        assert opened.call_count == 0
+
+        secret(tmp_path / "foo", "10")
+        os.utime(environ["FOO_FILE"], ns=(0, 0))
+
+        assert reloader.reload() == ({"FOO": 10, "BAR": 2}, {"FOO"})
+        assert opened.call_count == 1
+
+
+def test_it_should_read_files_concurrently(tmp_path: pathlib.Path) -> None:
+    paths = [secret(tmp_path / str(i), str(i)) for i in range(10)]
+    files = twelvefactor.FileCache(max_workers=4)
+
+    with mock.patch("concurrent.futures.ThreadPoolExecutor") as executor:
+        executor.return_value.__enter__.return_value.map = map
+
+        assert files.read_all(paths) == {
+            p: str(i) for i, p in enumerate(paths)
+        }
+        assert executor.call_count == 1
+
+        assert files.read_all(paths) == {
+            p: str(i) for i, p in enumerate(paths)
+        }
+        assert executor.call_count == 1
+
+    assert len(files) == 10
+
+    files.clear()
+
+    assert len(files) == 0
+
+
+def test_it_should_read_files_in_order(tmp_path: pathlib.Path) -> None:
+    paths = [secret(tmp_path / str(i), str(i)) for i in range(50)]
+
+    assert list(twelvefactor.FileCache().read_all(paths).values()) == [
+        str(i) for i in range(50)
+    ]
@@ -0,0 +1,208 @@
+import array
+import datetime
+import importlib.util
+import pathlib
+import typing
+import unittest.mock as mock
+
+import hypothesis
+import hypothesis.strategies as st
+import pytest
+
+import twelvefactor
+
+SIMPLE_OBJECTS: typing.List[st.SearchStrategy[typing.Any]] = [
+    st.booleans(),
+    st.text(),
+    st.integers(),
+    st.floats(allow_nan=False),
+    st.complex_numbers(allow_nan=False),
+]
+
+SIMPLE_SCHEMA = st.lists(
+    elements=st.tuples(
+        # KEY
+        st.text(),
+        # VALUE
+        st.one_of(SIMPLE_OBJECTS),
+    ),
+    unique_by=lambda x: x[0],
+)
+
+
+@hypothesis.given(
+    schema=st.shared(SIMPLE_SCHEMA, key="data").map(
+        lambda x: {k: type(v) for k, v in x}
+    ),
+    environ=st.shared(SIMPLE_SCHEMA, key="data").map(
+        lambda x: {k: str(v) for k, v in x}
+    ),
+)
+def test_it_should_match_call(
+    schema: twelvefactor.Schema, environ: typing.Dict[str, str]
+) -> None:
+    config = twelvefactor.Config(environ=environ)
+
+    assert config.codegen(schema)() == config(schema)
+
+
+@hypothesis.given(
+    value=st.lists(
+        elements=st.lists(
+            elements=st.integers().filter(lambda x: x >= 0), min_size=1
+        ),
+        min_size=1,
+    )
+)
+def test_it_should_handle_collections(
+    value: typing.List[typing.List[int]],
+) -> None:
+    config = twelvefactor.Config()
+
+    load = config.codegen(
+        {
+            "FOO": {"key": "BAR", "type": list, "subtype": int},
+            "BAZ": {"type": tuple, "subtype": frozenset},
+        }
+    )
+
+    environ = {"BAR": " , ".join(str(v) for v in value[0]), "BAZ": "a, b"}
+
+    assert load(environ) == {
+        "FOO": value[0],
+        "BAZ": (frozenset(["a"]), frozenset(["b"])),
+    }
+
+
+def test_it_should_apply_defaults_and_mappers() -> None:
+    config = twelvefactor.Config()
+    mapper = mock.Mock(return_value="mapped")
+    default = ["a", "b"]
+
+    load = config.codegen(
+        {
+            "FOO": {"default": "abc", "mapper": mapper},
+            "BAR": {"default": default},
+        }
+    )
+
+    result = load({})
+
+    assert result == {"FOO": "mapped", "BAR": default}
+    assert result["BAR"] is default
+
+    mapper.assert_called_once_with("abc")
+
+
+def test_it_should_throw_on_missing_values() -> None:
+    config = twelvefactor.Config()
+
+    load = config.codegen({"FOO": str})
+
+    with pytest.raises(twelvefactor.ConfigError) as e:
+        load({})
+
+    assert str(e.value) == "Unknown environment variable: FOO"
+
+
+def test_it_should_throw_on_invalid_values() -> None:
+    config = twelvefactor.Config()
+
+    load = config.codegen({"FOO": {"type": list, "subtype": int}})
+
+    with pytest.raises(twelvefactor.ConfigError):
+        load({"FOO": "1,a"})
+
+
+def test_it_should_dump_source(capsys: typing.Any) -> None:
+    config = twelvefactor.Config()
+
+    config.codegen({"FOO": int}, dump=True)
+
+    assert "environ.get('FOO', UNSET)" in capsys.readouterr().err
+
+
+def standalone(path: pathlib.Path, schema: twelvefactor.Schema) -> typing.Any:
+    path.write_text(twelvefactor.Config().generate(schema, standalone=True))
+
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    assert spec is not None and spec.loader is not None
+
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return module
+
+
+def test_it_should_generate_standalone_modules(tmp_path: pathlib.Path) -> None:
+    module = standalone(
+        tmp_path / "settings_loader.py",
+        {
+            "PORT": {"type": int, "default": 8000},
+            "PATH": {"type": pathlib.Path, "mapper": str},
+        },
+    )
+
+    assert module.load({"PATH": "/tmp"}) == {"PORT": 8000, "PATH": "/tmp"}
+
+
+def test_it_should_read_files_in_standalone_modules(
+    tmp_path: pathlib.Path,
+) -> None:
+    module = standalone(
+        tmp_path / "settings_loader.py", {"SECRET": {"file": True}}
+    )
+    secret = tmp_path / "secret"
+    secret.write_text("abc\n")
+
+    assert module.load({"SECRET_FILE": str(secret)}) == {"SECRET": "abc"}
+    assert module.load({"SECRET": "def"}) == {"SECRET": "def"}
+
+
+def test_it_should_only_reference_public_names(
+    tmp_path: pathlib.Path,
+) -> None:
+    environ = {
+        "TIMEOUT": "1m 30s",
+        "START": "2024-01-02",
+        "PORTS": "80;443",
+        "LIMITS": "a=1,b=2",
+        "LABELS": "'a,b'=c",
+    }
+    schema: twelvefactor.Schema = {
+        "TIMEOUT": datetime.timedelta,
+        "START": datetime.date,
+        "PORTS": {"type": array.array, "subtype": int, "delimiter": ";"},
+        "LIMITS": {"type": dict, "subtype": int},
+        "LABELS": {"type": dict, "quote": "'"},
+    }
+    path = tmp_path / "settings_loader.py"
+    module = standalone(path, schema)
+
+    assert "twelvefactor._" not in path.read_text()
+    assert module.load(environ) == twelvefactor.Config(environ=environ)(schema)
+
+    with pytest.raises(twelvefactor.ConfigError, match="Missing"):
+        module.load(dict(environ, LIMITS="a"))
+
+    with pytest.raises(twelvefactor.ConfigError):
+        module.load(dict(environ, PORTS=str(2**63)))
+
+
+def test_it_should_throw_on_unimportable_values() -> None:
+    config = twelvefactor.Config()
+
+    with pytest.raises(twelvefactor.ConfigError):
+        config.generate({"FOO": {"mapper": lambda x: x}}, standalone=True)
+
+
+def test_it_should_follow_config_snapshots() -> None:
+    source = {"FOO": "abc"}
+
+    config = twelvefactor.Config(environ=source, snapshot=True)
+    load = config.codegen({"FOO": str})
+
+    source["FOO"] = "def"
+    config.refresh()
+
+    assert load() == {"FOO": "def"}
@@ -0,0 +1,78 @@
+import typing
+import unittest.mock as mock
+
+import hypothesis
+import hypothesis.strategies as st
+import pytest
+
+import twelvefactor
+
+
+@hypothesis.given(
+    environ=st.dictionaries(keys=st.text(), values=st.integers())
+)
+def test_it_should_match_call(environ: typing.Dict[str, int]) -> None:
+    config = twelvefactor.Config(
+        environ={k: str(v) for k, v in environ.items()}
+    )
+
+    schema = {k: int for k in environ}
+
+    assert dict(config.lazy(schema)) == config(schema)
+
+
+def test_it_should_parse_on_first_access() -> None:
+    config = twelvefactor.Config(environ={"FOO": "abc", "BAR": "def"})
+    foo = mock.Mock(return_value="foo")
+    bar = mock.Mock(return_value="bar")
+
+    values = config.lazy({"FOO": {"mapper": foo}, "BAR": {"mapper": bar}})
+
+    assert values["FOO"] == "foo"
+    assert values["FOO"] == "foo"
+
+    foo.assert_called_once_with("abc")
+    bar.assert_not_called()
+
+
+def test_it_should_throw_on_access() -> None:
+    config = twelvefactor.Config(environ={"FOO": "a"})
+
+    values = config.lazy({"FOO": int, "BAR": str})
+
+    with pytest.raises(twelvefactor.ConfigError):
+        values["FOO"]
+
+    with pytest.raises(twelvefactor.ConfigError) as e:
+        values["BAR"]
+
+    assert str(e.value) == "Unknown environment variable: BAR"
+
+
+def test_it_should_throw_key_error_on_unknown_keys() -> None:
+    config = twelvefactor.Config(environ={})
+
+    values = config.lazy({})
+
+    with pytest.raises(KeyError):
+        values["FOO"]
+
+    assert "FOO" not in values
+
+
+def test_it_should_list_keys_without_parsing() -> None:
+    config = twelvefactor.Config(environ={})
+
+    values = config.lazy({"FOO": int, "BAR": str})
+
+    assert list(values) == ["FOO", "BAR"]
+    assert len(values) == 2
+
+
+def test_it_should_validate_all() -> None:
+    config = twelvefactor.Config(environ={"FOO": "1"})
+
+    twelvefactor.Config(environ={"FOO": "1"}).lazy({"FOO": int}).validate_all()
+
+    with pytest.raises(twelvefactor.ConfigError):
+        config.lazy({"FOO": int, "BAR": str}).validate_all()
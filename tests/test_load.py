@@ -0,0 +1,149 @@
+import dataclasses
+import sys
+import typing
+import unittest.mock as mock
+
+import mypy_extensions
+import pytest
+
+import twelvefactor
+
+
+@dataclasses.dataclass
+class DataclassSettings:
+    SECRET_KEY: str
+    PORT: int = 8000
+    HOSTS: typing.List[str] = dataclasses.field(default_factory=list)
+    WEIGHTS: typing.Optional[typing.Tuple[float, ...]] = None
+
+
+class NamedTupleSettings(typing.NamedTuple):
+    SECRET_KEY: str
+    PORT: int = 8000
+    DEBUG: bool = False
+
+
+class TypedDictSettings(typing.TypedDict, total=False):
+    SECRET_KEY: str
+    PORT: int
+
+
+LegacyTypedDictSettings = mypy_extensions.TypedDict(
+    "LegacyTypedDictSettings", {"SECRET_KEY": str, "IDS": typing.Set[int]}
+)
+
+
+def test_it_should_load_dataclasses() -> None:
+    config = twelvefactor.Config(environ={"SECRET_KEY": "abc"})
+
+    assert config.load(DataclassSettings) == DataclassSettings(
+        SECRET_KEY="abc"
+    )
+
+
+def test_it_should_not_share_default_factories() -> None:
+    config = twelvefactor.Config(environ={"SECRET_KEY": "abc"})
+
+    first = config.load(DataclassSettings)
+    first.HOSTS.append("a")
+
+    assert config.load(DataclassSettings).HOSTS == []
+
+
+def test_it_should_parse_generic_hints() -> None:
+    config = twelvefactor.Config(
+        environ={"SECRET_KEY": "abc", "HOSTS": "a,b", "WEIGHTS": "1.5,2"}
+    )
+
+    result = config.load(DataclassSettings)
+
+    assert result.HOSTS == ["a", "b"]
+    assert result.WEIGHTS == (1.5, 2.0)
+
+
+def test_it_should_load_named_tuples() -> None:
+    config = twelvefactor.Config(environ={"SECRET_KEY": "abc", "DEBUG": "y"})
+
+    assert config.load(NamedTupleSettings) == NamedTupleSettings(
+        SECRET_KEY="abc", DEBUG=True
+    )
+
+
+def test_it_should_load_typed_dicts() -> None:
+    config = twelvefactor.Config(environ={"PORT": "80"})
+
+    assert config.load(TypedDictSettings) == {"PORT": 80}
+
+
+def test_it_should_load_legacy_typed_dicts() -> None:
+    config = twelvefactor.Config(environ={"SECRET_KEY": "abc", "IDS": "1,2"})
+
+    assert config.load(LegacyTypedDictSettings) == {
+        "SECRET_KEY": "abc",
+        "IDS": {1, 2},
+    }
+
+
+def test_it_should_throw_on_missing_values() -> None:
+    config = twelvefactor.Config(environ={})
+
+    with pytest.raises(twelvefactor.ConfigError):
+        config.load(NamedTupleSettings)
+
+
+def test_it_should_throw_on_unsupported_classes() -> None:
+    config = twelvefactor.Config(environ={})
+
+    with pytest.raises(twelvefactor.ConfigError):
+        config.load(object)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="requires PEP 604")
+def test_it_should_parse_union_type_hints() -> None:
+    @dataclasses.dataclass
+    class Settings:
+        PORT: "int | None" = None
+        HOSTS: "list[int] | None" = None
+
+    config = twelvefactor.Config(environ={"PORT": "80", "HOSTS": "1,2"})
+
+    assert config.load(Settings) == Settings(PORT=80, HOSTS=[1, 2])
+    assert twelvefactor.Config(environ={}).load(Settings) == Settings()
+
+
+@pytest.mark.parametrize(
+    "hint",
+    [
+        typing.Union[int, float],
+        typing.Optional[typing.Union[int, float]],
+        typing.List[typing.Optional[int]],
+        typing.Callable[[], int],
+    ],
+)
+def test_it_should_throw_on_unsupported_type_hints(hint: object) -> None:
+    Settings = dataclasses.make_dataclass("Settings", [("VALUE", hint)])
+
+    with pytest.raises(twelvefactor.ConfigError, match="Unsupported type"):
+        twelvefactor.Config(environ={"VALUE": "1"}).load(Settings)
+
+
+def test_it_should_cache_type_hints() -> None:
+    @dataclasses.dataclass
+    class Settings:
+        PORT: int = 8000
+
+    with mock.patch("typing.get_type_hints", wraps=typing.get_type_hints) as m:
+        twelvefactor.Config(environ={}).load(Settings)
+        twelvefactor.Config(environ={}).load(Settings)
+
+    assert m.call_count == 1
+
+
+def test_it_should_cache_compiled_schemas() -> None:
+    config = twelvefactor.Config(environ={"SECRET_KEY": "abc"})
+
+    with mock.patch.object(config, "compile", wraps=config.compile) as m:
+        config.load(NamedTupleSettings)
+        config.load(NamedTupleSettings, {"SECRET_KEY": "def"})
+
+    assert m.call_count == 1
@@ -0,0 +1,166 @@
+import typing
+import unittest.mock as mock
+
+import pytest
+
+import twelvefactor
+
+
+@pytest.fixture
+def mapper() -> typing.Iterator[mock.Mock]:
+    mapper = mock.Mock(side_effect=lambda x: x * 2)
+
+    yield mapper
+
+    twelvefactor.clear_mapper_cache(mapper)
+
+
+def test_it_should_memoize_mapper_results(mapper: mock.Mock) -> None:
+    config = twelvefactor.Config(environ={"FOO": "1"})
+
+    schema: twelvefactor.Schema = {
+        "FOO": {"type": int, "mapper": mapper, "cache_mapper": True}
+    }
+
+    assert config(schema) == {"FOO": 2}
+    assert config(schema) == {"FOO": 2}
+    assert config.compile(schema)() == {"FOO": 2}
+
+    mapper.assert_called_once_with(1)
+
+
+def test_it_should_share_results_across_configs(mapper: mock.Mock) -> None:
+    schema: twelvefactor.Schema = {
+        "FOO": {"type": int, "mapper": mapper, "cache_mapper": True}
+    }
+
+    twelvefactor.Config(environ={"FOO": "1"})(schema)
+    twelvefactor.Config(environ={"FOO": "1"})(schema)
+    twelvefactor.Config(environ={"FOO": "2"})(schema)
+
+    assert mapper.call_count == 2
+
+
+def test_it_should_not_memoize_by_default(mapper: mock.Mock) -> None:
+    config = twelvefactor.Config(environ={"FOO": "1"})
+
+    schema: twelvefactor.Schema = {"FOO": {"type": int, "mapper": mapper}}
+
+    config(schema)
+    config(schema)
+
+    assert mapper.call_count == 2
+    assert twelvefactor.mapper_cache(mapper) is None
+
+
+def test_it_should_limit_cache_size(mapper: mock.Mock) -> None:
+    schema: twelvefactor.Schema = {
+        "FOO": {"type": int, "mapper": mapper, "cache_mapper": 1}
+    }
+
+    for value in ("1", "2", "1"):
+        twelvefactor.Config(environ={"FOO": value})(schema)
+
+    cache = typing.cast(
+        twelvefactor.LRUCache, twelvefactor.mapper_cache(mapper)
+    )
+
+    assert mapper.call_count == 3
+    assert cache.evictions == 2
+
+
+def test_it_should_invalidate(mapper: mock.Mock) -> None:
+    config = twelvefactor.Config(environ={"FOO": "1"})
+
+    schema: twelvefactor.Schema = {
+        "FOO": {"type": int, "mapper": mapper, "cache_mapper": True}
+    }
+
+    config(schema)
+    twelvefactor.clear_mapper_cache(mapper)
+    config(schema)
+    twelvefactor.clear_mapper_cache()
+    config(schema)
+
+    assert mapper.call_count == 3
+
+
+@pytest.mark.parametrize(
+    "item,expected",
+    [
+        ({"type": list}, ["1", "2"]),
+        ({"type": list, "subtype": int}, [1, 2]),
+        ({"type": set, "subtype": int}, [1, 2]),
+        ({"type": dict, "subtype": int}, ["1", "3"]),
+        ({"type": twelvefactor.SequenceView, "subtype": int}, [1, 2]),
+    ],
+)
+def test_it_should_memoize_container_values(
+    mapper: mock.Mock, item: twelvefactor.SchemaItem, expected: object
+) -> None:
+    values = ["1=2,3=4", "1=3"] if item["type"] is dict else ["1,2", "1,3"]
+    schema: twelvefactor.Schema = {"FOO": item}
+    item["mapper"] = mapper
+    item["cache_mapper"] = True
+    mapper.side_effect = sorted
+
+    for value in values + values:
+        config = twelvefactor.Config(environ={"FOO": value})
+
+        assert config(schema)["FOO"] == config(schema)["FOO"]
+
+    assert twelvefactor.Config(environ={"FOO": values[0]})(schema) == {
+        "FOO": expected
+    }
+    assert mapper.call_count == 2
+
+
+class Unhashable(str):
+    __hash__ = None  # type: ignore
+
+
+def test_it_should_throw_on_unhashable_values(mapper: mock.Mock) -> None:
+    config = twelvefactor.Config(environ={"FOO": "1"})
+    schema: twelvefactor.Schema = {
+        "FOO": {"type": Unhashable, "mapper": mapper, "cache_mapper": True}
+    }
+
+    with pytest.raises(twelvefactor.ConfigError, match="Unhashable"):
+        config(schema)
+
+
+def test_it_should_handle_builtin_mappers() -> None:
+    config = twelvefactor.Config(environ={"FOO": "abc"})
+
+    schema: twelvefactor.Schema = {
+        "FOO": {"mapper": len, "cache_mapper": True}  # type: ignore
+    }
+
+    assert config(schema) == {"FOO": 3}
+
+
+def test_it_should_copy_mutable_results(mapper: mock.Mock) -> None:
+    mapper.side_effect = lambda x: {"opts": {"value": x}}
+    config = twelvefactor.Config(environ={"DB": "1"})
+
+    schema: twelvefactor.Schema = {
+        "DB": {"mapper": mapper, "cache_mapper": True}
+    }
+
+    config(schema)["DB"]["opts"]["value"] = "2"
+
+    assert config(schema) == {"DB": {"opts": {"value": "1"}}}
+    assert mapper.call_count == 1
+
+
+def test_it_should_keep_the_largest_cache_size(mapper: mock.Mock) -> None:
+    config = twelvefactor.Config(environ={"FOO": "1"})
+
+    for size in (64, 2, 8):
+        config({"FOO": {"type": int, "mapper": mapper, "cache_mapper": size}})
+
+    cache = typing.cast(
+        twelvefactor.LRUCache, twelvefactor.mapper_cache(mapper)
+    )
+
+    assert cache.maxsize == 64
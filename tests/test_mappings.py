@@ -0,0 +1,87 @@
+import typing
+
+import hypothesis
+import hypothesis.strategies as st
+import pytest
+
+import twelvefactor
+
+words = st.text(alphabet=st.characters(blacklist_characters=" ,="), min_size=1)
+
+
+@hypothesis.given(values=st.dictionaries(keys=words, values=st.integers()))
+def test_it_should_parse_dicts(values: typing.Dict[str, int]) -> None:
+    config = twelvefactor.Config()
+    value = ", ".join("{0} = {1}".format(k, v) for k, v in values.items())
+
+    assert config.parse(value, dict, int) == values
+
+
+@hypothesis.given(values=st.dictionaries(keys=st.integers(), values=words))
+def test_it_should_parse_keys(values: typing.Dict[int, str]) -> None:
+    config = twelvefactor.Config()
+    value = ",".join("{0}={1}".format(k, v) for k, v in values.items())
+
+    assert config.parse(value, dict, keytype=int) == values
+
+
+def test_it_should_support_separators() -> None:
+    config = twelvefactor.Config(
+        environ={
+            "WEIGHTS": "a:1; b:2",
+            "LABELS": '"x=y"=1, b="p,q", c=\\"',
+            "ROUTES": "a=1:2, b=3",
+            "EMPTY": "",
+        }
+    )
+    schema: twelvefactor.Schema = {
+        "WEIGHTS": {
+            "type": dict,
+            "subtype": float,
+            "delimiter": ";",
+            "separator": ":",
+        },
+        "LABELS": {"type": dict, "quote": '"', "escape": "\\"},
+        "ROUTES": {
+            "type": dict,
+            "subtype": tuple,
+            "keytype": str,
+            "subdelimiter": ":",
+        },
+        "EMPTY": dict,
+    }
+    expected = {
+        "WEIGHTS": {"a": 1.0, "b": 2.0},
+        "LABELS": {"x=y": "1", "b": "p,q", "c": '"'},
+        "ROUTES": {"a": ("1", "2"), "b": ("3",)},
+        "EMPTY": {},
+    }
+
+    assert config(schema) == expected
+    assert config.compile(schema)() == expected
+    assert config.codegen(schema)() == expected
+    assert "_tokenizer_0 = twelvefactor.Tokenizer" in config.generate(
+        schema, standalone=True
+    )
+
+
+@pytest.mark.parametrize("value", ["a", "a=1,b", "a=x"])
+def test_it_should_throw_on_invalid_pairs(value: str) -> None:
+    config = twelvefactor.Config(environ={"VALUE": value})
+    schema: twelvefactor.Schema = {"VALUE": {"type": dict, "subtype": int}}
+
+    with pytest.raises(twelvefactor.ConfigError):
+        config.parse(value, dict, int)
+
+    with pytest.raises(twelvefactor.ConfigError):
+        config.codegen(schema)()
+
+
+def test_it_should_load_dict_hints() -> None:
+    class Settings(typing.NamedTuple):
+        WEIGHTS: typing.Dict[str, int]
+        RAW: dict  # type: ignore
+
+    config = twelvefactor.Config(environ={"WEIGHTS": "a=1", "RAW": "b=2"})
+
+    assert config.load(Settings) == Settings(WEIGHTS={"a": 1}, RAW={"b": "2"})
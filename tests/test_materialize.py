@@ -0,0 +1,92 @@
+import sys
+import typing
+
+import hypothesis
+import hypothesis.strategies as st
+import pytest
+
+import twelvefactor
+
+
+@hypothesis.given(
+    environ=st.dictionaries(
+        keys=st.from_regex(r"\A[A-Z][A-Z0-9_]*\Z"), values=st.integers()
+    )
+)
+def test_it_should_match_call(environ: typing.Dict[str, int]) -> None:
+    config = twelvefactor.Config(
+        environ={k: str(v) for k, v in environ.items()}
+    )
+
+    schema = {k: int for k in environ}
+
+    result = config.materialize(schema)
+
+    assert result == config(schema)
+    assert dict(result) == config(schema)
+
+
+def test_it_should_provide_attribute_access() -> None:
+    config = twelvefactor.Config(environ={"PORT": "80"})
+
+    result = config.materialize({"PORT": int, "DEBUG": {"default": False}})
+
+    assert result.PORT == 80  # type: ignore
+    assert result.DEBUG is False  # type: ignore
+    assert result["PORT"] == 80
+    assert list(result) == ["PORT", "DEBUG"]
+    assert len(result) == 2
+    assert repr(result) == "ConfigObject(PORT=80, DEBUG=False)"
+
+
+def test_it_should_use_slots() -> None:
+    config = twelvefactor.Config(environ={"PORT": "80"})
+
+    result = config.materialize({"PORT": int})
+
+    assert not hasattr(result, "__dict__")
+    assert sys.getsizeof(result) < sys.getsizeof({"PORT": 80})
+
+
+def test_it_should_be_read_only() -> None:
+    config = twelvefactor.Config(environ={"PORT": "80"})
+
+    result = config.materialize({"PORT": int})
+
+    with pytest.raises(AttributeError):
+        result.PORT = 443
+
+    with pytest.raises(AttributeError):
+        del result.PORT  # type: ignore
+
+    with pytest.raises(AttributeError):
+        result.OTHER = 443
+
+
+def test_it_should_throw_key_error_on_unknown_keys() -> None:
+    config = twelvefactor.Config(environ={})
+
+    result = config.materialize({})
+
+    with pytest.raises(KeyError):
+        result["__class__"]
+
+
+def test_it_should_reuse_the_generated_class() -> None:
+    config = twelvefactor.Config(environ={"PORT": "80"})
+
+    compiled = config.compile({"PORT": int})
+
+    assert type(compiled.materialize()) is compiled.type
+    assert type(compiled.materialize({"PORT": "443"})) is compiled.type
+
+
+@pytest.mark.parametrize(
+    "name,error",
+    [("NOT-VALID", "attribute"), ("keys", "clashes"), ("__init__", "clashes")],
+)
+def test_it_should_throw_on_invalid_names(name: str, error: str) -> None:
+    config = twelvefactor.Config(environ={})
+
+    with pytest.raises(twelvefactor.ConfigError, match=error):
+        config.materialize({name: {"default": None}})
@@ -0,0 +1,131 @@
+import typing
+
+import hypothesis
+import hypothesis.strategies as st
+import pytest
+
+import twelvefactor
+
+
+@hypothesis.given(
+    keys=st.lists(st.text(alphabet="ABC_", max_size=5)), prefix=st.text("ABC_")
+)
+def test_it_should_match_prefixes(keys: typing.List[str], prefix: str) -> None:
+    index = twelvefactor.PrefixIndex(keys)
+
+    assert index.match(prefix) == sorted(
+        k for k in keys if k.startswith(prefix)
+    )
+
+
+def test_it_should_extract_typed_namespaces() -> None:
+    config = twelvefactor.Config(
+        environ={"CACHE_HOST": "1", "CACHE_PORT": "2", "CACHES": "3"}
+    )
+
+    assert config.namespace("CACHE_", int) == {"HOST": 1, "PORT": 2}
+    assert config.namespace("CACHE_", int, strip=False) == {
+        "CACHE_HOST": 1,
+        "CACHE_PORT": 2,
+    }
+
+
+def test_it_should_extract_schema_namespaces() -> None:
+    config = twelvefactor.Config(
+        environ={"DB_PORT": "5432", "DB_HOSTS": "a,b"}
+    )
+
+    result = config.namespace(
+        "DB_",
+        {
+            "PORT": int,
+            "HOSTS": {"type": list},
+            "NAME": {"key": "NAME", "default": "app"},
+        },
+    )
+
+    assert result == {"PORT": 5432, "HOSTS": ["a", "b"], "NAME": "app"}
+
+
+def test_it_should_nest_on_separator() -> None:
+    config = twelvefactor.Config(
+        environ={
+            "DB_REPLICA_1_HOST": "a",
+            "DB_REPLICA_1_PORT": "1",
+            "DB_REPLICA_2_PORT": "2",
+        }
+    )
+
+    assert config.namespace("DB_", separator="_") == {
+        "REPLICA": {"1": {"HOST": "a", "PORT": "1"}, "2": {"PORT": "2"}}
+    }
+
+
+@pytest.mark.parametrize(
+    "environ", [{"A_B": "1", "A_B_C": "2"}, {"A_B_C": "1", "A_B": "2"}]
+)
+def test_it_should_throw_on_conflicting_nesting(
+    environ: typing.Dict[str, str],
+) -> None:
+    config = twelvefactor.Config(environ=environ)
+
+    with pytest.raises(twelvefactor.ConfigError):
+        config.namespace("A_", separator="_")
+
+
+def test_it_should_throw_on_invalid_values() -> None:
+    config = twelvefactor.Config(environ={"A_B": "x"})
+
+    with pytest.raises(twelvefactor.ConfigError):
+        config.namespace("A_", int)
+
+
+def test_it_should_cache_the_index() -> None:
+    config = twelvefactor.Config(environ={"A_B": "1"}, snapshot=True)
+
+    assert config.index is config.index
+
+
+def test_it_should_rebuild_the_index() -> None:
+    environ = {"A_B": "1"}
+    config = twelvefactor.Config(environ=environ)
+
+    index = config.index
+    environ["A_C"] = "2"
+
+    assert config.index is not index
+    assert config.namespace("A_") == {"B": "1", "C": "2"}
+
+    index = config.index
+    config.refresh()
+
+    assert config.index is not index
+
+
+def test_it_should_rebuild_the_index_when_keys_are_replaced() -> None:
+    environ = {"CACHE_A": "1", "X": "2"}
+    config = twelvefactor.Config(environ=environ)
+
+    assert config.namespace("CACHE_") == {"A": "1"}
+
+    del environ["X"]
+    environ["CACHE_B"] = "3"
+
+    assert config.namespace("CACHE_") == {"A": "1", "B": "3"}
+
+
+def test_it_should_rebuild_the_index_when_sources_change() -> None:
+    sources = twelvefactor.Sources(("environ", {"CACHE_A": "1"}))
+    config = twelvefactor.Config(environ=sources)
+
+    assert config.namespace("CACHE_") == {"A": "1"}
+
+    sources.replace("environ", {"CACHE_A": "1", "CACHE_PORT": "80"})
+
+    assert config.get("CACHE_PORT") == "80"
+    assert config.namespace("CACHE_") == {"A": "1", "PORT": "80"}
+
+    index = config.index
+    sources.refresh()
+
+    assert config.index is index
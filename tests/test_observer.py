@@ -0,0 +1,115 @@
+import unittest.mock as mock
+
+import pytest
+
+import twelvefactor
+
+
+def test_it_should_not_observe_by_default() -> None:
+    config = twelvefactor.Config(environ={"FOO": "1"})
+
+    assert config.observer is None
+    assert config.get("FOO", type_=int) == 1
+
+
+def test_it_should_emit_events_from_get() -> None:
+    observer = mock.Mock()
+    config = twelvefactor.Config(environ={"FOO": "1"}, observer=observer)
+
+    assert config.get("FOO", type_=int, mapper=str) == "1"
+
+    event = observer.call_args[0][0]
+
+    assert event.key == "FOO"
+    assert event.lookup >= 0
+    assert event.parse >= 0
+    assert event.mapper >= 0
+    assert event.cache_hit is None
+    assert not event.default
+    assert event.error is None
+
+
+def test_it_should_emit_events_from_compiled_schemas() -> None:
+    observer = mock.Mock()
+    config = twelvefactor.Config(environ={"FOO": "1"}, observer=observer)
+
+    compiled = config.compile({"FOO": int, "BAR": {"default": "abc"}})
+
+    assert compiled() == {"FOO": 1, "BAR": "abc"}
+
+    events = {c[0][0].key: c[0][0] for c in observer.call_args_list}
+
+    assert not events["FOO"].default
+    assert events["BAR"].default
+
+
+def test_it_should_emit_errors() -> None:
+    observer = mock.Mock()
+    config = twelvefactor.Config(environ={"FOO": "a"}, observer=observer)
+
+    with pytest.raises(twelvefactor.ConfigError):
+        config.get("FOO", type_=int)
+
+    with pytest.raises(twelvefactor.ConfigError):
+        config.get("BAR")
+
+    errors = [c[0][0].error for c in observer.call_args_list]
+
+    assert all(isinstance(e, twelvefactor.ConfigError) for e in errors)
+
+
+def test_it_should_emit_cache_hits_and_misses() -> None:
+    observer = mock.Mock()
+    config = twelvefactor.Config(
+        environ={"FOO": "1", "BAR": "1"}, cache_size=10, observer=observer
+    )
+
+    config({"FOO": int, "BAR": int})
+
+    hits = [c[0][0].cache_hit for c in observer.call_args_list]
+
+    assert hits == [False, True]
+
+
+def test_it_should_aggregate_stats() -> None:
+    stats = twelvefactor.StatsObserver()
+    config = twelvefactor.Config(
+        environ={"FOO": "1", "BAR": "a"}, observer=stats
+    )
+
+    for _ in range(2):
+        config.get("FOO", type_=int)
+        config.get("BAZ", default=None)
+
+        with pytest.raises(twelvefactor.ConfigError):
+            config.get("BAR", type_=int)
+
+    report = {row["key"]: row for row in stats.report()}
+
+    assert report["FOO"]["count"] == 2
+    assert report["BAZ"]["defaults"] == 2
+    assert report["BAR"]["errors"] == 2
+
+
+def test_it_should_sort_reports() -> None:
+    stats = twelvefactor.StatsObserver()
+
+    for key, parse in (("FOO", 1.0), ("BAR", 3.0), ("BAZ", 2.0)):
+        stats(
+            twelvefactor.KeyEvent(
+                key=key,
+                lookup=0.0,
+                parse=parse,
+                mapper=0.0,
+                cache_hit=None,
+                default=False,
+                error=None,
+            )
+        )
+
+    assert [r["key"] for r in stats.report()] == ["BAR", "BAZ", "FOO"]
+    assert [r["key"] for r in stats.report(limit=1)] == ["BAR"]
+
+    stats.clear()
+
+    assert stats.report() == []
@@ -0,0 +1,184 @@
+import datetime
+import decimal
+import enum
+import pathlib
+import typing
+
+import hypothesis
+import hypothesis.strategies as st
+import pytest
+
+import twelvefactor
+
+
+class Color(enum.Enum):
+    RED = "red"
+    GREEN = 2
+
+
+class Point(typing.NamedTuple):
+    x: int
+    y: int
+
+
+def parse_point(value: str, type_: typing.Any) -> typing.Any:
+    return type_(*map(int, value.split("x")))
+
+
+@pytest.fixture
+def registry() -> typing.Iterator[twelvefactor.ParserRegistry]:
+    twelvefactor.register_parser(Point, parse_point)
+
+    yield twelvefactor.parsers
+
+    twelvefactor.parsers.unregister(Point)
+
+
+@hypothesis.given(value=st.datetimes())
+def test_it_should_parse_datetimes(value: datetime.datetime) -> None:
+    config = twelvefactor.Config()
+
+    assert config.parse(value.isoformat(), datetime.datetime) == value
+    assert config.parse(value.date().isoformat(), datetime.date) == (
+        value.date()
+    )
+
+
+@hypothesis.given(
+    value=st.timedeltas(
+        min_value=datetime.timedelta(0), max_value=datetime.timedelta(10000)
+    )
+)
+def test_it_should_parse_seconds_as_timedeltas(
+    value: datetime.timedelta,
+) -> None:
+    config = twelvefactor.Config()
+    seconds = str(value.total_seconds())
+
+    assert config.parse(seconds, datetime.timedelta) == value
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("30s", datetime.timedelta(seconds=30)),
+        ("5m", datetime.timedelta(minutes=5)),
+        ("1h 30m", datetime.timedelta(hours=1, minutes=30)),
+        ("1.5d", datetime.timedelta(days=1, hours=12)),
+        ("2w", datetime.timedelta(weeks=2)),
+        ("250ms", datetime.timedelta(milliseconds=250)),
+        ("10us", datetime.timedelta(microseconds=10)),
+    ],
+)
+def test_it_should_parse_durations(
+    value: str, expected: datetime.timedelta
+) -> None:
+    assert twelvefactor.Config().parse(value, datetime.timedelta) == expected
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("512", 512),
+        ("512B", 512),
+        ("512MB", 512 * 1000**2),
+        ("1.5kib", 1536),
+        ("2 GiB", 2 * 1024**3),
+        ("1T", 1000**4),
+    ],
+)
+def test_it_should_parse_byte_sizes(value: str, expected: int) -> None:
+    size = twelvefactor.Config().parse(value, twelvefactor.ByteSize)
+
+    assert size == expected
+    assert isinstance(size, twelvefactor.ByteSize)
+
+
+@pytest.mark.parametrize(
+    "type_,value",
+    [
+        (datetime.timedelta, "5 minutes"),
+        (datetime.timedelta, "inf"),
+        (datetime.timedelta, "1e20"),
+        (datetime.timedelta, "99999999999d"),
+        (datetime.date, "yesterday"),
+        (decimal.Decimal, "1.2.3"),
+        (twelvefactor.ByteSize, "12XB"),
+        (Color, "BLUE"),
+    ],
+)
+def test_it_should_throw_on_invalid_values(
+    type_: typing.Type[typing.Any], value: str
+) -> None:
+    config = twelvefactor.Config(environ={"VALUE": value})
+
+    with pytest.raises(twelvefactor.ConfigError):
+        config.parse(value, type_)
+
+    with pytest.raises(twelvefactor.ConfigError):
+        config.codegen({"VALUE": type_})()
+
+
+def test_it_should_parse_decimals_and_paths() -> None:
+    config = twelvefactor.Config()
+
+    assert config.parse("0.1", decimal.Decimal) == decimal.Decimal("0.1")
+    assert config.parse("~/app", pathlib.Path) == pathlib.Path("~/app")
+    assert config.parse("a/b", pathlib.PurePosixPath) == pathlib.PurePosixPath(
+        "a/b"
+    )
+
+
+def test_it_should_parse_enums_and_literals() -> None:
+    config = twelvefactor.Config(environ={"COLOR": "red", "MODE": "2"})
+    mode: typing.Any = typing.Literal[1, 2, "auto"]
+
+    assert config.parse("GREEN", Color) is Color.GREEN
+    assert config.parse("red", Color) is Color.RED
+    assert config.parse("2", Color) is Color.GREEN
+    assert config.parse("auto", mode) == "auto"
+
+    schema: twelvefactor.Schema = {"COLOR": Color, "MODE": mode}
+    expected = {"COLOR": Color.RED, "MODE": 2}
+
+    assert config(schema) == expected
+    assert config.codegen(schema)() == expected
+
+    with pytest.raises(twelvefactor.ConfigError, match="is not one of"):
+        config.parse("manual", mode)
+
+
+def test_it_should_use_registered_parsers(
+    registry: twelvefactor.ParserRegistry,
+) -> None:
+    config = twelvefactor.Config(environ={"SIZE": "640x480"})
+
+    assert config.get("SIZE", type_=Point) == Point(640, 480)
+    assert config.parse("1x2, 3x4", list, Point) == [Point(1, 2), Point(3, 4)]
+
+    registry.unregister(Point)
+
+    with pytest.raises(TypeError):
+        config.parse("640x480", Point)
+
+    registry.register(Point, parse_point)
+
+    assert config.compile({"SIZE": Point})() == {"SIZE": Point(640, 480)}
+
+
+def test_it_should_cache_lookups() -> None:
+    registry = twelvefactor.ParserRegistry()
+    parse_enum = twelvefactor.parsers.lookup(Color)
+
+    assert parse_enum is not None
+
+    registry.register(enum.Enum, parse_enum)
+
+    assert registry.lookup(Color) is registry.lookup(enum.Enum)
+    assert registry.lookup(int) is None
+    assert set(registry.cache) == {Color, enum.Enum, int}
+
+    registry.register(int, parse_point)
+
+    assert registry.cache == {}
+    assert registry.lookup(bool) is parse_point
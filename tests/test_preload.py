@@ -0,0 +1,103 @@
+import os
+import types
+import typing
+import unittest.mock as mock
+
+import pytest
+
+import twelvefactor
+
+fork = pytest.mark.skipif(
+    not hasattr(os, "register_at_fork"), reason="requires os.fork"
+)
+
+
+def run_in_fork(func: typing.Callable[[], bool]) -> int:
+    pid = os.fork()
+
+    if pid == 0:  # pragma: no cover
+        try:
+            os._exit(0 if func() else 1)
+        finally:
+            os._exit(2)
+
+    return os.waitpid(pid, 0)[1]
+
+
+def test_it_should_freeze_values() -> None:
+    config = twelvefactor.Config(
+        environ={"HOSTS": "a, b", "PORTS": "1", "WEIGHTS": "a=1"}
+    )
+    schema: twelvefactor.Schema = {
+        "HOSTS": list,
+        "PORTS": {"type": set, "subtype": int},
+        "WEIGHTS": {"type": dict, "mapper": lambda v: {"w": [v]}},
+    }
+
+    preloader = config.preload(schema)
+
+    assert preloader["HOSTS"] == ("a", "b")
+    assert preloader["PORTS"] == frozenset([1])
+    assert preloader["WEIGHTS"]["w"] == ({"a": "1"},)
+    assert isinstance(preloader["WEIGHTS"], types.MappingProxyType)
+    assert isinstance(preloader.current, types.MappingProxyType)
+    assert dict(config.preload(schema, freeze=False)) == config(schema)
+
+
+def test_it_should_only_reparse_changed_values() -> None:
+    environ = {"FOO": "1", "BAR": "2"}
+    mapper = mock.Mock(side_effect=str)
+    config = twelvefactor.Config(environ=environ)
+
+    preloader = config.preload({"FOO": {"mapper": mapper}, "BAR": int})
+    current = preloader.current
+
+    preloader.after_fork()
+
+    assert preloader.current is current
+    assert mapper.call_count == 1
+
+    environ["BAR"] = "x"
+    preloader.after_fork()
+
+    assert isinstance(preloader.error, twelvefactor.ConfigError)
+
+    with pytest.raises(twelvefactor.ConfigError):
+        preloader["FOO"]
+
+    environ["BAR"] = "3"
+
+    assert preloader.load() == {"FOO": "1", "BAR": 3}
+    assert mapper.call_count == 1
+
+
+@fork
+def test_it_should_share_values_with_forks() -> None:
+    mapper = mock.Mock(side_effect=str)
+    config = twelvefactor.Config(environ={"FOO": "1"})
+    preloader = config.preload({"FOO": {"mapper": mapper}}, freeze=False)
+
+    def child() -> bool:
+        return preloader["FOO"] == "1" and mapper.call_count == 1
+
+    assert run_in_fork(child) == 0
+
+
+@fork
+def test_it_should_revalidate_changed_values_after_fork() -> None:
+    environ = {"PORT": "80"}
+    config = twelvefactor.Config(environ=environ)
+    preloader = config.preload({"PORT": int}, freeze=False)
+
+    environ["PORT"] = "x"
+
+    def child() -> bool:
+        try:
+            preloader["PORT"]
+        except twelvefactor.ConfigError:
+            return True
+
+        return False
+
+    assert run_in_fork(child) == 0
+    assert preloader["PORT"] == 80
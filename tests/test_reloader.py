@@ -0,0 +1,115 @@
+import typing
+import unittest.mock as mock
+
+import hypothesis
+import hypothesis.strategies as st
+import pytest
+
+import twelvefactor
+
+
+@hypothesis.given(
+    environ=st.dictionaries(keys=st.text(), values=st.integers())
+)
+def test_it_should_match_call(environ: typing.Dict[str, int]) -> None:
+    config = twelvefactor.Config(
+        environ={k: str(v) for k, v in environ.items()}
+    )
+
+    schema = {k: int for k in environ}
+
+    assert config.reloader(schema).reload() == (config(schema), set(schema))
+
+
+def test_it_should_only_reparse_changed_keys() -> None:
+    environ = {"FOO": "1", "BAR": "2"}
+    foo = mock.Mock(side_effect=lambda x: x)
+    bar = mock.Mock(side_effect=lambda x: x)
+
+    config = twelvefactor.Config(environ=environ)
+    reloader = config.reloader(
+        {
+            "FOO": {"type": int, "mapper": foo},
+            "BAZ": {"key": "BAR", "type": int, "mapper": bar},
+        }
+    )
+
+    reloader.reload()
+
+    environ["FOO"] = "3"
+
+    assert reloader.reload() == ({"FOO": 3, "BAZ": 2}, {"FOO"})
+    assert reloader.reload() == ({"FOO": 3, "BAZ": 2}, set())
+
+    assert foo.call_count == 2
+    assert bar.call_count == 1
+
+
+def test_it_should_detect_added_and_removed_keys() -> None:
+    environ = {"FOO": "1"}
+
+    config = twelvefactor.Config(environ=environ)
+    reloader = config.reloader(
+        {"FOO": {"type": int, "default": 0}, "BAR": {"default": "abc"}}
+    )
+
+    reloader.reload()
+
+    del environ["FOO"]
+    environ["BAR"] = "def"
+
+    assert reloader.reload() == ({"FOO": 0, "BAR": "def"}, {"FOO", "BAR"})
+
+
+def test_it_should_not_return_previous_results() -> None:
+    config = twelvefactor.Config(environ={"FOO": "1"})
+    reloader = config.reloader({"FOO": int})
+
+    values, _ = reloader.reload()
+    values["FOO"] = 2
+
+    assert reloader.reload() == ({"FOO": 1}, set())
+
+
+def test_it_should_retry_failed_keys() -> None:
+    environ = {"FOO": "a"}
+
+    config = twelvefactor.Config(environ=environ)
+    reloader = config.reloader({"FOO": int})
+
+    with pytest.raises(twelvefactor.ConfigError):
+        reloader.reload()
+
+    with pytest.raises(twelvefactor.ConfigError):
+        reloader.reload()
+
+    environ["FOO"] = "1"
+
+    assert reloader.reload() == ({"FOO": 1}, {"FOO"})
+
+
+def test_it_should_accept_an_environment() -> None:
+    config = twelvefactor.Config(environ={})
+    reloader = config.reloader({"FOO": int})
+
+    assert reloader.reload({"FOO": "1"}) == ({"FOO": 1}, {"FOO"})
+    assert reloader.reload({"FOO": "2"}) == ({"FOO": 2}, {"FOO"})
+
+
+def test_it_should_keep_the_previous_state_on_errors() -> None:
+    environ = {"A": "1", "B": "2"}
+    config = twelvefactor.Config(environ=environ)
+    reloader = config.reloader({"A": int, "B": int})
+
+    reloader.reload()
+
+    environ.update(A="10", B="bad")
+
+    with pytest.raises(twelvefactor.ConfigError):
+        reloader.reload()
+
+    assert reloader.values == {"A": 1, "B": 2}
+
+    environ["B"] = "3"
+
+    assert reloader.reload() == ({"A": 10, "B": 3}, {"A", "B"})
@@ -0,0 +1,116 @@
+import concurrent.futures
+import multiprocessing
+import typing
+
+import pytest
+
+import twelvefactor
+
+calls: typing.List[object] = []
+
+
+def hosts(value: object) -> object:
+    calls.append(value)
+
+    return tuple(typing.cast(typing.List[str], value))
+
+
+SCHEMA: twelvefactor.Schema = {
+    "PORT": int,
+    "HOSTS": {"type": list, "mapper": hosts},
+    "DEBUG": {"type": bool, "default": False},
+}
+
+ENVIRON = {"PORT": "80", "HOSTS": "a, b"}
+
+
+@pytest.fixture
+def block() -> typing.Iterator[typing.Any]:
+    block = twelvefactor.Config(environ=ENVIRON).share(SCHEMA)
+
+    yield block
+
+    block.close()
+    block.unlink()
+
+
+def attach(name: str) -> typing.Dict[str, typing.Any]:
+    shared = twelvefactor.Config(environ=ENVIRON).attach(SCHEMA, name)
+
+    try:
+        return dict(shared)
+    finally:
+        shared.close()
+
+
+def test_it_should_share_values(block: typing.Any) -> None:
+    config = twelvefactor.Config(environ=ENVIRON)
+    count = len(calls)
+    shared = config.compile(SCHEMA).attach(block.name)
+
+    assert isinstance(shared, twelvefactor.SharedConfig)
+    assert shared == {"PORT": 80, "HOSTS": ("a", "b"), "DEBUG": False}
+    assert list(shared) == list(SCHEMA)
+    assert len(calls) == count
+
+    shared.close()
+
+
+def test_it_should_share_values_with_spawned_workers(
+    block: typing.Any,
+) -> None:
+    context = multiprocessing.get_context("spawn")
+
+    with concurrent.futures.ProcessPoolExecutor(1, context) as executor:
+        values = executor.submit(attach, block.name).result()
+
+    assert values == {"PORT": 80, "HOSTS": ("a", "b"), "DEBUG": False}
+
+
+@pytest.mark.parametrize(
+    "environ,schema",
+    [
+        (dict(ENVIRON, PORT="81"), SCHEMA),
+        (dict(ENVIRON, DEBUG="1"), SCHEMA),
+        (ENVIRON, dict(SCHEMA, PORT=float)),
+        (ENVIRON, dict(SCHEMA, HOSTS={"type": list, "mapper": tuple})),
+        (ENVIRON, {"PORT": int}),
+    ],
+)
+def test_it_should_throw_on_stale_blocks(
+    block: typing.Any,
+    environ: typing.Dict[str, str],
+    schema: twelvefactor.Schema,
+) -> None:
+    config = twelvefactor.Config(environ=environ)
+
+    with pytest.raises(twelvefactor.ConfigError, match="Stale"):
+        config.attach(schema, block.name)
+
+
+def test_it_should_throw_on_invalid_blocks(block: typing.Any) -> None:
+    config = twelvefactor.Config(environ=ENVIRON)
+
+    block.buf[:4] = b"xxxx"
+
+    with pytest.raises(twelvefactor.ConfigError, match="Invalid"):
+        config.attach(SCHEMA, block.name)
+
+    with pytest.raises(twelvefactor.ConfigError, match="Unknown"):
+        config.attach(SCHEMA, block.name + "_unknown")
+
+
+def test_it_should_throw_on_unpicklable_values() -> None:
+    config = twelvefactor.Config(environ=ENVIRON)
+
+    with pytest.raises(twelvefactor.ConfigError, match="PORT"):
+        config.share({"PORT": {"mapper": lambda v: lambda: v}})
+
+
+def test_it_should_throw_on_unidentifiable_values() -> None:
+    config = twelvefactor.Config(environ=ENVIRON)
+    scale = 2
+    schema: twelvefactor.Schema = {"PORT": {"mapper": lambda v: (v, scale)}}
+
+    with pytest.raises(twelvefactor.ConfigError, match="fingerprint"):
+        config.share(schema)
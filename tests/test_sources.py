@@ -0,0 +1,98 @@
+import collections
+import typing
+
+import hypothesis
+import hypothesis.strategies as st
+
+import twelvefactor
+
+layer = st.dictionaries(
+    keys=st.sampled_from("ABCDEF"), values=st.sampled_from("xyz")
+)
+
+
+@hypothesis.given(layers=st.lists(layer, min_size=1, max_size=4))
+def test_it_should_match_chain_map(
+    layers: typing.List[typing.Dict[str, str]],
+) -> None:
+    sources = twelvefactor.Sources(
+        *((str(i), layer) for i, layer in enumerate(layers))
+    )
+
+    assert dict(sources) == dict(collections.ChainMap(*layers))
+
+    for key in sources:
+        origin = int(typing.cast(str, sources.origin(key)))
+        assert layers[origin][key] == sources[key]
+        assert all(key not in layer for layer in layers[:origin])
+
+
+@hypothesis.given(
+    layers=st.lists(layer, min_size=1, max_size=4),
+    updates=st.lists(st.tuples(st.integers(min_value=0), layer)),
+)
+def test_it_should_update_incrementally(
+    layers: typing.List[typing.Dict[str, str]],
+    updates: typing.List[typing.Tuple[int, typing.Dict[str, str]]],
+) -> None:
+    sources = twelvefactor.Sources(
+        *((str(i), layer) for i, layer in enumerate(layers))
+    )
+
+    for position, update in updates:
+        position %= len(layers)
+        before = dict(sources)
+
+        changed = sources.replace(str(position), update)
+        layers[position] = update
+
+        assert dict(sources) == dict(collections.ChainMap(*layers))
+        assert changed == {
+            key
+            for key in before.keys() | sources.keys()
+            if before.get(key) != sources.get(key)
+        }
+
+        for key in sources:
+            assert layers[int(typing.cast(str, sources.origin(key)))][key]
+
+
+def test_it_should_only_see_changes_on_refresh() -> None:
+    environ = {"PORT": "8000"}
+    defaults = {"PORT": "80", "HOST": "localhost"}
+    sources = twelvefactor.Sources(
+        ("environ", environ), ("defaults", defaults)
+    )
+
+    environ["HOST"] = "example.com"
+    del environ["PORT"]
+
+    assert sources["PORT"] == "8000"
+    assert sources.origin("HOST") == "defaults"
+
+    assert sources.refresh("defaults") == set()
+    assert sources.refresh() == {"HOST", "PORT"}
+
+    assert sources == {"PORT": "80", "HOST": "example.com"}
+    assert sources.origin("PORT") == "defaults"
+    assert sources.origin("HOST") == "environ"
+    assert sources.origin("DEBUG") is None
+
+
+def test_it_should_be_usable_by_config() -> None:
+    environ = {"DEBUG": "yes"}
+    sources = twelvefactor.Sources(
+        ("environ", environ), ("defaults", {"DEBUG": "no", "PORT": "80"})
+    )
+    config = twelvefactor.Config(environ=sources)
+
+    assert config({"DEBUG": bool, "PORT": int}) == {"DEBUG": True, "PORT": 80}
+
+    environ["PORT"] = "8000"
+
+    assert config.get("PORT", type_=int) == 80
+
+    config.refresh()
+
+    assert config.get("PORT", type_=int) == 8000
+    assert config.namespace("P") == {"ORT": "8000"}
@@ -0,0 +1,122 @@
+import array
+import typing
+
+import hypothesis
+import hypothesis.strategies as st
+import pytest
+
+import twelvefactor
+
+quoting = twelvefactor.Tokenizer(quote='"', escape="\\")
+
+
+def quote(item: str) -> str:
+    return '"{0}"'.format(item.replace("\\", "\\\\").replace('"', '\\"'))
+
+
+@hypothesis.given(
+    items=st.lists(
+        st.text(alphabet=st.characters(blacklist_characters=' ,"\\'))
+    )
+)
+def test_it_should_match_splitting(items: typing.List[str]) -> None:
+    config = twelvefactor.Config()
+    value = ", ".join(items)
+
+    assert config.parse(value, list, tokenizer=quoting) == config.parse(
+        value, list
+    )
+
+
+@hypothesis.given(items=st.lists(st.text(), min_size=1))
+def test_it_should_round_trip_quoted_items(items: typing.List[str]) -> None:
+    value = ", ".join(quote(item) for item in items)
+
+    assert list(quoting.items(value)) == items
+
+
+@pytest.mark.parametrize(
+    "tokenizer,value,expected",
+    [
+        (quoting, 'a, "b, c" ,d', ["a", "b, c", "d"]),
+        (quoting, 'a\\,b, "\\"c\\""', ["a,b", '"c"']),
+        (quoting, ',a,,"', ["", "a", "", '"']),
+        (quoting, "a\\", ["a\\"]),
+        (twelvefactor.Tokenizer(";", quote="'"), "a,b; 'c;d'", ["a,b", "c;d"]),
+        (twelvefactor.Tokenizer("::", escape="%"), "a%::b::c", ["a::b", "c"]),
+    ],
+)
+def test_it_should_split_items(
+    tokenizer: twelvefactor.Tokenizer,
+    value: str,
+    expected: typing.List[str],
+) -> None:
+    assert list(tokenizer.items(value)) == expected
+
+
+def test_it_should_parse_nested_collections() -> None:
+    config = twelvefactor.Config(
+        environ={"HOSTS": 'a:80; "b;c":443', "EMPTY": " "}
+    )
+    item: twelvefactor.SchemaItem = {
+        "type": list,
+        "subtype": tuple,
+        "delimiter": ";",
+        "subdelimiter": ":",
+        "quote": '"',
+    }
+    schema: twelvefactor.Schema = {"HOSTS": item, "EMPTY": item}
+    expected = {"HOSTS": [("a", "80"), ("b;c", "443")], "EMPTY": []}
+
+    assert config(schema) == expected
+    assert config.compile(schema)() == expected
+    assert config.codegen(schema)() == expected
+    assert "twelvefactor.Tokenizer(';'" in config.generate(
+        schema, standalone=True
+    )
+
+
+def test_it_should_support_arrays_and_views() -> None:
+    config = twelvefactor.Config(environ={"PORTS": "80 | 443"})
+    schema: twelvefactor.Schema = {
+        "PORTS": {"type": array.array, "subtype": int, "delimiter": "|"},
+        "SHARDS": {
+            "key": "PORTS",
+            "type": twelvefactor.SequenceView,
+            "subtype": int,
+            "delimiter": "|",
+        },
+    }
+
+    for values in (config(schema), config.codegen(schema)()):
+        assert values["PORTS"] == array.array("q", [80, 443])
+        assert list(values["SHARDS"]) == [80, 443]
+
+
+@pytest.mark.parametrize(
+    "tokenizer",
+    [
+        twelvefactor.Tokenizer(""),
+        twelvefactor.Tokenizer(quote='""'),
+        twelvefactor.Tokenizer(quote="'", escape="'"),
+        twelvefactor.Tokenizer(escape=","),
+    ],
+)
+def test_it_should_throw_on_invalid_tokenizers(
+    tokenizer: twelvefactor.Tokenizer,
+) -> None:
+    with pytest.raises(twelvefactor.ConfigError):
+        twelvefactor.Config().parser(list, tokenizer=tokenizer)
+
+
+def test_it_should_throw_on_quoted_views() -> None:
+    config = twelvefactor.Config(environ={"SHARDS": "1"})
+    schema: twelvefactor.Schema = {
+        "SHARDS": {"type": twelvefactor.SequenceView, "quote": '"'}
+    }
+
+    with pytest.raises(twelvefactor.ConfigError):
+        config(schema)
+
+    with pytest.raises(twelvefactor.ConfigError):
+        config.codegen(schema)
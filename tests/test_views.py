@@ -0,0 +1,82 @@
+import typing
+import unittest.mock as mock
+
+import hypothesis
+import hypothesis.strategies as st
+import pytest
+
+import twelvefactor
+
+
+@hypothesis.given(values=st.lists(st.integers()))
+def test_it_should_match_lists(values: typing.List[int]) -> None:
+    config = twelvefactor.Config()
+    value = ", ".join(str(v) for v in values)
+
+    view = config.parse(value, twelvefactor.SequenceView, int)
+
+    assert list(view) == config.parse(value, list, int)
+    assert len(view) == len(values)
+
+
+@hypothesis.given(
+    items=st.lists(
+        st.text(alphabet=st.characters(blacklist_characters=", ")),
+        min_size=2,
+    ),
+    index=st.integers(),
+)
+def test_it_should_index_like_lists(
+    items: typing.List[str], index: int
+) -> None:
+    view = twelvefactor.SequenceView(",".join(items))
+
+    assert view[1:] == items[1:]
+    assert view[::-2] == items[::-2]
+
+    if -len(items) <= index < len(items):
+        assert view[index] == items[index]
+    else:
+        with pytest.raises(IndexError):
+            view[index]
+
+
+def test_it_should_convert_items_on_access() -> None:
+    parse = mock.Mock(side_effect=int)
+    view = twelvefactor.SequenceView("1, 2, x", parse)
+
+    assert parse.call_count == 0
+    assert view[1] == 2
+    assert parse.call_count == 1
+
+    with pytest.raises(twelvefactor.ConfigError):
+        view[2]
+
+
+def test_it_should_support_delimiters() -> None:
+    view = twelvefactor.SequenceView("a::b::::c", delimiter="::")
+
+    assert list(view) == ["a", "b", "", "c"]
+    assert list(twelvefactor.SequenceView(" ")) == []
+
+
+def test_it_should_be_usable_in_schemas() -> None:
+    config = twelvefactor.Config(
+        environ={"SHARDS": "1, 2, 3", "EMPTY": ""}, cache_size=10
+    )
+    schema: twelvefactor.Schema = {
+        "SHARDS": {"type": twelvefactor.SequenceView, "subtype": int},
+        "EMPTY": twelvefactor.SequenceView,
+    }
+
+    for values in (config(schema), config.codegen(schema)()):
+        assert list(values["SHARDS"]) == [1, 2, 3]
+        assert list(values["EMPTY"]) == []
+
+
+def test_it_should_support_surrogates() -> None:
+    value = "a\udcff, \ud800b"
+    view = twelvefactor.SequenceView(value)
+
+    assert list(view) == ["a\udcff", "\ud800b"]
+    assert repr(view) == "SequenceView({0!r})".format(value)
@@ -1,13 +1,95 @@
+import asyncio
+import array
+import bisect
+import collections
+import collections.abc
+import concurrent.futures
+import contextlib
+import copy
+import datetime
+import decimal
+import enum
+import functools
+import gc
+import hashlib
+import inspect
+import itertools
+import linecache
+import math
+import mmap
+import operator
 import os
+import pathlib
+import pickle  # only loads data written by this module  # nosec B403
+import re
+import struct
+import sys
+import tempfile
+import threading
+import time
+import types
 import typing
+import weakref
 
 import mypy_extensions
 
-__all__ = ("ConfigError", "Config", "config")
+try:
+    import dataclasses
+except ImportError:  # pragma: no cover
+    dataclasses = None  # type: ignore
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # pragma: no cover
+    shared_memory = None  # type: ignore
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+__all__ = (
+    "ByteSize",
+    "ConfigError",
+    "CompiledSchema",
+    "Config",
+    "ConfigObject",
+    "FileCache",
+    "KeyEvent",
+    "LazyConfig",
+    "LRUCache",
+    "ParserRegistry",
+    "PrefixIndex",
+    "Preloader",
+    "Reloader",
+    "SequenceView",
+    "SharedConfig",
+    "Sources",
+    "StatsObserver",
+    "Tokenizer",
+    "clear_mapper_cache",
+    "config",
+    "dotenv",
+    "mapper_cache",
+    "parse_dotenv",
+    "parsers",
+    "read_dotenv",
+    "register_parser",
+)
 
 
 UNSET = object()
 
+OMIT = object()
+
+T = typing.TypeVar("T")
+
+MAPPER_CACHE_SIZE = 128
+
+MMAP_THRESHOLD = 1 << 20
+
+FILE_SUFFIX = "_FILE"
+
 
 SchemaItem = mypy_extensions.TypedDict(
     "SchemaItem",
@@ -16,13 +98,50 @@ SchemaItem = mypy_extensions.TypedDict(
         "default": object,
         "type": typing.Type[typing.Any],
         "subtype": typing.Type[typing.Any],
+        "keytype": typing.Type[typing.Any],
         "mapper": typing.Optional[typing.Callable[[object], object]],
+        "cache_mapper": typing.Union[bool, int],
+        "file": bool,
+        "persist": bool,
+        "delimiter": str,
+        "quote": typing.Optional[str],
+        "escape": typing.Optional[str],
+        "subdelimiter": str,
+        "separator": str,
     },
     total=False,
 )
 
 Schema = typing.Mapping[str, typing.Union[typing.Type[typing.Any], SchemaItem]]
 
+Parser = typing.Callable[[str], typing.Any]
+
+TypeParser = typing.Callable[[str, typing.Any], typing.Any]
+
+Getter = typing.Callable[[typing.Mapping[str, str]], typing.Any]
+
+Mapper = typing.Callable[[object], object]
+
+Loader = typing.Callable[..., typing.Dict[str, typing.Any]]
+
+Signature = typing.Tuple[int, int]
+
+Executor = typing.Union[concurrent.futures.Executor, int]
+
+AsyncSource = typing.Callable[[str], typing.Awaitable[typing.Optional[str]]]
+
+COLLECTIONS = (list, tuple, set, frozenset)
+
+MAPPINGS = (dict,)
+
+ARRAYS: typing.Tuple[type, ...] = (array.array,) + (
+    (numpy.ndarray,) if numpy is not None else ()
+)
+
+ARRAY_TYPECODES = {int: "q", float: "d"}
+
+SHARED_FORMAT = 1
+
 
 class ConfigError(Exception):
     """
@@ -30,174 +149,4447 @@ class ConfigError(Exception):
     """
 
 
-class Config:
+class CompiledSchema:
     """
-    Config environment parser.
+    A schema resolved into a reusable parser plan.
 
-    This class allows chosen configuration values to be extracted from the
-    processes environment variables and converted into the relevant types.
+    Key names, defaults, types and mappers are resolved once when the schema
+    is compiled, so each call only performs the environment lookup and the
+    conversion for every key.
 
     .. code-block:: python
 
-        parser = Config()
+        >>> compiled = config.compile({'PORT': int})
+        >>> compiled({'PORT': '8000'})
+        <<< {'PORT': 8000}
 
-        config = parser({
-            'DEBUG': {
-                'type': bool,
-                'default': False,
-            },
-            'SECRET_KEY': str,
-        })
+    :param config: the config the schema was compiled by
+    :param getters: a mapping of config names to their getters
+    :param keys: a mapping of config names to their environment keys
+    :param files: the environment keys which may be provided by files
+    :param schema: the schema which was compiled
 
-    The above will populate the :code:`config` variable with two values,
-    :code:`DEBUG` will be populated with a :class:`bool` from the environment
-    variable of the same  name, throwing an exception on invalid values and
-    defaulting to :data:`False` when none is provided, and :code:`SECRET_KEY`
-    will be a :class:`str` and throw a :exc:`ConfigError` when no value is
-    found in the environment.
+    """
 
-    An optional :code:`environ` param can be  passed in order to override the
-    environment.
+    def __init__(
+        self,
+        config: "Config",
+        getters: typing.Mapping[str, Getter],
+        keys: typing.Mapping[str, str],
+        files: typing.Collection[str] = (),
+        schema: typing.Optional[Schema] = None,
+    ) -> None:
+        self.config = config
+        self.getters = getters
+        self.keys = keys
+        self.files = files
+        self.schema = schema
+        self._type: typing.Optional[typing.Type[ConfigObject]] = None
+        self._fingerprint: typing.Optional[bytes] = None
 
-    :param environ: environment dictionary, defaults to :data:`os.environ`
+    def __call__(
+        self,
+        environ: typing.Optional[typing.Mapping[str, str]] = None,
+        executor: typing.Optional[Executor] = None,
+    ) -> typing.Dict[str, typing.Any]:
+        """
+        Parse an environment according to the compiled schema.
 
-    """
+        When an :code:`executor` is given every value is retrieved, parsed, and
+        mapped in parallel. Values are returned in schema order, and the error
+        of the first failing value in schema order is thrown as a
+        :exc:`ConfigError` naming the value.
 
-    TRUE_STRINGS = ("t", "true", "on", "ok", "y", "yes", "1")
+        :param environ: environment dictionary, defaults to the environment
+                        of the config the schema was compiled by
+        :param executor: a :class:`concurrent.futures.Executor`, or a number of
+                         threads to run a thread pool with for the call
+        :return: a dictionary of config values
 
-    def __init__(
+        """
+        environ = self.resolve(environ)
+
+        if executor is not None:
+            return _evaluate(self.getters, environ, executor)
+
+        return {key: getter(environ) for key, getter in self.getters.items()}
+
+    def lazy(
         self, environ: typing.Optional[typing.Mapping[str, str]] = None
-    ) -> None:
-        self.environ: typing.Mapping[str, str] = (
-            environ if environ is not None else os.environ
-        )
+    ) -> "LazyConfig":
+        """
+        Parse an environment lazily according to the compiled schema.
+
+        :param environ: environment dictionary, defaults to the environment
+                        of the config the schema was compiled by
+        :return: a mapping of config values parsed on first access
 
-    def __call__(self, schema: Schema) -> typing.Dict[str, typing.Any]:
         """
-        Parse the environment according to a schema.
+        return LazyConfig(self.getters, self.resolve(environ))
 
-        :param schema: the schema to parse
-        :return: a dictionary of config values
+    def resolve(
+        self, environ: typing.Optional[typing.Mapping[str, str]] = None
+    ) -> typing.Mapping[str, str]:
+        """
+        Replace file references in an environment with the file contents.
+
+        Every file referenced by the schema is read in bulk by the
+        :class:`FileCache` of the config.
+
+        :param environ: environment dictionary, defaults to the environment
+                        of the config the schema was compiled by
+        :return: the environment with the file contents layered on top
 
         """
-        result = {}
+        if environ is None:
+            environ = self.config.environ
 
-        for key, item in schema.items():
-            if callable(item):
-                result[key] = self.get(key=key, type_=item)
+        if not self.files:
+            return environ
 
-                continue
+        return self.config.files.overlay(environ, self.files)
 
-            result[key] = self.get(
-                key=item.get("key", key),
-                default=item.get("default", UNSET),
-                type_=item.get("type", str),
-                subtype=item.get("subtype", str),
-                mapper=item.get("mapper", None),
-            )
+    def reloader(self) -> "Reloader":
+        """
+        Create a loader which only re-parses values that have changed.
 
-        return result
+        :return: the reloader
 
-    def parse(
+        """
+        return Reloader(self)
+
+    @property
+    def type(self) -> typing.Type["ConfigObject"]:
+        """
+        The :class:`ConfigObject` subclass generated for the schema.
+        """
+        if self._type is None:
+            self._type = ConfigObject.subclass(list(self.getters))
+
+        return self._type
+
+    def materialize(
+        self, environ: typing.Optional[typing.Mapping[str, str]] = None
+    ) -> "ConfigObject":
+        """
+        Parse an environment into a read-only object.
+
+        Names in the schema become attributes, so they must be identifiers
+        and must not clash with the attributes of :class:`ConfigObject`, such
+        as the :class:`Mapping` methods :code:`keys`, :code:`get`, and
+        :code:`items`, otherwise compiling the schema raises a
+        :class:`ConfigError`. Use :meth:`__call__` for such schemas.
+
+        :param environ: environment dictionary, defaults to the environment
+                        of the config the schema was compiled by
+        :return: an instance of :attr:`type` holding the config values
+
+        """
+        return self.type(**self(environ))
+
+    @property
+    def fingerprint(self) -> bytes:
+        """
+        Digest identifying the schema and the parsers of the config.
+
+        Types, mappers, and defaults are identified by their import path,
+        literal value, or :func:`repr`, and functions by their name and a
+        digest of their code, so the fingerprint is the same in every process
+        compiling the same schema.
+
+        :raises ConfigError: when a value can not be identified across
+                             processes, like closures, partials, bound
+                             methods, or objects whose :func:`repr` holds
+                             their address
+        """
+        if self._fingerprint is None:
+            if self.schema is None:
+                raise ConfigError("Unable to fingerprint an unknown schema")
+
+            self._fingerprint = _fingerprint(self.config, self.schema)
+
+        return self._fingerprint
+
+    def share(
         self,
-        value: str,
-        type_: typing.Type[typing.Any] = str,
-        subtype: typing.Type[typing.Any] = str,
-    ) -> typing.Any:
+        environ: typing.Optional[typing.Mapping[str, str]] = None,
+        name: typing.Optional[str] = None,
+    ) -> "shared_memory.SharedMemory":
         """
-        Parse value from string.
+        Parse an environment into a new shared memory block.
 
-        Convert :code:`value` to
+        The block starts with a header holding the :data:`SHARED_FORMAT`, the
+        :attr:`fingerprint`, and a digest of the raw environment values, and
+        is followed by every config value pickled separately and an index of
+        their offsets. The caller owns the block, and must unlink it once
+        every process has attached it.
 
-        .. code-block:: python
+        :param environ: environment dictionary, defaults to the environment
+                        of the config the schema was compiled by
+        :param name: the name of the block, a unique name is generated when
+                     not given
+        :return: the shared memory block
 
-           >>> parser = Config()
-           >>> parser.parse('12345', type_=int)
-           <<< 12345
-           >>>
-           >>> parser.parse('1,2,3,4', type_=list, subtype=int)
-           <<< [1, 2, 3, 4]
+        """
+        environ = self.resolve(environ)
+        digest = _environ_digest(environ, self.keys.values())
 
-        :param value: string
-        :param type\\_: the type to return
-        :param subtype: subtype for iterator types
-        :return: the parsed config value
+        return _share(self(environ), self.fingerprint, digest, name)
 
+    def attach(
+        self,
+        name: str,
+        environ: typing.Optional[typing.Mapping[str, str]] = None,
+    ) -> "SharedConfig":
         """
-        if type_ is bool:
-            return type_(value.lower() in self.TRUE_STRINGS)
+        Read config values from a shared memory block without parsing them.
 
-        try:
-            if isinstance(type_, type) and issubclass(
-                type_, (list, tuple, set, frozenset)
-            ):
-                return type_(
-                    self.parse(v.strip(" "), subtype)
-                    for v in value.split(",")
-                    if value.strip(" ")
-                )
+        :param name: the name of the block written by :meth:`share`
+        :param environ: environment dictionary, defaults to the environment
+                        of the config the schema was compiled by
+        :return: the config values held in the block
 
-            return type_(value)
-        except ValueError as e:
-            raise ConfigError(*e.args)
+        """
+        environ = self.resolve(environ)
+        digest = _environ_digest(environ, self.keys.values())
 
-    def get(
+        return SharedConfig(name, self.fingerprint, digest)
+
+    def cached(
         self,
-        key: str,
-        default: typing.Any = UNSET,
-        type_: typing.Type[typing.Any] = str,
-        subtype: typing.Type[typing.Any] = str,
-        mapper: typing.Optional[typing.Callable[[object], object]] = None,
-    ) -> typing.Any:
+        directory: typing.Union[str, "os.PathLike[str]"],
+        environ: typing.Optional[typing.Mapping[str, str]] = None,
+        version: str = "",
+    ) -> typing.Dict[str, typing.Any]:
         """
-        Parse a value from an environment variable.
+        Parse an environment, reusing values cached on disk by earlier calls.
 
-        .. code-block:: python
+        Values are pickled to a file in :code:`directory` named after the
+        fingerprint of the cached items, the :code:`version`, and the Python
+        version, along with a digest of the raw values of the environment
+        variables they were parsed from. The file is only loaded while the
+        digest matches, otherwise the values are parsed and mapped, and the
+        file is replaced atomically so concurrent processes never read a
+        partial file. Values which can not be pickled, like locks,
+        connections, or :class:`SequenceView` values, are left out of the file
+        and parsed on every call, and failing to write the file is ignored.
 
-           >>> os.environ['FOO']
-           <<< '12345'
-           >>>
-           >>> os.environ['BAR']
-           <<< '1,2,3,4'
-           >>>
-           >>> 'BAZ' in os.environ
-           <<< False
-           >>>
-           >>> parser = Config()
-           >>> parser.get('FOO', type_=int)
-           <<< 12345
-           >>>
-           >>> parser.get('BAR', type_=list, subtype=int)
-           <<< [1, 2, 3, 4]
-           >>>
-           >>> parser.get('BAZ', default='abc123')
-           <<< 'abc123'
-           >>>
-           >>> parser.get('FOO', type_=int, mapper=lambda x: x*10)
-           <<< 123450
+        Items with :code:`persist` set to :data:`False` are never cached, they
+        are parsed on every call and their variables are left out of the
+        digest. Neither are items with a type, mapper, or default that can not
+        be identified across processes, like closures, partials, bound
+        methods, or objects whose :func:`repr` holds their address.
 
-        :param key: the key to look up the value under
-        :param default: default value to return when when no value is present
-        :param type\\_: the type to return
-        :param subtype: subtype for iterator types
-        :param mapper: a function to post-process the value with
-        :return: the parsed config value
+        Functions are identified by their name and a digest of their code, so
+        editing a mapper invalidates the cache, but changes to the functions
+        it calls or to classes are not detected. Pass the release of the
+        application as :code:`version` to invalidate the cache on deploys.
+
+        The cache is loaded with :mod:`pickle`, so the directory must only be
+        writable by trusted users.
+
+        :param directory: the directory to keep the cache file in
+        :param environ: environment dictionary, defaults to the environment
+                        of the config the schema was compiled by
+        :param version: the version of the code parsing the values
+        :return: a dictionary of config values
 
         """
-        value = self.environ.get(key, UNSET)
+        environ = self.resolve(environ)
+        schema = self.schema or {}
+        describer = _describer()
+        names = _persisted(schema, describer)
+        fingerprint = _cache_fingerprint(
+            self.config,
+            {name: schema[name] for name in names},
+            version,
+            describer,
+        )
+        digest = _environ_digest(environ, [self.keys[n] for n in names])
+        path = _cache_path(directory, fingerprint)
+        values = _read_cache(path, fingerprint, digest)
 
-        if value is UNSET and default is UNSET:
-            raise ConfigError("Unknown environment variable: {0}".format(key))
+        if values is None:
+            values = {name: self.getters[name](environ) for name in names}
+            _write_cache(path, fingerprint, digest, values)
 
-        if value is UNSET:
-            value = default
-        else:
-            value = self.parse(typing.cast(str, value), type_, subtype)
+        return {
+            name: values[name] if name in values else getter(environ)
+            for name, getter in self.getters.items()
+        }
 
-        if mapper:
-            value = mapper(value)
 
-        return value
+class ConfigObject(typing.Mapping[str, typing.Any]):
+    """
+    Read-only config values stored in slots.
+
+    Subclasses are generated per schema by :meth:`subclass`, holding each
+    config value in a slot for fast attribute access and a small memory
+    footprint. A :class:`Mapping` view is provided for compatibility with code
+    expecting a dictionary.
+
+    .. code-block:: python
+
+        >>> values = config.materialize({'DEBUG': bool})
+        >>> values.DEBUG
+        <<< False
+        >>> app.config.update(values)
+
+    """
+
+    __slots__ = ()
+
+    _fields: typing.FrozenSet[str] = frozenset()
+
+    def __init__(self, **values: typing.Any) -> None:
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    @classmethod
+    def subclass(
+        cls, names: typing.Sequence[str], name: str = "ConfigObject"
+    ) -> typing.Type["ConfigObject"]:
+        """
+        Generate a subclass with a slot for each config value.
+
+        :param names: the names of the config values
+        :param name: the name of the generated class
+        :return: the generated class
+
+        """
+        for field in names:
+            if not field.isidentifier():
+                raise ConfigError(
+                    "Invalid config object attribute: {0}".format(field)
+                )
+
+            if hasattr(cls, field):
+                raise ConfigError(
+                    "Invalid config object attribute: {0}, it clashes with "
+                    "{1}.{0}".format(field, cls.__name__)
+                )
+
+        return type(
+            name,
+            (cls,),
+            {"__slots__": tuple(names), "_fields": frozenset(names)},
+        )
+
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        raise AttributeError("Config values are read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("Config values are read-only")
+
+    def __getitem__(self, key: str) -> typing.Any:
+        if key not in self._fields:
+            raise KeyError(key)
+
+        return getattr(self, key)
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __repr__(self) -> str:
+        return "{0}({1})".format(
+            type(self).__name__,
+            ", ".join("{0}={1!r}".format(k, v) for k, v in self.items()),
+        )
+
+
+class Reloader:
+    """
+    Stateful loader which only re-parses values that have changed.
+
+    The raw environment value seen for each key is remembered, on each
+    :meth:`reload` only the keys whose raw value changed, was added, or was
+    removed are parsed and mapped again. Values provided by files are compared
+    by their contents, which are only read again when the file has changed.
+
+    .. code-block:: python
+
+        >>> reloader = config.reloader({'PORT': int, 'DEBUG': bool})
+        >>> reloader.reload()
+        <<< ({'PORT': 8000, 'DEBUG': False}, {'PORT', 'DEBUG'})
+        >>> os.environ['DEBUG'] = 'true'
+        >>> reloader.reload()
+        <<< ({'PORT': 8000, 'DEBUG': True}, {'DEBUG'})
+
+    :param compiled: the compiled schema to load
+
+    """
+
+    def __init__(self, compiled: CompiledSchema) -> None:
+        self.compiled = compiled
+        self.raw: typing.Dict[str, object] = {}
+        self.values: typing.Dict[str, typing.Any] = {}
+
+    def reload(
+        self, environ: typing.Optional[typing.Mapping[str, str]] = None
+    ) -> typing.Tuple[typing.Dict[str, typing.Any], typing.Set[str]]:
+        """
+        Parse the values which have changed since the last load.
+
+        When a value fails to parse the error is thrown and the previous state
+        is kept, so the value will be parsed again on the next reload.
+
+        :param environ: environment dictionary, defaults to the environment
+                        of the config the schema was compiled by
+        :return: a dictionary of config values, and the set of changed names
+
+        """
+        environ = self.compiled.resolve(environ)
+
+        raws = {}
+        values = {}
+
+        for name, getter in self.compiled.getters.items():
+            raw = environ.get(self.compiled.keys[name], UNSET)
+
+            if name not in self.raw or self.raw[name] != raw:
+                values[name] = getter(environ)
+                raws[name] = raw
+
+        self.raw.update(raws)
+        self.values.update(values)
+
+        return dict(self.values), set(values)
+
+
+class Preloader(typing.Mapping[str, typing.Any]):
+    """
+    Config values parsed once in a parent process and shared with its forks.
+
+    Prefork servers, such as gunicorn with :code:`preload_app` or uwsgi
+    without :code:`lazy-apps`, import the application once in the master
+    and then fork the workers. Preloading the config in the master means the
+    workers start with every value already parsed and mapped, and the memory
+    pages holding the values stay shared between processes until written to.
+
+    When :code:`freeze` is set lists are frozen into tuples, sets into
+    frozensets, and dicts into read-only mappings, and :func:`gc.freeze`
+    moves every object into the permanent generation, so that garbage
+    collections in the workers do not write to the shared pages.
+
+    In a forked child the raw value of each key is compared with the value
+    seen by the parent, and only values which differ are parsed and mapped
+    again, as by a :class:`Reloader`. Locks held by the config are replaced,
+    as another thread may have held them during the fork. When a value fails
+    to parse in the child, the error is thrown when a value is accessed.
+
+    .. code-block:: python
+
+        >>> settings = config.preload({'PORT': int, 'HOSTS': list})
+        >>> settings['HOSTS']
+        <<< ('a', 'b')
+
+    :param compiled: the compiled schema to load
+    :param freeze: freeze the values and the garbage collector
+
+    """
+
+    def __init__(self, compiled: CompiledSchema, freeze: bool = True) -> None:
+        self.compiled = compiled
+        self.freeze = freeze
+        self.reloader = compiled.reloader()
+        self.error: typing.Optional[ConfigError] = None
+        self._values: typing.Optional[typing.Mapping[str, typing.Any]] = None
+
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(
+                after_in_child=functools.partial(
+                    _after_fork, weakref.ref(self)
+                )
+            )
+
+    @property
+    def current(self) -> typing.Mapping[str, typing.Any]:
+        """
+        Read-only mapping of the config values, loaded on first access.
+        """
+        if self.error is not None:
+            raise self.error
+
+        if self._values is None:
+            return self.load()
+
+        return self._values
+
+    def load(
+        self, environ: typing.Optional[typing.Mapping[str, str]] = None
+    ) -> typing.Mapping[str, typing.Any]:
+        """
+        Parse the values which have changed since the last load.
+
+        :param environ: environment dictionary, defaults to the environment
+                        of the config the schema was compiled by
+        :return: a read-only mapping of the config values
+
+        """
+        values, changed = self.reloader.reload(environ)
+
+        if self.freeze:
+            self.reloader.values.update(
+                (n, _freeze(values[n])) for n in changed
+            )
+
+        if changed or self._values is None:
+            self._values = types.MappingProxyType(dict(self.reloader.values))
+
+        if changed and self.freeze and hasattr(gc, "freeze"):
+            gc.freeze()
+
+        self.error = None
+
+        return self._values
+
+    def after_fork(self) -> None:
+        """
+        Re-validate the values in a forked child process.
+
+        Called automatically after :func:`os.fork` on platforms supporting
+        :func:`os.register_at_fork`.
+
+        """
+        _reset_locks(self.compiled.config)
+
+        try:
+            self.load()
+        except ConfigError as e:
+            self.error = e
+
+    def __getitem__(self, key: str) -> typing.Any:
+        return self.current[key]
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self.current)
+
+    def __len__(self) -> int:
+        return len(self.current)
+
+
+class SharedConfig(typing.Mapping[str, typing.Any]):
+    """
+    Read-only config values mapped from a shared memory block.
+
+    Blocks are written once by :meth:`Config.share` and attached by name in
+    other processes, such as the workers of a
+    :class:`concurrent.futures.ProcessPoolExecutor` using the spawn start
+    method, which then skip parsing and mappers entirely. Each value is
+    unpickled from the block on first access.
+
+    A block is rejected with a :exc:`ConfigError` when it was written in a
+    different :data:`SHARED_FORMAT`, for a different schema, or from
+    different raw values of the environment variables the schema references.
+
+    .. code-block:: python
+
+        >>> block = config.share(schema)
+        >>> executor = ProcessPoolExecutor(
+        ...     initializer=init_worker, initargs=(block.name,)
+        ... )
+        >>> # in init_worker
+        >>> settings = config.attach(schema, name)
+
+    Before Python 3.13 attaching a block registers it with the resource
+    tracker of the process, so blocks should only be attached by processes
+    started by :mod:`multiprocessing`, which share the tracker of their
+    parent.
+
+    :param name: the name of the block
+    :param fingerprint: the fingerprint of the schema the block must hold
+    :param digest: the digest of the environment the block must be written
+                   from
+
+    """
+
+    def __init__(self, name: str, fingerprint: bytes, digest: bytes) -> None:
+        self.name = name
+        self.memory = _attach(name)
+        self.buf = typing.cast(memoryview, self.memory.buf).toreadonly()
+        self._values: typing.Dict[str, typing.Any] = {}
+
+        try:
+            self.index = _shared_index(self.buf, name, fingerprint, digest)
+        except ConfigError:
+            self.close()
+            raise
+
+    def __getitem__(self, key: str) -> typing.Any:
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+
+        start, end = self.index[key]
+        # the block was written by CompiledSchema.share, not by untrusted input
+        value = self._values[key] = pickle.loads(
+            self.buf[start:end]
+        )  # nosec B301
+
+        return value
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self.index)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def close(self) -> None:
+        """
+        Detach the shared memory block.
+
+        Values which have been accessed are kept, other values can no longer
+        be read.
+
+        """
+        self.buf.release()
+        self.memory.close()
+
+
+class LazyConfig(typing.Mapping[str, typing.Any]):
+    """
+    Read-only mapping of config values parsed on first access.
+
+    Each value is looked up, parsed, and passed to its mapper the first time
+    it is accessed, and then cached. A :exc:`ConfigError` is thrown on access
+    when a value is missing or invalid.
+
+    .. code-block:: python
+
+        >>> values = config.lazy({'PORT': int, 'SECRET_KEY': str})
+        >>> values['PORT']
+        <<< 8000
+        >>> values.validate_all()
+
+    :param getters: a mapping of config names to their getters
+    :param environ: environment dictionary
+
+    """
+
+    def __init__(
+        self,
+        getters: typing.Mapping[str, Getter],
+        environ: typing.Mapping[str, str],
+    ) -> None:
+        self.getters = getters
+        self.environ = environ
+        self.cache: typing.Dict[str, typing.Any] = {}
+
+    def __getitem__(self, key: str) -> typing.Any:
+        try:
+            return self.cache[key]
+        except KeyError:
+            pass
+
+        value = self.cache[key] = self.getters[key](self.environ)
+
+        return value
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self.getters)
+
+    def __len__(self) -> int:
+        return len(self.getters)
+
+    def validate_all(self) -> None:
+        """
+        Parse every config value not yet accessed.
+
+        :raises ConfigError: when any value is missing or invalid
+
+        """
+        for key in self.getters:
+            self[key]
+
+
+class Tokenizer(typing.NamedTuple):
+    """
+    Splitter for the items of delimited values.
+
+    Without a quote or escape character values are split on the delimiter by
+    :meth:`str.split`. Otherwise a compiled pattern matches each item in a
+    single pass over the value, delimiters inside quotes or following the
+    escape character are kept in the item.
+
+    .. code-block:: python
+
+        >>> tokenizer = Tokenizer(quote='"', escape='\\\\')
+        >>> list(tokenizer.items('a, "b, c", d\\\\,e'))
+        <<< ['a', 'b, c', 'd,e']
+
+    The items of nested collections are split in turn on the
+    :code:`subdelimiter`, so the items of the outer collection keep their
+    quotes and escapes until then. Spaces around items are removed, so with a
+    quote or escape character the delimiters must not contain spaces.
+
+    The items of mapping types are split into a key and a value on the first
+    :code:`separator` outside of quotes.
+
+    :param delimiter: the string separating items
+    :param quote: the character quoting items, disabled when :data:`None`
+    :param escape: the character escaping the next character, disabled when
+                   :data:`None`
+    :param subdelimiter: the string separating the items of nested collections
+    :param separator: the string separating the keys and values of mapping
+                      types
+
+    """
+
+    delimiter: str = ","
+    quote: typing.Optional[str] = None
+    escape: typing.Optional[str] = None
+    subdelimiter: str = ","
+    separator: str = "="
+
+    @property
+    def plain(self) -> bool:
+        """
+        Whether values are split without quoting or escaping.
+        """
+        return self.quote is None and self.escape is None
+
+    def split(self, value: str) -> typing.Iterator[str]:
+        """
+        Split a value into items, keeping quotes and escapes.
+
+        :param value: the delimited value
+        :return: an iterator of items stripped of surrounding spaces, empty
+                 for a blank value
+
+        """
+        if not value.strip(" "):
+            return iter(())
+
+        if self.plain:
+            return (v.strip(" ") for v in value.split(self.delimiter))
+
+        pattern = _token_pattern(self.delimiter, self.quote, self.escape)
+
+        return map(_first_group, pattern.finditer(value))
+
+    def items(self, value: str) -> typing.Iterator[str]:
+        """
+        Split a value into items, removing quotes and escapes.
+
+        :param value: the delimited value
+        :return: an iterator of unquoted items
+
+        """
+        if self.plain:
+            return self.split(value)
+
+        return map(_unquoter(self.quote, self.escape), self.split(value))
+
+    def partition(self, item: str) -> typing.Tuple[str, str]:
+        """
+        Split an item into a key and a value, keeping quotes and escapes.
+
+        :param item: the item to split
+        :return: the key and the value stripped of surrounding spaces
+        :raises ValueError: when the item has no separator
+
+        """
+        if self.plain:
+            end = item.find(self.separator)
+        else:
+            end = _key_end(item, self.separator, self.quote, self.escape)
+
+        if end == -1:
+            _missing_separator(item, self.separator)
+
+        start = end + len(self.separator)
+
+        return item[:end].rstrip(" "), item[start:].lstrip(" ")
+
+    def unquote(self, item: str) -> str:
+        """
+        Remove the quotes and escapes from an item.
+
+        :param item: the item to unquote
+        :return: the unquoted item
+
+        """
+        return _unquoter(self.quote, self.escape)(item)
+
+    def nested(self) -> "Tokenizer":
+        """
+        Get the tokenizer for the items of nested collections.
+
+        :return: a tokenizer splitting on the subdelimiter
+
+        """
+        return self._replace(delimiter=self.subdelimiter, subdelimiter=",")
+
+
+class SequenceView(typing.Sequence[typing.Any]):
+    """
+    Read-only sequence converting the items of a delimited value on access.
+
+    The value is encoded once, and on first use the offsets of the delimiters
+    are scanned into a compact array. Items are decoded from a
+    :class:`memoryview` of the encoded value and converted each time they are
+    accessed, so no list of intermediate strings is built and items never
+    accessed are never converted.
+
+    .. code-block:: python
+
+        >>> shards = config.parse('1, 2, 3', SequenceView, int)
+        >>> shards[-1]
+        <<< 3
+        >>> len(shards)
+        <<< 3
+
+    An empty value is an empty sequence. Invalid items throw a
+    :exc:`ConfigError` when accessed.
+
+    :param value: the delimited value
+    :param parse: a function to convert each item with
+    :param delimiter: the string separating items
+
+    """
+
+    __slots__ = ("data", "view", "parse", "delimiter", "_offsets")
+
+    def __init__(
+        self, value: str, parse: Parser = str, delimiter: str = ","
+    ) -> None:
+        self.data = value.encode("utf-8", "surrogatepass")
+        self.view = memoryview(self.data)
+        self.parse = parse
+        self.delimiter = delimiter.encode("utf-8", "surrogatepass")
+        self._offsets: typing.Optional["array.array[int]"] = (
+            None if value.strip(" ") else array.array("q", [0])
+        )
+
+    @property
+    def offsets(self) -> "array.array[int]":
+        """
+        The offsets of the delimiters, with the start and end of the value.
+        """
+        if self._offsets is None:
+            self._offsets = _offsets(self.data, self.delimiter)
+
+        return self._offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @typing.overload
+    def __getitem__(self, index: int) -> typing.Any: ...  # pragma: no cover
+
+    @typing.overload
+    def __getitem__(
+        self, index: slice
+    ) -> typing.List[typing.Any]: ...  # pragma: no cover
+
+    def __getitem__(self, index: typing.Union[int, slice]) -> typing.Any:
+        if isinstance(index, slice):
+            return [self._item(i) for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError("SequenceView index out of range")
+
+        return self._item(index)
+
+    def __iter__(self) -> typing.Iterator[typing.Any]:
+        for index in range(len(self)):
+            yield self._item(index)
+
+    def __repr__(self) -> str:
+        value = self.data.decode("utf-8", "surrogatepass")
+
+        return "{0}({1!r})".format(type(self).__name__, value)
+
+    def _item(self, index: int) -> typing.Any:
+        start = self.offsets[index] + len(self.delimiter) if index else 0
+        end = self.offsets[index + 1]
+        value = str(self.view[start:end], "utf-8", "surrogatepass")
+
+        try:
+            return self.parse(value.strip(" "))
+        except ValueError as e:
+            raise ConfigError(*e.args)
+
+
+class KeyEvent(typing.NamedTuple):
+    """
+    Timings and outcome of getting a single config value.
+
+    Times are in seconds, :code:`cache_hit` is :data:`None` when the config
+    has no parse cache or the value was not parsed.
+    """
+
+    key: str
+    lookup: float
+    parse: float
+    mapper: float
+    cache_hit: typing.Optional[bool]
+    default: bool
+    error: typing.Optional[Exception]
+
+
+Observer = typing.Callable[[KeyEvent], None]
+
+
+class StatsObserver:
+    """
+    Observer aggregating key events in memory.
+
+    .. code-block:: python
+
+        >>> stats = StatsObserver()
+        >>> parser = Config(observer=stats)
+        >>> parser({'DEBUG': bool, 'SECRET_KEY': str})
+        >>> stats.report()[0]
+        <<< {'key': 'SECRET_KEY', 'count': 1, 'total': 1.2e-06, ...}
+
+    """
+
+    FIELDS = ("lookup", "parse", "mapper", "total")
+
+    COUNTERS = ("count", "hits", "misses", "defaults", "errors")
+
+    def __init__(self) -> None:
+        self.stats: typing.Dict[str, typing.Dict[str, typing.Any]] = {}
+        self.lock = threading.Lock()
+
+    def __call__(self, event: KeyEvent) -> None:
+        """
+        Record a key event.
+
+        :param event: the event to record
+
+        """
+        with self.lock:
+            stats = self.stats.setdefault(event.key, self._empty(event.key))
+
+            stats["count"] += 1
+            stats["lookup"] += event.lookup
+            stats["parse"] += event.parse
+            stats["mapper"] += event.mapper
+            stats["total"] += event.lookup + event.parse + event.mapper
+            stats["hits"] += event.cache_hit is True
+            stats["misses"] += event.cache_hit is False
+            stats["defaults"] += event.default
+            stats["errors"] += event.error is not None
+
+    def _empty(self, key: str) -> typing.Dict[str, typing.Any]:
+        stats: typing.Dict[str, typing.Any] = {"key": key}
+        stats.update((k, 0.0) for k in self.FIELDS)
+        stats.update((k, 0) for k in self.COUNTERS)
+
+        return stats
+
+    def report(
+        self, sort_by: str = "total", limit: typing.Optional[int] = None
+    ) -> typing.List[typing.Dict[str, typing.Any]]:
+        """
+        Report the aggregated statistics for each key.
+
+        :param sort_by: the field to sort by in descending order
+        :param limit: the maximum number of keys to report
+        :return: a list of statistics per key
+
+        """
+        with self.lock:
+            rows = [dict(stats) for stats in self.stats.values()]
+
+        rows.sort(
+            key=lambda row: typing.cast(float, row[sort_by]), reverse=True
+        )
+
+        return rows[:limit]
+
+    def clear(self) -> None:
+        """
+        Discard the recorded statistics.
+        """
+        with self.lock:
+            self.stats.clear()
+
+
+class PrefixIndex:
+    """
+    Sorted index of environment keys for prefix lookups.
+
+    .. code-block:: python
+
+        >>> index = PrefixIndex(['CACHE_HOST', 'CACHE_PORT', 'DEBUG'])
+        >>> index.match('CACHE_')
+        <<< ['CACHE_HOST', 'CACHE_PORT']
+
+    :param keys: the keys to index
+
+    """
+
+    def __init__(self, keys: typing.Iterable[str]) -> None:
+        self.keys = sorted(keys)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def match(self, prefix: str) -> typing.List[str]:
+        """
+        Find the keys starting with a prefix.
+
+        :param prefix: the prefix to search for
+        :return: the matching keys in sorted order
+
+        """
+        start = bisect.bisect_left(self.keys, prefix)
+
+        return list(
+            itertools.takewhile(
+                lambda key: key.startswith(prefix),
+                itertools.islice(self.keys, start, None),
+            )
+        )
+
+
+class LRUCache:
+    """
+    Bounded least recently used cache.
+
+    Keeps count of hits, misses, and evictions to allow the effectiveness of
+    the cache to be monitored.
+
+    :param maxsize: the maximum number of entries to hold
+
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.data: "collections.OrderedDict[typing.Hashable, typing.Any]" = (
+            collections.OrderedDict()
+        )
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def get(
+        self, key: typing.Hashable, default: typing.Any = None
+    ) -> typing.Any:
+        """
+        Get an entry from the cache.
+
+        :param key: the key of the entry
+        :param default: the value to return on a cache miss
+        :return: the cached value
+
+        """
+        with self.lock:
+            try:
+                value = self.data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+
+            self.data.move_to_end(key)
+            self.hits += 1
+
+            return value
+
+    def set(self, key: typing.Hashable, value: typing.Any) -> None:
+        """
+        Add an entry to the cache, evicting the least recently used entries.
+
+        :param key: the key of the entry
+        :param value: the value to cache
+
+        """
+        with self.lock:
+            self.data[key] = value
+            self.data.move_to_end(key)
+
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Remove every entry from the cache.
+        """
+        with self.lock:
+            self.data.clear()
+
+
+class ParserRegistry:
+    """
+    Registry of functions parsing strings into types.
+
+    Parsers are called with the string value and the type requested, so one
+    parser can handle a type and all of its subclasses, and should throw a
+    :exc:`ValueError` for invalid values.
+
+    .. code-block:: python
+
+        >>> def parse_ip(value, type_):
+        ...     return type_(value.strip('[]'))
+        ...
+        >>> parsers.register(ipaddress.IPv6Address, parse_ip)
+        >>> config.parse('[::1]', ipaddress.IPv6Address)
+        <<< IPv6Address('::1')
+
+    The parser for a type is resolved once, by searching the method resolution
+    order of the type, or the origin of a typing special form such as
+    :data:`typing.Literal`, and the result is kept in a dispatch cache which
+    is cleared whenever a parser is registered.
+
+    """
+
+    def __init__(self) -> None:
+        self.parsers: typing.Dict[typing.Any, TypeParser] = {}
+        self.cache: typing.Dict[typing.Any, typing.Optional[TypeParser]] = {}
+        self.version = 0
+        self.lock = threading.Lock()
+
+    def register(self, type_: typing.Any, parser: TypeParser) -> None:
+        """
+        Register a parser for a type and its subclasses.
+
+        :param type\\_: the type to parse
+        :param parser: a function taking the value and the type requested
+
+        """
+        with self.lock:
+            self.parsers[type_] = parser
+            self.cache.clear()
+            self.version += 1
+
+    def unregister(self, type_: typing.Any) -> None:
+        """
+        Remove the parser registered for a type.
+
+        :param type\\_: the type to remove the parser of
+
+        """
+        with self.lock:
+            del self.parsers[type_]
+            self.cache.clear()
+            self.version += 1
+
+    def lookup(self, type_: typing.Any) -> typing.Optional[TypeParser]:
+        """
+        Find the parser for a type.
+
+        :param type\\_: the type to parse
+        :return: the parser, or :data:`None` when no parser is registered
+
+        """
+        try:
+            return self.cache[type_]
+        except KeyError:
+            pass
+
+        bases = getattr(type_, "__mro__", None) or (
+            getattr(type_, "__origin__", None),
+        )
+        parser = next(
+            (self.parsers[b] for b in bases if b in self.parsers), None
+        )
+        self.cache[type_] = parser
+
+        return parser
+
+
+class FileCache:
+    """
+    Cache of file contents used to read secrets referenced from files.
+
+    Following the convention used by Docker and Kubernetes secrets, a value
+    can be provided as the path of a file in a variable with the
+    :data:`FILE_SUFFIX`, :code:`SECRET_KEY_FILE=/run/secrets/secret_key`.
+
+    Contents are cached by the path, modification time, and size of the file,
+    so unchanged files are only stat-ed and not read again. When several
+    files have changed they are read concurrently in a thread pool.
+
+    :param max_workers: the maximum number of threads to read files with,
+                        defaults to the :class:`ThreadPoolExecutor` default
+
+    """
+
+    def __init__(self, max_workers: typing.Optional[int] = None) -> None:
+        self.max_workers = max_workers
+        self.data: typing.Dict[str, typing.Tuple[Signature, str]] = {}
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def overlay(
+        self, environ: typing.Mapping[str, str], keys: typing.Iterable[str]
+    ) -> typing.Mapping[str, str]:
+        """
+        Replace file references in an environment with the file contents.
+
+        .. code-block:: python
+
+           >>> environ = {'SECRET_KEY_FILE': '/run/secrets/key'}
+           >>> FileCache().overlay(environ, ['SECRET_KEY'])['SECRET_KEY']
+           <<< 'abc123'
+
+        :param environ: environment dictionary
+        :param keys: the keys which may be provided by files
+        :return: the environment with the file contents layered on top
+        :raises ConfigError: when a key is set both directly and by a file, or
+                             a file can not be read
+
+        """
+        paths = {}
+
+        for key in keys:
+            path = environ.get(key + FILE_SUFFIX)
+
+            if path is None:
+                continue
+
+            if key in environ:
+                raise ConfigError(
+                    "Both {0} and {0}{1} are set".format(key, FILE_SUFFIX)
+                )
+
+            paths[key] = path
+
+        if not paths:
+            return environ
+
+        contents = self.read_all(paths.values())
+        values = {key: contents[path] for key, path in paths.items()}
+
+        return collections.ChainMap(values, environ)  # type: ignore
+
+    def read(self, path: str) -> str:
+        """
+        Read a file, stripping a trailing newline.
+
+        :param path: the path of the file
+        :return: the contents of the file
+        :raises ConfigError: when the file can not be read
+
+        """
+        return self.read_all([path])[path]
+
+    def read_all(self, paths: typing.Iterable[str]) -> typing.Dict[str, str]:
+        """
+        Read several files, reading changed files concurrently.
+
+        :param paths: the paths of the files
+        :return: a dictionary of paths to file contents
+        :raises ConfigError: when a file can not be read
+
+        """
+        result = {}
+        stale = {}
+
+        for path in dict.fromkeys(paths):
+            signature = _signature(path)
+            entry = self.data.get(path)
+
+            if entry is not None and entry[0] == signature:
+                result[path] = entry[1]
+            else:
+                stale[path] = signature
+
+        result.update(zip(stale, self._map(self._load, stale.items())))
+
+        return result
+
+    def clear(self) -> None:
+        """
+        Remove every entry from the cache.
+        """
+        with self.lock:
+            self.data.clear()
+
+    def _map(
+        self,
+        func: typing.Callable[[T], str],
+        items: typing.Collection[T],
+    ) -> typing.Iterable[str]:
+        if len(items) < 2 or self.max_workers == 1:
+            return [func(item) for item in items]
+
+        with concurrent.futures.ThreadPoolExecutor(self.max_workers) as pool:
+            return list(pool.map(func, items))
+
+    def _load(self, item: typing.Tuple[str, Signature]) -> str:
+        path, signature = item
+
+        try:
+            with open(path, encoding="utf-8") as f:
+                value = f.read()
+        except OSError as e:
+            raise ConfigError(
+                "Unable to read file {0}: {1}".format(path, e.strerror)
+            )
+
+        if value.endswith("\n"):
+            value = value[:-1]
+
+        with self.lock:
+            self.data[path] = (signature, value)
+
+        return value
+
+
+class Sources(typing.Mapping[str, str]):
+    """
+    Stack of named environment layers flattened into a single index.
+
+    Layers are given highest precedence first, as with
+    :class:`collections.ChainMap`, but rather than searching every layer on
+    each lookup the layers are copied and flattened into one dictionary, along
+    with the layer each value came from.
+
+    .. code-block:: python
+
+        >>> sources = Sources(
+        ...     ('environ', os.environ),
+        ...     ('dotenv', read_dotenv('.env')),
+        ...     ('defaults', {'PORT': '8000'}),
+        ... )
+        >>> parser = Config(environ=sources)
+        >>> parser.get('PORT', type_=int)
+        <<< 8000
+        >>> sources.origin('PORT')
+        <<< 'defaults'
+
+    Changes to a layer are picked up by :meth:`refresh`, which only looks up
+    the keys of that layer which have changed.
+
+    :param layers: pairs of layer names and mappings, highest precedence first
+
+    """
+
+    def __init__(
+        self, *layers: typing.Tuple[str, typing.Mapping[str, str]]
+    ) -> None:
+        self.names = [name for name, _ in layers]
+        self.layers = [layer for _, layer in layers]
+        self.snapshots = [dict(layer) for layer in self.layers]
+        self.index: typing.Dict[str, str] = {}
+        self.origins: typing.Dict[str, int] = {}
+        self.environ = types.MappingProxyType(self.index)
+        self.lock = threading.Lock()
+        self.version = 0
+
+        for position in reversed(range(len(self.layers))):
+            self.index.update(self.snapshots[position])
+            self.origins.update(
+                dict.fromkeys(self.snapshots[position], position)
+            )
+
+    def __getitem__(self, key: str) -> str:
+        return self.index[key]
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self.index)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.index
+
+    def get(self, key: str, default: typing.Any = None) -> typing.Any:
+        """
+        Get a value from the highest precedence layer defining it.
+
+        :param key: the key to look up the value under
+        :param default: the value to return when no layer defines the key
+        :return: the value
+
+        """
+        return self.index.get(key, default)
+
+    def origin(self, key: str) -> typing.Optional[str]:
+        """
+        Get the name of the layer a value came from.
+
+        :param key: the key to look up
+        :return: the name of the layer, or :data:`None` when no layer defines
+                 the key
+
+        """
+        position = self.origins.get(key)
+
+        return None if position is None else self.names[position]
+
+    def replace(
+        self, name: str, layer: typing.Mapping[str, str]
+    ) -> typing.Set[str]:
+        """
+        Replace a layer and update the index.
+
+        :param name: the name of the layer
+        :param layer: the new mapping for the layer
+        :return: the keys whose value changed
+
+        """
+        self.layers[self.names.index(name)] = layer
+
+        return self.refresh(name)
+
+    def refresh(self, *names: str) -> typing.Set[str]:
+        """
+        Copy layers again and update the index with their changes.
+
+        :param names: the names of the layers to refresh, defaults to every
+                      layer
+        :return: the keys whose value changed
+
+        """
+        positions = (
+            [self.names.index(name) for name in names]
+            if names
+            else range(len(self.layers))
+        )
+        changed: typing.Set[str] = set()
+
+        with self.lock:
+            for position in positions:
+                changed.update(self._refresh(position))
+
+            if changed:
+                self.version += 1
+
+        return changed
+
+    def _refresh(self, position: int) -> typing.Set[str]:
+        old = self.snapshots[position]
+        new = self.snapshots[position] = dict(self.layers[position])
+
+        keys = {key for key, value in new.items() if old.get(key) != value}
+        keys.update(old.keys() - new.keys())
+
+        return {key for key in keys if self._resolve(key, position)}
+
+    def _resolve(self, key: str, position: int) -> bool:
+        if self.origins.get(key, position) < position:
+            return False
+
+        old = self.index.pop(key, None)
+        self.origins.pop(key, None)
+
+        for layer, snapshot in enumerate(self.snapshots):
+            if key in snapshot:
+                self.index[key] = snapshot[key]
+                self.origins[key] = layer
+                break
+
+        return self.index.get(key) != old
+
+
+class Config:
+    """
+    Config environment parser.
+
+    This class allows chosen configuration values to be extracted from the
+    processes environment variables and converted into the relevant types.
+
+    .. code-block:: python
+
+        parser = Config()
+
+        config = parser({
+            'DEBUG': {
+                'type': bool,
+                'default': False,
+            },
+            'SECRET_KEY': str,
+        })
+
+    The above will populate the :code:`config` variable with two values,
+    :code:`DEBUG` will be populated with a :class:`bool` from the environment
+    variable of the same  name, throwing an exception on invalid values and
+    defaulting to :data:`False` when none is provided, and :code:`SECRET_KEY`
+    will be a :class:`str` and throw a :exc:`ConfigError` when no value is
+    found in the environment.
+
+    An optional :code:`environ` param can be  passed in order to override the
+    environment, when given :class:`Sources` values are looked up directly in
+    its flattened index, and :meth:`refresh` refreshes every layer.
+
+    When :code:`snapshot` is set the environment is copied once into a frozen
+    mapping, avoiding the cost of encoding keys and decoding values on each
+    lookup in :data:`os.environ`, and giving every parse a consistent view of
+    the environment until :meth:`refresh` is called.
+
+    When :code:`cache_size` is set parsed values are kept in a
+    :class:`LRUCache` keyed by the raw value, type, and subtype, so repeated
+    raw strings are only converted once. Mutable values are copied on the way
+    in and out of the cache.
+
+    When an :code:`observer` is set it is called with a :class:`KeyEvent` for
+    every value retrieved, the observer must be set before a schema is compiled
+    for it to apply to the compiled schema. Without an observer no timing is
+    performed.
+
+    Schema items with :code:`file` set may be provided as the path of a file
+    in a variable with the :data:`FILE_SUFFIX`, read through the
+    :class:`FileCache` held in :attr:`files`.
+
+    :param environ: environment dictionary or :class:`Sources`, defaults to
+                    :data:`os.environ`
+    :param snapshot: copy the environment instead of referencing it
+    :param cache_size: the number of parsed values to cache, disabled when 0
+    :param observer: a function to call with per key events
+    :param registry: the parsers to use for types, defaults to
+                     :data:`parsers`
+
+    """
+
+    TRUE_STRINGS = ("t", "true", "on", "ok", "y", "yes", "1")
+
+    def __init__(
+        self,
+        environ: typing.Optional[typing.Mapping[str, str]] = None,
+        snapshot: bool = False,
+        cache_size: int = 0,
+        observer: typing.Optional[Observer] = None,
+        registry: typing.Optional[ParserRegistry] = None,
+    ) -> None:
+        self.cache = LRUCache(cache_size) if cache_size else None
+        self.registry = registry if registry is not None else parsers
+        self._parsers: typing.Dict[typing.Any, Parser] = {}
+        self._version = self.registry.version
+        self.files = FileCache()
+        self.observer = observer
+        self.source: typing.Mapping[str, str] = (
+            environ if environ is not None else os.environ
+        )
+        self.snapshot = snapshot
+        self.environ: typing.Mapping[str, str] = self.source
+        self._index: typing.Optional[PrefixIndex] = None
+        self._index_version: typing.Optional[int] = None
+        self._compiled: "weakref.WeakKeyDictionary[type, CompiledSchema]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+        self.refresh()
+
+    def refresh(self) -> None:
+        """
+        Take a new snapshot of the environment.
+
+        Only the prefix index is rebuilt unless the config was created with
+        :code:`snapshot`, or with :class:`Sources` which already hold a copy of
+        each layer.
+
+        """
+        self._index = None
+
+        if isinstance(self.source, Sources):
+            self.source.refresh()
+            self.environ = self.source.environ
+        elif self.snapshot:
+            self.environ = types.MappingProxyType(dict(self.source))
+
+    @property
+    def index(self) -> PrefixIndex:
+        """
+        Prefix index of the environment keys.
+
+        The index is built once per environment snapshot when the config was
+        created with :code:`snapshot` or :class:`Sources`, and rebuilt by
+        :meth:`refresh` or when the :class:`Sources` have changed. A live
+        environment may change at any time, so its index is rebuilt on every
+        access.
+
+        """
+        version = self._source_version
+
+        if (
+            self._index is None
+            or not self._frozen
+            or version != self._index_version
+        ):
+            self._index = PrefixIndex(self.environ)
+            self._index_version = version
+
+        return self._index
+
+    @property
+    def _frozen(self) -> bool:
+        return self.snapshot or isinstance(self.source, Sources)
+
+    @property
+    def _source_version(self) -> typing.Optional[int]:
+        if isinstance(self.source, Sources):
+            return self.source.version
+
+        return None
+
+    def __call__(
+        self, schema: Schema, executor: typing.Optional[Executor] = None
+    ) -> typing.Dict[str, typing.Any]:
+        """
+        Parse the environment according to a schema.
+
+        Slow mappers can be run in parallel by passing an :code:`executor`,
+        see :meth:`CompiledSchema.__call__`.
+
+        .. code-block:: python
+
+           >>> parser = Config()
+           >>> parser({'CERT': {'mapper': load_certificate}}, executor=4)
+           <<< {'CERT': <Certificate ...>}
+
+        :param schema: the schema to parse
+        :param executor: a :class:`concurrent.futures.Executor`, or a number of
+                         threads to run a thread pool with for the call
+        :return: a dictionary of config values
+
+        """
+        options = {key: _options(key, item) for key, item in schema.items()}
+
+        if executor is not None or any(
+            kwargs.get("file") for kwargs in options.values()
+        ):
+            return self.compile(schema)(executor=executor)
+
+        return {key: self.get(**kwargs) for key, kwargs in options.items()}
+
+    def compile(self, schema: Schema) -> CompiledSchema:
+        """
+        Compile a schema into a reusable parser plan.
+
+        .. code-block:: python
+
+           >>> parser = Config()
+           >>> compiled = parser.compile({'DEBUG': bool})
+           >>> compiled({'DEBUG': 'yes'})
+           <<< {'DEBUG': True}
+
+        :param schema: the schema to compile
+        :return: the compiled schema
+
+        """
+        options = {key: _options(key, item) for key, item in schema.items()}
+        files = [
+            kwargs["key"]
+            for kwargs in options.values()
+            if kwargs.pop("file", False)
+        ]
+
+        return CompiledSchema(
+            self,
+            {key: self.getter(**kwargs) for key, kwargs in options.items()},
+            {key: kwargs["key"] for key, kwargs in options.items()},
+            files,
+            schema,
+        )
+
+    def lazy(self, schema: Schema) -> LazyConfig:
+        """
+        Parse the environment lazily according to a schema.
+
+        .. code-block:: python
+
+           >>> parser = Config()
+           >>> values = parser.lazy({'DATABASE_URL': str})
+           >>> values['DATABASE_URL']
+           <<< 'sqlite:///'
+
+        :param schema: the schema to parse
+        :return: a mapping of config values parsed on first access
+
+        """
+        return self.compile(schema).lazy()
+
+    def namespace(
+        self,
+        prefix: str,
+        schema: typing.Union[Schema, typing.Type[typing.Any]] = str,
+        subtype: typing.Type[typing.Any] = str,
+        strip: bool = True,
+        separator: typing.Optional[str] = None,
+    ) -> typing.Dict[str, typing.Any]:
+        """
+        Parse the environment variables sharing a prefix.
+
+        When given a type every variable starting with :code:`prefix` is
+        parsed as that type, found through the :attr:`index` rather than a scan
+        of the environment. When given a schema its keys are looked up with
+        :code:`prefix` prepended.
+
+        .. code-block:: python
+
+           >>> os.environ['DB_REPLICA_1_PORT']
+           <<< '5432'
+           >>>
+           >>> parser = Config()
+           >>> parser.namespace('DB_', int, separator='_')
+           <<< {'REPLICA': {'1': {'PORT': 5432}}}
+           >>>
+           >>> parser.namespace('DB_REPLICA_1_', {'PORT': int})
+           <<< {'PORT': 5432}
+
+        :param prefix: the prefix of the environment variables
+        :param schema: the type of every variable, or a schema
+        :param subtype: subtype for iterator types
+        :param strip: remove the prefix from the names of the variables
+        :param separator: nest values by splitting names on the separator
+        :return: a dictionary of config values
+
+        """
+        if callable(schema):
+            values = self._namespace(prefix, schema, subtype, strip)
+        else:
+            values = self(_prefixed(prefix, schema))
+
+        return _nest(values, separator) if separator else values
+
+    def _namespace(
+        self,
+        prefix: str,
+        type_: typing.Type[typing.Any],
+        subtype: typing.Type[typing.Any],
+        strip: bool,
+    ) -> typing.Dict[str, typing.Any]:
+        start = len(prefix) if strip else 0
+        values = {}
+
+        for key in self.index.match(prefix):
+            value = self.environ.get(key)
+
+            if value is not None:
+                values[key[start:]] = self.parse(value, type_, subtype)
+
+        return values
+
+    def load(
+        self,
+        cls: typing.Type[T],
+        environ: typing.Optional[typing.Mapping[str, str]] = None,
+    ) -> T:
+        """
+        Parse the environment into an instance of a settings class.
+
+        The schema is built from the annotations and defaults of a
+        :mod:`dataclasses` dataclass, a :class:`typing.NamedTuple`, or a
+        :class:`typing.TypedDict`. :data:`typing.Optional` values, including
+        :code:`X | None`, default to :data:`None`, :class:`list`,
+        :class:`tuple`, :class:`set`, and :class:`frozenset` hints use their
+        parameter as the subtype, :class:`dict` hints their parameters as the
+        keytype and subtype, and :data:`typing.Any` is parsed as a string.
+        Other hints, such as unions of several types, raise a
+        :class:`ConfigError`.
+
+        The schema is built once per class, and compiled once per class for
+        each config.
+
+        .. code-block:: python
+
+           >>> @dataclasses.dataclass
+           ... class Settings:
+           ...     SECRET_KEY: str
+           ...     DEBUG: bool = False
+           ...
+           >>> parser = Config()
+           >>> parser.load(Settings)
+           <<< Settings(SECRET_KEY='abc123', DEBUG=False)
+
+        :param cls: the settings class
+        :param environ: environment dictionary, defaults to the environment
+                        of the config
+        :return: an instance of the settings class
+
+        """
+        compiled = self._compiled.get(cls)
+
+        if compiled is None:
+            compiled = self._compiled[cls] = self.compile(_schema_for(cls))
+
+        values = compiled(environ)
+
+        return cls(**{k: v for k, v in values.items() if v is not OMIT})
+
+    def materialize(self, schema: Schema) -> ConfigObject:
+        """
+        Parse the environment into a read-only object.
+
+        Names clashing with :class:`Mapping` methods such as :code:`keys`,
+        :code:`get`, and :code:`items` raise a :class:`ConfigError`, see
+        :meth:`CompiledSchema.materialize`.
+
+        .. code-block:: python
+
+           >>> parser = Config()
+           >>> values = parser.materialize({'DEBUG': bool})
+           >>> values.DEBUG
+           <<< False
+
+        :param schema: the schema to parse
+        :return: an object with an attribute for each config value
+
+        """
+        return self.compile(schema).materialize()
+
+    def preload(self, schema: Schema, freeze: bool = True) -> Preloader:
+        """
+        Parse the environment once to share the values with forked workers.
+
+        .. code-block:: python
+
+           >>> # settings.py, imported by the master before forking
+           >>> settings = config.preload({'ALLOWED_HOSTS': list})
+           >>> settings['ALLOWED_HOSTS']
+           <<< ('example.com',)
+
+        :param schema: the schema to parse
+        :param freeze: freeze the values and the garbage collector
+        :return: the preloader holding the config values
+
+        """
+        preloader = Preloader(self.compile(schema), freeze)
+        preloader.load()
+
+        return preloader
+
+    def share(
+        self, schema: Schema, name: typing.Optional[str] = None
+    ) -> "shared_memory.SharedMemory":
+        """
+        Parse the environment into a new shared memory block.
+
+        .. code-block:: python
+
+           >>> block = config.share({'PORT': int})
+           >>> block.name
+           <<< 'psm_3c2bd3ae'
+
+        :param schema: the schema to parse
+        :param name: the name of the block, a unique name is generated when
+                     not given
+        :return: the shared memory block, see :meth:`CompiledSchema.share`
+
+        """
+        return self.compile(schema).share(name=name)
+
+    def attach(self, schema: Schema, name: str) -> SharedConfig:
+        """
+        Read config values from a shared memory block without parsing them.
+
+        Only the environment variables referenced by the schema are read, to
+        check that the block was written from the same values.
+
+        .. code-block:: python
+
+           >>> settings = config.attach({'PORT': int}, 'psm_3c2bd3ae')
+           >>> settings['PORT']
+           <<< 8000
+
+        :param schema: the schema the block was written for
+        :param name: the name of the block
+        :return: the config values held in the block
+
+        """
+        digest = _environ_digest(*self._referenced(schema))
+
+        return SharedConfig(name, _fingerprint(self, schema), digest)
+
+    def _referenced(
+        self, schema: Schema
+    ) -> typing.Tuple[typing.Mapping[str, str], typing.List[str]]:
+        keys, files = _schema_keys(schema)
+
+        if files:
+            return self.files.overlay(self.environ, files), keys
+
+        return self.environ, keys
+
+    def cached(
+        self,
+        schema: Schema,
+        directory: typing.Union[str, "os.PathLike[str]"],
+        version: str = "",
+    ) -> typing.Dict[str, typing.Any]:
+        """
+        Parse the environment, reusing values cached on disk by earlier calls.
+
+        When every item of the schema is persisted the schema is only
+        compiled when the cache file is missing or stale.
+
+        .. code-block:: python
+
+           >>> config.cached({'ROUTES': {'mapper': compile_routes}}, '.cache')
+           <<< {'ROUTES': <Router ...>}
+
+        :param schema: the schema to parse
+        :param directory: the directory to keep the cache file in, see
+                          :meth:`CompiledSchema.cached`
+        :param version: the version of the code parsing the values
+        :return: a dictionary of config values
+
+        """
+        describer = _describer()
+
+        if len(_persisted(schema, describer)) == len(schema):
+            fingerprint = _cache_fingerprint(self, schema, version, describer)
+            values = _read_cache(
+                _cache_path(directory, fingerprint),
+                fingerprint,
+                _environ_digest(*self._referenced(schema)),
+            )
+
+            if values is not None and len(values) == len(schema):
+                return values
+
+        return self.compile(schema).cached(directory, version=version)
+
+    def reloader(self, schema: Schema) -> Reloader:
+        """
+        Create a loader which only re-parses values that have changed.
+
+        .. code-block:: python
+
+           >>> parser = Config()
+           >>> reloader = parser.reloader({'DEBUG': bool})
+           >>> values, changed = reloader.reload()
+
+        :param schema: the schema to parse
+        :return: the reloader
+
+        """
+        return self.compile(schema).reloader()
+
+    def generate(self, schema: Schema, standalone: bool = False) -> str:
+        """
+        Generate python source for a function parsing a schema.
+
+        The generated :code:`load(environ=None)` function contains one
+        unrolled assignment per key with the conversion for each type inlined.
+
+        When :code:`standalone` is set the source is a self contained module
+        which can be written to disk and imported, every type, default and
+        mapper must then be a literal or importable by name. Standalone
+        modules only reference the public API of this package, built in
+        parsers are looked up from :data:`parsers` when the module is
+        imported.
+
+        .. code-block:: python
+
+           >>> parser = Config()
+           >>> source = parser.generate({'DEBUG': bool}, standalone=True)
+           >>> pathlib.Path('settings_loader.py').write_text(source)
+
+        :param schema: the schema to generate source for
+        :param standalone: generate an importable module
+        :return: the generated source
+
+        """
+        return self._source(schema, standalone).render()
+
+    def codegen(self, schema: Schema, dump: bool = False) -> Loader:
+        """
+        Generate and compile a function parsing a schema.
+
+        .. code-block:: python
+
+           >>> parser = Config()
+           >>> load = parser.codegen({'DEBUG': bool})
+           >>> load({'DEBUG': 'yes'})
+           <<< {'DEBUG': True}
+
+        :param schema: the schema to generate a function for
+        :param dump: write the generated source to :data:`sys.stderr`
+        :return: a function returning a dictionary of config values
+
+        """
+        source = self._source(schema, standalone=False)
+        code = source.render()
+
+        if dump:
+            sys.stderr.write(code)
+
+        filename = "<twelvefactor-{0}>".format(id(source))
+        linecache.cache[filename] = (
+            len(code),
+            None,
+            code.splitlines(True),
+            filename,
+        )
+
+        namespace = dict(source.namespace)
+        exec(compile(code, filename, "exec"), namespace)  # nosec
+
+        return typing.cast(Loader, namespace["load"])
+
+    def _source(self, schema: Schema, standalone: bool) -> "_Source":
+        source = _Source(self, standalone)
+
+        for key, item in schema.items():
+            source.add(key, **_options(key, item))
+
+        return source
+
+    def parser(
+        self,
+        type_: typing.Type[typing.Any] = str,
+        subtype: typing.Type[typing.Any] = str,
+        tokenizer: typing.Optional[Tokenizer] = None,
+        keytype: typing.Type[typing.Any] = str,
+    ) -> Parser:
+        """
+        Build a function to parse values of a given type.
+
+        The type checks performed by :meth:`parse` are resolved once, the
+        returned function only performs the conversion.
+
+        :param type\\_: the type to return
+        :param subtype: subtype for iterator types, or value type for mapping
+                        types
+        :param tokenizer: the :class:`Tokenizer` splitting iterator and mapping
+                          types, splitting on commas when :data:`None`
+        :param keytype: key type for mapping types
+        :return: a function converting a string to the parsed config value
+
+        """
+        if type_ is bool:
+            return self._bool_parser()
+
+        parse = self.registry.lookup(type_)
+
+        if parse is not None:
+            return _registered(parse, type_)
+
+        if _is_collection(type_):
+            return self._collection_parser(
+                type_, subtype, tokenizer or Tokenizer()
+            )
+
+        if _is_mapping(type_):
+            return self._mapping_parser(
+                type_, keytype, subtype, tokenizer or Tokenizer()
+            )
+
+        return _guard(type_)
+
+    def _bool_parser(self) -> Parser:
+        true_strings = self.TRUE_STRINGS
+
+        def parse(value: str) -> bool:
+            return value.lower() in true_strings
+
+        return parse
+
+    def _collection_parser(
+        self,
+        type_: typing.Type[typing.Any],
+        subtype: typing.Type[typing.Any],
+        tokenizer: Tokenizer,
+    ) -> Parser:
+        _check_tokenizer(tokenizer)
+
+        if _is_array(type_):
+            return _guard(
+                functools.partial(
+                    _parse_array,
+                    type_=type_,
+                    subtype=subtype,
+                    tokenizer=tokenizer,
+                )
+            )
+
+        parse_item = self._item_parser(subtype, tokenizer.nested())
+
+        if issubclass(type_, SequenceView):
+            return _view_parser(type_, parse_item, tokenizer)
+
+        split = tokenizer.split if _is_collection(subtype) else tokenizer.items
+
+        return _items_parser(type_, parse_item, split)
+
+    def _mapping_parser(
+        self,
+        type_: typing.Type[typing.Any],
+        keytype: typing.Type[typing.Any],
+        subtype: typing.Type[typing.Any],
+        tokenizer: Tokenizer,
+    ) -> Parser:
+        _check_tokenizer(tokenizer)
+
+        parse_key = self._item_parser(keytype)
+        parse_value = self._item_parser(subtype, tokenizer.nested())
+
+        if not tokenizer.plain:
+            parse_key = _unquoting(parse_key, tokenizer)
+
+        if not tokenizer.plain and not _is_collection(subtype):
+            parse_value = _unquoting(parse_value, tokenizer)
+
+        return _pairs_parser(type_, parse_key, parse_value, tokenizer)
+
+    def _item_parser(
+        self,
+        type_: typing.Type[typing.Any],
+        tokenizer: typing.Optional[Tokenizer] = None,
+    ) -> Parser:
+        if (
+            type_ is bool
+            or _is_collection(type_)
+            or _is_mapping(type_)
+            or self.registry.lookup(type_) is not None
+        ):
+            return self.parser(type_, tokenizer=tokenizer)
+
+        # the ValueError of a plain type is converted by the outer parser
+        return type_
+
+    def getter(
+        self,
+        key: str,
+        default: typing.Any = UNSET,
+        type_: typing.Type[typing.Any] = str,
+        subtype: typing.Type[typing.Any] = str,
+        mapper: typing.Optional[typing.Callable[[object], object]] = None,
+        file: bool = False,
+        tokenizer: typing.Optional[Tokenizer] = None,
+        keytype: typing.Type[typing.Any] = str,
+    ) -> Getter:
+        """
+        Build a function to get a value from an environment.
+
+        The returned function takes an environment mapping and behaves like
+        :meth:`get` for the given arguments.
+
+        :param key: the key to look up the value under
+        :param default: default value to return when when no value is present
+        :param type\\_: the type to return
+        :param subtype: subtype for iterator types
+        :param mapper: a function to post-process the value with
+        :param file: allow the value to be read from a file
+        :param tokenizer: the :class:`Tokenizer` splitting iterator types
+        :param keytype: key type for mapping types
+        :return: a function returning the parsed config value
+
+        """
+        parse = self.parser(type_, subtype, tokenizer, keytype)
+
+        if self.cache is not None:
+            parse = self._caching_parser(
+                parse, _cache_key(type_, subtype, tokenizer, keytype)
+            )
+
+        if self.observer is not None:
+            get = self._observing_getter(key, default, parse, mapper)
+        else:
+            get = self._plain_getter(key, default, parse, mapper)
+
+        return self._file_getter(key, get) if file else get
+
+    def _file_getter(self, key: str, get: Getter) -> Getter:
+        keys = (key,)
+
+        def get_file(environ: typing.Mapping[str, str]) -> typing.Any:
+            return get(self.files.overlay(environ, keys))
+
+        return get_file
+
+    def _plain_getter(
+        self,
+        key: str,
+        default: typing.Any,
+        parse: Parser,
+        mapper: typing.Optional[Mapper],
+    ) -> Getter:
+        def get(environ: typing.Mapping[str, str]) -> typing.Any:
+            value = environ.get(key, UNSET)
+
+            if value is UNSET and default is UNSET:
+                raise ConfigError(
+                    "Unknown environment variable: {0}".format(key)
+                )
+
+            if value is UNSET:
+                value = default
+            else:
+                value = parse(typing.cast(str, value))
+
+            return mapper(value) if mapper else value
+
+        return get
+
+    def parse(
+        self,
+        value: str,
+        type_: typing.Type[typing.Any] = str,
+        subtype: typing.Type[typing.Any] = str,
+        tokenizer: typing.Optional[Tokenizer] = None,
+        keytype: typing.Type[typing.Any] = str,
+    ) -> typing.Any:
+        """
+        Parse value from string.
+
+        Convert :code:`value` to
+
+        .. code-block:: python
+
+           >>> parser = Config()
+           >>> parser.parse('12345', type_=int)
+           <<< 12345
+           >>>
+           >>> parser.parse('1,2,3,4', type_=list, subtype=int)
+           <<< [1, 2, 3, 4]
+           >>>
+           >>> parser.parse('a;"b;c"', list, tokenizer=Tokenizer(';', '"'))
+           <<< ['a', 'b;c']
+           >>>
+           >>> parser.parse('a=1,b=2', type_=dict, subtype=int)
+           <<< {'a': 1, 'b': 2}
+
+        :param value: string
+        :param type\\_: the type to return
+        :param subtype: subtype for iterator types
+        :param tokenizer: the :class:`Tokenizer` splitting iterator types,
+                          splitting on commas when :data:`None`
+        :param keytype: key type for mapping types
+        :return: the parsed config value
+
+        """
+        if self.cache is not None:
+            parse = functools.partial(
+                self._parse,
+                type_=type_,
+                subtype=subtype,
+                tokenizer=tokenizer,
+                keytype=keytype,
+            )
+            key = _cache_key(type_, subtype, tokenizer, keytype)
+            return self._cached_parse(parse, value, key)
+
+        return self._parse(value, type_, subtype, tokenizer, keytype)
+
+    def _parse(
+        self,
+        value: str,
+        type_: typing.Type[typing.Any] = str,
+        subtype: typing.Type[typing.Any] = str,
+        tokenizer: typing.Optional[Tokenizer] = None,
+        keytype: typing.Type[typing.Any] = str,
+    ) -> typing.Any:
+        if self._version != self.registry.version:
+            self._parsers.clear()
+            self._version = self.registry.version
+
+        key = (type_, subtype, tokenizer, keytype)
+
+        try:
+            parse = self._parsers[key]
+        except KeyError:
+            parse = self._parsers[key] = self.parser(*key)
+
+        return parse(value)
+
+    def _caching_parser(
+        self, parse: Parser, key: typing.Tuple[typing.Any, ...]
+    ) -> Parser:
+        def cached(value: str) -> typing.Any:
+            return self._cached_parse(parse, value, key)
+
+        return cached
+
+    def _cached_parse(
+        self, parse: Parser, value: str, key: typing.Tuple[typing.Any, ...]
+    ) -> typing.Any:
+        cache = typing.cast(LRUCache, self.cache)
+
+        return _memoize(cache, (value,) + key, parse, value)
+
+    def get(
+        self,
+        key: str,
+        default: typing.Any = UNSET,
+        type_: typing.Type[typing.Any] = str,
+        subtype: typing.Type[typing.Any] = str,
+        mapper: typing.Optional[typing.Callable[[object], object]] = None,
+        file: bool = False,
+        tokenizer: typing.Optional[Tokenizer] = None,
+        keytype: typing.Type[typing.Any] = str,
+    ) -> typing.Any:
+        """
+        Parse a value from an environment variable.
+
+        .. code-block:: python
+
+           >>> os.environ['FOO']
+           <<< '12345'
+           >>>
+           >>> os.environ['BAR']
+           <<< '1,2,3,4'
+           >>>
+           >>> 'BAZ' in os.environ
+           <<< False
+           >>>
+           >>> parser = Config()
+           >>> parser.get('FOO', type_=int)
+           <<< 12345
+           >>>
+           >>> parser.get('BAR', type_=list, subtype=int)
+           <<< [1, 2, 3, 4]
+           >>>
+           >>> parser.get('BAZ', default='abc123')
+           <<< 'abc123'
+           >>>
+           >>> parser.get('FOO', type_=int, mapper=lambda x: x*10)
+           <<< 123450
+           >>>
+           >>> os.environ['QUX_FILE']
+           <<< '/run/secrets/qux'
+           >>>
+           >>> parser.get('QUX', file=True)
+           <<< 'contents of /run/secrets/qux'
+
+        :param key: the key to look up the value under
+        :param default: default value to return when when no value is present
+        :param type\\_: the type to return
+        :param subtype: subtype for iterator types
+        :param mapper: a function to post-process the value with
+        :param file: allow the value to be read from the file named by the
+                     key with the :data:`FILE_SUFFIX`
+        :param tokenizer: the :class:`Tokenizer` splitting iterator types
+        :param keytype: key type for mapping types
+        :return: the parsed config value
+
+        """
+        environ = (
+            self.files.overlay(self.environ, (key,)) if file else self.environ
+        )
+
+        if self.observer is not None:
+            parse = functools.partial(
+                self.parse,
+                type_=type_,
+                subtype=subtype,
+                tokenizer=tokenizer,
+                keytype=keytype,
+            )
+            return self._observe(key, environ, default, parse, mapper)
+
+        value = environ.get(key, UNSET)
+
+        if value is UNSET and default is UNSET:
+            raise ConfigError("Unknown environment variable: {0}".format(key))
+
+        if value is UNSET:
+            value = default
+        else:
+            value = self.parse(
+                typing.cast(str, value), type_, subtype, tokenizer, keytype
+            )
+
+        if mapper:
+            value = mapper(value)
+
+        return value
+
+    async def aget(
+        self,
+        key: str,
+        default: typing.Any = UNSET,
+        type_: typing.Type[typing.Any] = str,
+        subtype: typing.Type[typing.Any] = str,
+        mapper: typing.Optional[typing.Callable[[object], object]] = None,
+        file: bool = False,
+        source: typing.Optional[AsyncSource] = None,
+        tokenizer: typing.Optional[Tokenizer] = None,
+        keytype: typing.Type[typing.Any] = str,
+    ) -> typing.Any:
+        """
+        Parse a value from an environment variable asynchronously.
+
+        Behaves like :meth:`get`, but the mapper may be a coroutine function,
+        and values missing from the environment may be fetched from an
+        asynchronous source, a coroutine function returning the value of a key
+        or :data:`None` when it has no value.
+
+        .. code-block:: python
+
+           >>> async def resolve(host):
+           ...     loop = asyncio.get_running_loop()
+           ...     return await loop.getaddrinfo(host, None)
+           ...
+           >>> parser = Config()
+           >>> await parser.aget('DB_HOST', mapper=resolve)
+           <<< [(<AddressFamily.AF_INET: 2>, ...)]
+
+        :param key: the key to look up the value under
+        :param default: default value to return when when no value is present
+        :param type\\_: the type to return
+        :param subtype: subtype for iterator types
+        :param mapper: a function or coroutine function to post-process the
+                       value with
+        :param file: allow the value to be read from the file named by the
+                     key with the :data:`FILE_SUFFIX`
+        :param source: a coroutine function to fetch missing values from
+        :param tokenizer: the :class:`Tokenizer` splitting iterator types
+        :param keytype: key type for mapping types
+        :return: the parsed config value
+
+        """
+        environ = (
+            self.files.overlay(self.environ, (key,)) if file else self.environ
+        )
+
+        if source is not None and key not in environ:
+            environ = await _fetch(source, key)
+
+        getter = self.getter(
+            key, default, type_, subtype, tokenizer=tokenizer, keytype=keytype
+        )
+        value = getter(environ)
+
+        return await _maybe_await(mapper(value)) if mapper else value
+
+    async def aload(
+        self,
+        schema: Schema,
+        limit: typing.Optional[int] = None,
+        source: typing.Optional[AsyncSource] = None,
+    ) -> typing.Dict[str, typing.Any]:
+        """
+        Parse the environment according to a schema asynchronously.
+
+        Every key is retrieved by :meth:`aget` concurrently, so the time taken
+        tracks the slowest key rather than the sum of every key.
+
+        .. code-block:: python
+
+           >>> parser = Config()
+           >>> await parser.aload({'DB_HOST': {'mapper': resolve}}, limit=10)
+           <<< {'DB_HOST': [(<AddressFamily.AF_INET: 2>, ...)]}
+
+        Results of coroutine mappers are not cached by :code:`cache_mapper`.
+
+        :param schema: the schema to parse
+        :param limit: the maximum number of keys to retrieve at once,
+                      unlimited when :data:`None`
+        :param source: a coroutine function to fetch missing values from
+        :return: a dictionary of config values
+
+        """
+        semaphore = asyncio.Semaphore(limit) if limit else None
+
+        async def get(kwargs: typing.Dict[str, typing.Any]) -> typing.Any:
+            if semaphore is None:
+                return await self.aget(source=source, **kwargs)
+
+            async with semaphore:
+                return await self.aget(source=source, **kwargs)
+
+        options = {key: _options(key, item) for key, item in schema.items()}
+        values = await asyncio.gather(*map(get, options.values()))
+
+        return dict(zip(options, values))
+
+    def _observing_getter(
+        self,
+        key: str,
+        default: typing.Any,
+        parse: Parser,
+        mapper: typing.Optional[Mapper],
+    ) -> Getter:
+        def get(environ: typing.Mapping[str, str]) -> typing.Any:
+            return self._observe(key, environ, default, parse, mapper)
+
+        return get
+
+    def _observe(
+        self,
+        key: str,
+        environ: typing.Mapping[str, str],
+        default: typing.Any,
+        parse: Parser,
+        mapper: typing.Optional[Mapper],
+    ) -> typing.Any:
+        observer = typing.cast(Observer, self.observer)
+        probe = _Probe(key, self.cache)
+
+        try:
+            value = probe.get(environ, default, parse, mapper)
+        except Exception as e:
+            observer(probe.event(e))
+            raise
+
+        observer(probe.event(None))
+
+        return value
+
+
+class _Source:
+    """
+    Builder for the source of a generated schema loader.
+
+    :param config: the config the source is generated for
+    :param standalone: only reference literals and importable objects
+
+    """
+
+    def __init__(self, config: Config, standalone: bool) -> None:
+        self.config = config
+        self.standalone = standalone
+        self.imports = {"os"}
+        self.namespace: typing.Dict[str, object] = {}
+        self.lines: typing.List[str] = []
+        self.files: typing.List[str] = []
+        self.tokenizers: typing.Dict[Tokenizer, str] = {}
+        self.parsers: typing.Dict[str, str] = {}
+        self.helpers: typing.Dict[str, str] = {}
+
+    def ref(self, value: object) -> str:
+        """
+        Return an expression referencing a value.
+
+        :param value: the value to reference
+        :return: python expression evaluating to the value
+
+        """
+        literal = _literal(value)
+
+        if literal is not None:
+            return literal
+
+        path = _import_path(value)
+
+        if path is not None and not (self.standalone and _is_private(path)):
+            if path[0] != "builtins":
+                self.imports.add(path[0])
+
+            return ".".join(p for p in path if p != "builtins")
+
+        return self._namespace_ref(value)
+
+    def _parser(self, parse: TypeParser, type_: typing.Any) -> str:
+        path = _import_path(parse)
+
+        if not self.standalone or path is None or not _is_private(path):
+            return self.ref(parse)
+
+        if parsers.lookup(type_) is not parse:
+            return self._namespace_ref(parse)
+
+        lookup = "twelvefactor.parsers.lookup({0})".format(self.ref(type_))
+
+        if lookup not in self.parsers:
+            self.imports.add("twelvefactor")
+            self.parsers[lookup] = "_parser_{0}".format(len(self.parsers))
+
+        return self.parsers[lookup]
+
+    def _namespace_ref(self, value: object) -> str:
+        if self.standalone:
+            raise ConfigError(
+                "Unable to reference {0!r} from a module".format(value)
+            )
+
+        name = "_ref_{0}".format(len(self.namespace))
+        self.namespace[name] = value
+
+        return name
+
+    def expression(
+        self,
+        var: str,
+        type_: typing.Type[typing.Any],
+        subtype: typing.Type[typing.Any] = str,
+        tokenizer: typing.Optional[Tokenizer] = None,
+        keytype: typing.Type[typing.Any] = str,
+        depth: int = 0,
+    ) -> str:
+        """
+        Return an expression converting a variable to a type.
+
+        :param var: the expression holding the string value
+        :param type\\_: the type to return
+        :param subtype: subtype for iterator types
+        :param tokenizer: the :class:`Tokenizer` splitting iterator types
+        :param keytype: key type for mapping types
+        :param depth: nesting level of iterator types
+        :return: python expression evaluating to the parsed value
+
+        """
+        if type_ is str:
+            return var
+
+        if type_ is bool:
+            true_strings = self.ref(tuple(self.config.TRUE_STRINGS))
+            return "{0}.lower() in {1}".format(var, true_strings)
+
+        parse = self.config.registry.lookup(type_)
+
+        if parse is not None:
+            return "{0}({1}, {2})".format(
+                self._parser(parse, type_), var, self.ref(type_)
+            )
+
+        if _is_collection(type_) or _is_mapping(type_):
+            return self._container(
+                var, type_, subtype, tokenizer or Tokenizer(), keytype, depth
+            )
+
+        return "{0}({1})".format(self.ref(type_), var)
+
+    def _container(
+        self,
+        var: str,
+        type_: typing.Type[typing.Any],
+        subtype: typing.Type[typing.Any],
+        tokenizer: Tokenizer,
+        keytype: typing.Type[typing.Any],
+        depth: int,
+    ) -> str:
+        if _is_mapping(type_):
+            return self._mapping(
+                var, type_, keytype, subtype, tokenizer, depth
+            )
+
+        return self._collection(var, type_, subtype, tokenizer, depth)
+
+    def _collection(
+        self,
+        var: str,
+        type_: typing.Type[typing.Any],
+        subtype: typing.Type[typing.Any],
+        tokenizer: Tokenizer,
+        depth: int,
+    ) -> str:
+        _check_tokenizer(tokenizer)
+
+        if _is_array(type_):
+            return self._array(var, type_, subtype, tokenizer)
+
+        if issubclass(type_, SequenceView):
+            return self._view(var, type_, subtype, tokenizer, depth)
+
+        if tokenizer != Tokenizer():
+            return self._tokenized(var, type_, subtype, tokenizer, depth)
+
+        item = "_i{0}".format(depth)
+        parse = self.expression(
+            "{0}.strip(' ')".format(item), subtype, depth=depth + 1
+        )
+
+        return (
+            "{type}({parse} for {item} in {var}.split(','))"
+            " if {var}.strip(' ') else {type}()"
+        ).format(type=self.ref(type_), parse=parse, item=item, var=var)
+
+    def _array(
+        self,
+        var: str,
+        type_: typing.Type[typing.Any],
+        subtype: typing.Type[typing.Any],
+        tokenizer: Tokenizer,
+    ) -> str:
+        try:
+            typecode = _typecode(subtype)
+        except ValueError as e:
+            raise ConfigError(*e.args)
+
+        if tokenizer.plain:
+            split = "{0}.split({1!r})".format(var, tokenizer.delimiter)
+        else:
+            split = "{0}.items({1})".format(self._tokens(tokenizer), var)
+
+        items = "map({0}, {1} if {2}.strip() else ())".format(
+            self.ref(subtype), split, var
+        )
+
+        if numpy is not None and issubclass(type_, numpy.ndarray):
+            self.imports.add("numpy")
+            return "numpy.fromiter({0}, {1!r})".format(items, typecode)
+
+        return "{0}({1!r}, {2})".format(self.ref(type_), typecode, items)
+
+    def _tokenized(
+        self,
+        var: str,
+        type_: typing.Type[typing.Any],
+        subtype: typing.Type[typing.Any],
+        tokenizer: Tokenizer,
+        depth: int,
+    ) -> str:
+        item = "_i{0}".format(depth)
+        parse = self.expression(
+            item, subtype, tokenizer=tokenizer.nested(), depth=depth + 1
+        )
+        split = "split" if _is_collection(subtype) else "items"
+
+        return "{0}({1} for {2} in {3}.{4}({5}))".format(
+            self.ref(type_), parse, item, self._tokens(tokenizer), split, var
+        )
+
+    def _mapping(
+        self,
+        var: str,
+        type_: typing.Type[typing.Any],
+        keytype: typing.Type[typing.Any],
+        subtype: typing.Type[typing.Any],
+        tokenizer: Tokenizer,
+        depth: int,
+    ) -> str:
+        _check_tokenizer(tokenizer)
+
+        key, value = "_k{0}".format(depth), "_v{0}".format(depth)
+
+        if tokenizer.plain:
+            keys = "{0}.strip(' ')".format(key)
+            values = "{0}.strip(' ')".format(value)
+            loop = self._plain_pairs(var, key, value, tokenizer, depth)
+        else:
+            tokens = self._tokens(tokenizer)
+            keys = "{0}.unquote({1})".format(tokens, key)
+            values = (
+                value
+                if _is_collection(subtype)
+                else "{0}.unquote({1})".format(tokens, value)
+            )
+            loop = "for {0}, {1} in map({2}.partition, {2}.split({3}))".format(
+                key, value, tokens, var
+            )
+
+        parse_key = self.expression(keys, keytype, depth=depth + 1)
+        parse_value = self.expression(
+            values, subtype, tokenizer=tokenizer.nested(), depth=depth + 1
+        )
+        result = "{0}(({1}, {2}) {3})".format(
+            self.ref(type_), parse_key, parse_value, loop
+        )
+
+        if tokenizer.plain:
+            return "{0} if {1}.strip(' ') else {2}()".format(
+                result, var, self.ref(type_)
+            )
+
+        return result
+
+    def _plain_pairs(
+        self,
+        var: str,
+        key: str,
+        value: str,
+        tokenizer: Tokenizer,
+        depth: int,
+    ) -> str:
+        item, found = "_i{0}".format(depth), "_s{0}".format(depth)
+
+        return (
+            "for {item} in {var}.split({delimiter!r})"
+            " for {key}, {found}, {value} in"
+            " ({item}.partition({separator!r}),)"
+            " if {found} or {missing}({item}, {separator!r})"
+        ).format(
+            item=item,
+            var=var,
+            delimiter=tokenizer.delimiter,
+            key=key,
+            found=found,
+            value=value,
+            separator=tokenizer.separator,
+            missing=self._missing_separator(),
+        )
+
+    def _view(
+        self,
+        var: str,
+        type_: typing.Type[typing.Any],
+        subtype: typing.Type[typing.Any],
+        tokenizer: Tokenizer,
+        depth: int,
+    ) -> str:
+        if not tokenizer.plain:
+            raise ConfigError("SequenceView does not support quote or escape")
+
+        item = "_i{0}".format(depth)
+        parse = self.expression(
+            item, subtype, tokenizer=tokenizer.nested(), depth=depth + 1
+        )
+
+        return "{0}({1}, lambda {2}: {3}, {4!r})".format(
+            self.ref(type_), var, item, parse, tokenizer.delimiter
+        )
+
+    def _missing_separator(self) -> str:
+        self.helpers["_missing_separator"] = _MISSING_SEPARATOR
+
+        return "_missing_separator"
+
+    def _tokens(self, tokenizer: Tokenizer) -> str:
+        if tokenizer not in self.tokenizers:
+            name = "_tokenizer_{0}".format(len(self.tokenizers))
+            self.tokenizers[tokenizer] = name
+
+        return self.tokenizers[tokenizer]
+
+    def add(
+        self,
+        name: str,
+        key: str,
+        default: typing.Any = UNSET,
+        type_: typing.Type[typing.Any] = str,
+        subtype: typing.Type[typing.Any] = str,
+        mapper: typing.Optional[typing.Callable[[object], object]] = None,
+        file: bool = False,
+        tokenizer: typing.Optional[Tokenizer] = None,
+        keytype: typing.Type[typing.Any] = str,
+    ) -> None:
+        """
+        Add the assignment of a config value.
+
+        :param name: the name of the config value
+        :param key: the key to look up the value under
+        :param default: default value to use when when no value is present
+        :param type\\_: the type to return
+        :param subtype: subtype for iterator types
+        :param mapper: a function to post-process the value with
+        :param file: allow the value to be read from a file
+        :param tokenizer: the :class:`Tokenizer` splitting iterator types
+        :param keytype: key type for mapping types
+
+        """
+        if file:
+            self.files.append(key)
+
+        self.lines.append("    value = environ.get({0!r}, UNSET)".format(key))
+        self.lines.append("    if value is UNSET:")
+        self.lines.append("        " + self._default(key, default))
+
+        parse = self.expression("value", type_, subtype, tokenizer, keytype)
+
+        if parse != "value":
+            self.lines.append("    else:")
+            self.lines.append("        try:")
+            self.lines.append("            value = " + parse)
+            self.lines.append(
+                "        except (ValueError, OverflowError) as e:"
+            )
+            self.lines.append("            raise ConfigError(*e.args)")
+
+        value = "{0}(value)".format(self.ref(mapper)) if mapper else "value"
+
+        self.lines.append("    result[{0!r}] = {1}".format(name, value))
+
+    def _default(self, key: str, default: typing.Any) -> str:
+        if default is UNSET:
+            error = "Unknown environment variable: {0}".format(key)
+            return "raise ConfigError({0!r})".format(error)
+
+        return "value = {0}".format(self.ref(default))
+
+    def render(self) -> str:
+        """
+        Render the source of the module.
+
+        :return: the generated source
+
+        """
+        environ = (
+            "os.environ"
+            if self.standalone
+            else self.ref(self.config) + ".environ"
+        )
+
+        definitions = [
+            "{0} = {1}{2!r}".format(name, self.ref(Tokenizer), tuple(t))
+            for t, name in self.tokenizers.items()
+        ]
+        definitions += [
+            "{0} = {1}".format(name, lookup)
+            for lookup, name in self.parsers.items()
+        ]
+
+        if self.files and self.standalone:
+            definitions.append("_files = {0}()".format(self.ref(FileCache)))
+
+        helpers = [line for h in self.helpers.values() for line in (h, "", "")]
+
+        header = ["# generated by twelvefactor, do not edit."]
+        header += sorted("import {0}".format(i) for i in self.imports)
+        header += [
+            "",
+            "from twelvefactor import ConfigError",
+            "",
+            "UNSET = object()",
+            *definitions,
+            "",
+            "",
+            *helpers,
+            "def load(environ=None):",
+            "    if environ is None:",
+            "        environ = {0}".format(environ),
+            "    result = {}",
+        ]
+
+        if self.files:
+            files = (
+                "_files" if self.standalone else self.ref(self.config.files)
+            )
+            header.append(
+                "    environ = {0}.overlay(environ, {1!r})".format(
+                    files, tuple(self.files)
+                )
+            )
+
+        return "\n".join(header + self.lines + ["    return result", ""])
+
+
+class _Probe:
+    """
+    Timer for the stages of getting a single config value.
+
+    :param key: the key to look up the value under
+    :param cache: the parse cache of the config
+
+    """
+
+    def __init__(self, key: str, cache: typing.Optional[LRUCache]) -> None:
+        self.key = key
+        self.cache = cache
+        self.hits = cache.hits if cache is not None else 0
+        self.times = {"lookup": 0.0, "parse": 0.0, "mapper": 0.0}
+        self.default = False
+        self.parsed = False
+        self.start = time.perf_counter()
+
+    def mark(self, stage: str) -> None:
+        """
+        Record the time taken by a stage.
+
+        :param stage: the name of the stage
+
+        """
+        now = time.perf_counter()
+        self.times[stage] = now - self.start
+        self.start = now
+
+    def get(
+        self,
+        environ: typing.Mapping[str, str],
+        default: typing.Any,
+        parse: Parser,
+        mapper: typing.Optional[Mapper],
+    ) -> typing.Any:
+        """
+        Get a value, recording the time taken by each stage.
+
+        :param environ: environment dictionary
+        :param default: default value to return when when no value is present
+        :param parse: a function to parse the value with
+        :param mapper: a function to post-process the value with
+        :return: the parsed config value
+
+        """
+        value = environ.get(self.key, UNSET)
+        self.mark("lookup")
+
+        if value is UNSET and default is UNSET:
+            raise ConfigError(
+                "Unknown environment variable: {0}".format(self.key)
+            )
+
+        self.default = value is UNSET
+        self.parsed = not self.default
+        value = default if self.default else parse(typing.cast(str, value))
+        self.mark("parse")
+
+        if mapper:
+            value = mapper(value)
+            self.mark("mapper")
+
+        return value
+
+    def event(self, error: typing.Optional[Exception]) -> KeyEvent:
+        """
+        Create the event for the recorded stages.
+
+        :param error: the error thrown getting the value
+        :return: the event
+
+        """
+        cache_hit = None
+
+        if self.cache is not None and self.parsed:
+            cache_hit = self.cache.hits > self.hits
+
+        return KeyEvent(
+            key=self.key,
+            cache_hit=cache_hit,
+            default=self.default,
+            error=error,
+            **self.times
+        )
+
+
+def _options(
+    name: str, item: typing.Union[typing.Type[typing.Any], SchemaItem]
+) -> typing.Dict[str, typing.Any]:
+    if not isinstance(item, collections.abc.Mapping):
+        return {"key": name, "type_": item}
+
+    mapper = item.get("mapper", None)
+    cache_mapper = item.get("cache_mapper", False)
+
+    if mapper and cache_mapper and not inspect.iscoroutinefunction(mapper):
+        maxsize = MAPPER_CACHE_SIZE if cache_mapper is True else cache_mapper
+        mapper = _cached_mapper(mapper, maxsize)
+
+    return {
+        "key": item.get("key", name),
+        "default": item.get("default", UNSET),
+        "type_": item.get("type", str),
+        "subtype": item.get("subtype", str),
+        "keytype": item.get("keytype", str),
+        "mapper": mapper,
+        "file": item.get("file", False),
+        "tokenizer": _tokenizer(item),
+    }
+
+
+def _tokenizer(item: SchemaItem) -> typing.Optional[Tokenizer]:
+    tokenizer = Tokenizer(
+        delimiter=item.get("delimiter", ","),
+        quote=item.get("quote", None),
+        escape=item.get("escape", None),
+        subdelimiter=item.get("subdelimiter", ","),
+        separator=item.get("separator", "="),
+    )
+
+    return None if tokenizer == Tokenizer() else tokenizer
+
+
+def _prefixed(prefix: str, schema: Schema) -> Schema:
+    result: typing.Dict[str, SchemaItem] = {}
+
+    for name, item in schema.items():
+        options = (
+            SchemaItem(type=item) if callable(item) else SchemaItem(**item)
+        )
+        options["key"] = prefix + options.get("key", name)
+        result[name] = options
+
+    return result
+
+
+def _nest(
+    values: typing.Mapping[str, typing.Any], separator: str
+) -> typing.Dict[str, typing.Any]:
+    result: typing.Dict[str, typing.Any] = {}
+
+    for name, value in values.items():
+        *parents, leaf = name.split(separator)
+        node = _node(result, parents, name)
+
+        if leaf in node:
+            raise ConfigError("Conflicting config value: {0}".format(name))
+
+        node[leaf] = value
+
+    return result
+
+
+def _node(
+    root: typing.Dict[str, typing.Any],
+    parents: typing.Sequence[str],
+    name: str,
+) -> typing.Dict[str, typing.Any]:
+    node = root
+
+    for part in parents:
+        node = node.setdefault(part, {})
+
+        if not isinstance(node, dict):
+            raise ConfigError("Conflicting config value: {0}".format(name))
+
+    return node
+
+
+_ORIGINS: typing.Dict[object, type] = {
+    typing.List: list,
+    typing.Tuple: tuple,
+    typing.Set: set,
+    typing.FrozenSet: frozenset,
+    typing.Dict: dict,
+}
+
+_UNION_TYPE = getattr(types, "UnionType", None)
+
+_schemas: "weakref.WeakKeyDictionary[type, Schema]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _schema_for(cls: type) -> Schema:
+    try:
+        return _schemas[cls]
+    except KeyError:
+        pass
+
+    hints = typing.get_type_hints(cls)
+    defaults = _defaults(cls)
+    schema: typing.Dict[str, SchemaItem] = {}
+
+    for name in _fields(cls, hints):
+        item = _item_for(hints[name])
+
+        if name in defaults:
+            item["default"] = defaults[name]
+
+        schema[name] = item
+
+    _schemas[cls] = schema
+
+    return schema
+
+
+def _is_typed_dict(cls: type) -> bool:
+    return issubclass(cls, dict) and hasattr(cls, "__total__")
+
+
+def _fields(
+    cls: type, hints: typing.Mapping[str, object]
+) -> typing.Sequence[str]:
+    if dataclasses is not None and dataclasses.is_dataclass(cls):
+        return [f.name for f in dataclasses.fields(cls) if f.init]
+
+    if issubclass(cls, tuple) and hasattr(cls, "_fields"):
+        return typing.cast(typing.Sequence[str], getattr(cls, "_fields"))
+
+    if _is_typed_dict(cls):
+        return list(hints)
+
+    raise ConfigError("Unsupported settings class: {0!r}".format(cls))
+
+
+def _defaults(cls: type) -> typing.Dict[str, object]:
+    if dataclasses is not None and dataclasses.is_dataclass(cls):
+        return _dataclass_defaults(cls)
+
+    if _is_typed_dict(cls):
+        return _typed_dict_defaults(cls)
+
+    return dict(getattr(cls, "_field_defaults", {}))
+
+
+def _dataclass_defaults(cls: type) -> typing.Dict[str, object]:
+    defaults: typing.Dict[str, object] = {}
+
+    for field in dataclasses.fields(cls):
+        if field.default is not dataclasses.MISSING:
+            defaults[field.name] = field.default
+        elif field.default_factory is not dataclasses.MISSING:
+            defaults[field.name] = OMIT
+
+    return defaults
+
+
+def _typed_dict_defaults(cls: type) -> typing.Dict[str, object]:
+    hints = getattr(cls, "__annotations__", {})
+    required = getattr(
+        cls,
+        "__required_keys__",
+        hints if getattr(cls, "__total__", True) else (),
+    )
+
+    return {name: OMIT for name in hints if name not in required}
+
+
+def _item_for(hint: typing.Any) -> SchemaItem:
+    args = getattr(hint, "__args__", None) or ()
+    origin = _origin(hint)
+
+    if origin is typing.Union:
+        return _optional_item(hint, args)
+
+    if _is_collection(origin):
+        subtypes = [_hint_type(a) for a in args if a is not Ellipsis]
+
+        return SchemaItem(
+            type=origin, subtype=subtypes[0] if subtypes else str
+        )
+
+    if _is_mapping(origin):
+        return _mapping_item(origin, args)
+
+    return SchemaItem(type=_hint_type(hint))
+
+
+def _origin(hint: typing.Any) -> typing.Any:
+    if _UNION_TYPE is not None and isinstance(hint, _UNION_TYPE):
+        return typing.Union
+
+    origin = getattr(hint, "__origin__", None)
+
+    return _ORIGINS.get(origin, origin)
+
+
+def _optional_item(
+    hint: typing.Any, args: typing.Sequence[typing.Any]
+) -> SchemaItem:
+    options = [a for a in args if a is not type(None)]
+
+    if len(options) != 1 or len(options) == len(args):
+        raise ConfigError("Unsupported type hint: {0!r}".format(hint))
+
+    item = _item_for(options[0])
+    item["default"] = None
+
+    return item
+
+
+def _hint_type(hint: typing.Any) -> typing.Any:
+    if isinstance(hint, type) or _is_literal(hint):
+        return hint
+
+    if hint is typing.Any:
+        return str
+
+    raise ConfigError("Unsupported type hint: {0!r}".format(hint))
+
+
+def _mapping_item(
+    origin: typing.Type[typing.Any], args: typing.Sequence[typing.Any]
+) -> SchemaItem:
+    if len(args) == 2:
+        return SchemaItem(
+            type=origin,
+            keytype=_hint_type(args[0]),
+            subtype=_hint_type(args[1]),
+        )
+
+    return SchemaItem(type=origin)
+
+
+def _is_collection(type_: typing.Type[typing.Any]) -> bool:
+    return isinstance(type_, type) and issubclass(
+        type_, COLLECTIONS + ARRAYS + (SequenceView,)
+    )
+
+
+def _is_mapping(type_: typing.Type[typing.Any]) -> bool:
+    return isinstance(type_, type) and issubclass(type_, MAPPINGS)
+
+
+def _is_array(type_: typing.Type[typing.Any]) -> bool:
+    return isinstance(type_, type) and issubclass(type_, ARRAYS)
+
+
+def _parse_array(
+    value: str,
+    type_: typing.Type[typing.Any],
+    subtype: typing.Type[typing.Any],
+    tokenizer: typing.Optional[Tokenizer] = None,
+) -> typing.Any:
+    typecode = _typecode(subtype)
+    items = _array_items(value, tokenizer or Tokenizer())
+
+    try:
+        if numpy is not None and issubclass(type_, numpy.ndarray):
+            return numpy.fromiter(map(subtype, items), typecode, len(items))
+
+        return type_(typecode, map(subtype, items))
+    except OverflowError as e:
+        raise ValueError(*e.args)
+
+
+def _array_items(value: str, tokenizer: Tokenizer) -> typing.List[str]:
+    if not value.strip():
+        return []
+
+    if tokenizer.plain:
+        return value.split(tokenizer.delimiter)
+
+    return list(tokenizer.items(value))
+
+
+def _literal(value: object) -> typing.Optional[str]:
+    if type(value) is tuple:
+        items = typing.cast(typing.Tuple[object, ...], value)
+
+        if any(_literal(v) is None for v in items):
+            return None
+
+        return repr(value)
+
+    if type(value) is float:
+        return repr(value) if math.isfinite(value) else None
+
+    if type(value) in (type(None), bool, int, str, bytes):
+        return repr(value)
+
+    return None
+
+
+def _import_path(value: object) -> typing.Optional[typing.Tuple[str, str]]:
+    module = getattr(value, "__module__", None)
+    qualname = getattr(value, "__qualname__", None)
+
+    if not isinstance(module, str) or not isinstance(qualname, str):
+        return None
+
+    target: object = sys.modules.get(module)
+
+    for part in qualname.split("."):
+        target = getattr(target, part, None)
+
+    return (module, qualname) if target is value else None
+
+
+def _is_private(path: typing.Tuple[str, str]) -> bool:
+    module, qualname = path
+
+    return module == __name__ and any(
+        part.startswith("_") for part in qualname.split(".")
+    )
+
+
+def _is_mutable(value: object) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return True
+
+    return False
+
+
+def _is_literal(hint: typing.Any) -> bool:
+    return (
+        _LITERAL is not None and getattr(hint, "__origin__", None) is _LITERAL
+    )
+
+
+def _registered(parse: TypeParser, type_: typing.Any) -> Parser:
+    def parse_value(value: str) -> typing.Any:
+        try:
+            return parse(value, type_)
+        except ValueError as e:
+            raise ConfigError(*e.args)
+
+    return parse_value
+
+
+_first_group = operator.itemgetter(1)
+
+
+def _check_tokenizer(tokenizer: Tokenizer) -> None:
+    chars = [c for c in (tokenizer.quote, tokenizer.escape) if c is not None]
+
+    if not tokenizer.delimiter or not tokenizer.subdelimiter:
+        raise ConfigError("Delimiters must not be empty")
+
+    delimiters = tokenizer.delimiter + tokenizer.subdelimiter
+
+    if not tokenizer.separator:
+        raise ConfigError("Separators must not be empty")
+
+    if chars and " " in delimiters + tokenizer.separator:
+        raise ConfigError("Delimiters of quoted values must not be spaces")
+
+    if len(set(chars)) != len(chars) or any(
+        len(c) != 1 or c in delimiters + tokenizer.separator + " "
+        for c in chars
+    ):
+        raise ConfigError("Invalid quote or escape: {0!r}".format(tokenizer))
+
+
+def _key_end(
+    item: str,
+    separator: str,
+    quote: typing.Optional[str],
+    escape: typing.Optional[str],
+) -> int:
+    match = _token_pattern(separator, quote, escape).match(item)
+    end = typing.cast(typing.Match[str], match).end()
+
+    return -1 if end == len(item) else end
+
+
+def _quoted(quote: str, escape: typing.Optional[str]) -> str:
+    if escape is None:
+        return "[^{0}]*".format(re.escape(quote))
+
+    return "(?:{1}.|[^{0}{1}])*".format(re.escape(quote), re.escape(escape))
+
+
+@functools.lru_cache(maxsize=None)
+def _token_pattern(
+    delimiter: str, quote: typing.Optional[str], escape: typing.Optional[str]
+) -> typing.Pattern[str]:
+    specials = re.escape("".join(c for c in (quote, escape) if c is not None))
+    parts = []
+
+    if quote is not None:
+        parts.append(
+            "{0}{1}{0}".format(re.escape(quote), _quoted(quote, escape))
+        )
+
+    if escape is not None:
+        parts.append(re.escape(escape) + ".")
+
+    parts.append(_run(delimiter, specials))
+    parts.append(r"(?!{0})[ ]+(?![ ]*(?:{0}|\Z))")
+    parts.append("[{1}]")
+    token = r"(?:\A|{0})[ ]*((?:" + "|".join(parts) + r")*)[ ]*(?=\Z|{0})"
+
+    return re.compile(token.format(re.escape(delimiter), specials), re.DOTALL)
+
+
+def _run(delimiter: str, specials: str) -> str:
+    if len(delimiter) == 1:
+        return "[^ {0}{1}]+".format(re.escape(delimiter), specials)
+
+    return "(?:(?!{0})[^ {1}])+".format(re.escape(delimiter), specials)
+
+
+@functools.lru_cache(maxsize=None)
+def _unquoter(
+    quote: typing.Optional[str], escape: typing.Optional[str]
+) -> typing.Callable[[str], str]:
+    specials = re.escape("".join(c for c in (quote, escape) if c is not None))
+    search = re.compile("[{0}]".format(specials)).search
+    parts = []
+
+    if quote is not None:
+        content = _quoted(quote, escape)
+        parts.append("{0}(?P<quoted>{1}){0}".format(re.escape(quote), content))
+
+    if escape is not None:
+        parts.append(re.escape(escape) + "(?P<escaped>.)")
+
+    pattern = re.compile("|".join(parts), re.DOTALL)
+    replace = functools.partial(_unquoted, escape)
+
+    def unquote(item: str) -> str:
+        return pattern.sub(replace, item) if search(item) else item
+
+    return unquote
+
+
+def _unquoted(escape: typing.Optional[str], match: typing.Match[str]) -> str:
+    groups = match.groupdict()
+    quoted = groups.get("quoted")
+
+    if quoted is None:
+        return typing.cast(str, groups["escaped"])
+
+    if escape is None:
+        return quoted
+
+    return _escape_pattern(escape).sub(r"\1", quoted)
+
+
+@functools.lru_cache(maxsize=None)
+def _escape_pattern(escape: str) -> typing.Pattern[str]:
+    return re.compile(re.escape(escape) + "(.)", re.DOTALL)
+
+
+def _offsets(data: bytes, delimiter: bytes) -> "array.array[int]":
+    offsets = array.array("q", [0])
+    find = data.find
+    position = find(delimiter)
+
+    while position != -1:
+        offsets.append(position)
+        position = find(delimiter, position + len(delimiter))
+
+    offsets.append(len(data))
+
+    return offsets
+
+
+def _typecode(subtype: typing.Type[typing.Any]) -> str:
+    try:
+        return ARRAY_TYPECODES[subtype]
+    except KeyError:
+        raise ValueError("Unsupported array subtype: {0!r}".format(subtype))
+
+
+def _items_parser(
+    type_: typing.Type[typing.Any],
+    parse_item: Parser,
+    split: typing.Callable[[str], typing.Iterator[str]],
+) -> Parser:
+    def parse(value: str) -> typing.Any:
+        try:
+            return type_(map(parse_item, split(value)))
+        except ValueError as e:
+            raise ConfigError(*e.args)
+
+    return parse
+
+
+def _view_parser(
+    type_: typing.Type[SequenceView], parse_item: Parser, tokenizer: Tokenizer
+) -> Parser:
+    if not tokenizer.plain:
+        raise ConfigError("SequenceView does not support quote or escape")
+
+    return functools.partial(
+        type_, parse=parse_item, delimiter=tokenizer.delimiter
+    )
+
+
+def _pairs(
+    value: str, tokenizer: Tokenizer
+) -> typing.Iterator[typing.Tuple[str, str]]:
+    return map(tokenizer.partition, tokenizer.split(value))
+
+
+def _missing_separator(item: str, separator: str) -> bool:
+    error = "Missing {0!r} in {1!r}".format(separator, item.strip(" "))
+    raise ValueError(error)
+
+
+def _pairs_parser(
+    type_: typing.Type[typing.Any],
+    parse_key: Parser,
+    parse_value: Parser,
+    tokenizer: Tokenizer,
+) -> Parser:
+    if tokenizer.plain:
+        return _plain_pairs_parser(type_, parse_key, parse_value, tokenizer)
+
+    def parse(value: str) -> typing.Any:
+        try:
+            return type_(
+                (parse_key(k), parse_value(v))
+                for k, v in _pairs(value, tokenizer)
+            )
+        except ValueError as e:
+            raise ConfigError(*e.args)
+
+    return parse
+
+
+def _plain_pairs_parser(
+    type_: typing.Type[typing.Any],
+    parse_key: Parser,
+    parse_value: Parser,
+    tokenizer: Tokenizer,
+) -> Parser:
+    delimiter, separator = tokenizer.delimiter, tokenizer.separator
+
+    def parse(value: str) -> typing.Any:
+        if not value.strip(" "):
+            return type_()
+
+        try:
+            return type_(
+                (parse_key(k.strip(" ")), parse_value(v.strip(" ")))
+                for item in value.split(delimiter)
+                for k, found, v in (item.partition(separator),)
+                if found or _missing_separator(item, separator)
+            )
+        except ValueError as e:
+            raise ConfigError(*e.args)
+
+    return parse
+
+
+def _unquoting(parse: Parser, tokenizer: Tokenizer) -> Parser:
+    unquote = _unquoter(tokenizer.quote, tokenizer.escape)
+
+    def parse_unquoted(value: str) -> typing.Any:
+        return parse(unquote(value))
+
+    return parse_unquoted
+
+
+def _cache_key(
+    type_: typing.Type[typing.Any],
+    subtype: typing.Type[typing.Any],
+    tokenizer: typing.Optional[Tokenizer],
+    keytype: typing.Type[typing.Any],
+) -> typing.Tuple[typing.Any, ...]:
+    key: typing.Tuple[typing.Any, ...] = (type_, subtype)
+
+    if tokenizer is not None or keytype is not str:
+        key += (tokenizer, keytype)
+
+    return key
+
+
+def _guard(type_: Parser) -> Parser:
+    def parse(value: str) -> typing.Any:
+        try:
+            return type_(value)
+        except ValueError as e:
+            raise ConfigError(*e.args)
+
+    return parse
+
+
+_mapper_caches: "weakref.WeakKeyDictionary[Mapper, LRUCache]" = (
+    weakref.WeakKeyDictionary()
+)
+_mapper_caches_lock = threading.Lock()
+
+
+def mapper_cache(
+    mapper: Mapper, maxsize: typing.Optional[int] = None
+) -> typing.Optional[LRUCache]:
+    """
+    Get the cache holding the results of a mapper.
+
+    Mapper results are shared between every schema and :class:`Config` using
+    the same mapper with :code:`cache_mapper` set, the cache holds as many
+    entries as the largest size any of them requested.
+
+    :param mapper: the mapper to get the cache for
+    :param maxsize: create the cache with this size when it does not exist,
+                    or grow it to this size when it is smaller
+    :return: the cache, or :data:`None` when the mapper has no cache
+
+    """
+    try:
+        with _mapper_caches_lock:
+            cache = _mapper_caches.get(mapper)
+
+            if cache is None and maxsize is not None:
+                cache = _mapper_caches[mapper] = LRUCache(maxsize)
+            elif cache is not None and maxsize is not None:
+                cache.maxsize = max(cache.maxsize, maxsize)
+    except TypeError:
+        return None
+
+    return cache
+
+
+def clear_mapper_cache(mapper: typing.Optional[Mapper] = None) -> None:
+    """
+    Invalidate cached mapper results.
+
+    :param mapper: the mapper to invalidate, defaults to every mapper
+
+    """
+    if mapper is not None:
+        caches = [mapper_cache(mapper)]
+    else:
+        with _mapper_caches_lock:
+            caches = list(_mapper_caches.values())
+
+    for cache in caches:
+        if cache is not None:
+            cache.clear()
+
+
+def _cached_mapper(mapper: Mapper, maxsize: int) -> Mapper:
+    cache = mapper_cache(mapper, maxsize)
+
+    if cache is None:
+        return mapper
+
+    def cached(value: object) -> object:
+        return _call_cached(cache, mapper, value)
+
+    return cached
+
+
+def _call_cached(cache: LRUCache, mapper: Mapper, value: object) -> object:
+    try:
+        key = _mapper_key(value)
+    except TypeError:
+        raise ConfigError(
+            "Unable to cache mapper results for {0} values".format(
+                type(value).__name__
+            )
+        )
+
+    return _memoize(cache, key, mapper, value)
+
+
+def _mapper_key(value: object) -> typing.Hashable:
+    freeze = _MAPPER_KEYS.get(type(value))
+
+    if freeze is not None:
+        return type(value), freeze(value)
+
+    if isinstance(value, array.array):
+        return type(value), value.typecode, value.tobytes()
+
+    hash(value)  # other unhashable values raise a TypeError
+
+    return type(value), value
+
+
+def _sequence_key(value: typing.Iterable[object]) -> typing.Hashable:
+    return tuple(map(_mapper_key, value))
+
+
+def _set_key(value: typing.Iterable[object]) -> typing.Hashable:
+    return frozenset(map(_mapper_key, value))
+
+
+def _dict_key(value: typing.Mapping[object, object]) -> typing.Hashable:
+    return tuple((_mapper_key(k), _mapper_key(v)) for k, v in value.items())
+
+
+_MAPPER_KEYS: typing.Dict[
+    typing.Any, typing.Callable[[typing.Any], typing.Hashable]
+] = {
+    list: _sequence_key,
+    tuple: _sequence_key,
+    SequenceView: _sequence_key,
+    set: _set_key,
+    frozenset: _set_key,
+    dict: _dict_key,
+}
+
+
+def _memoize(
+    cache: LRUCache,
+    key: typing.Hashable,
+    func: typing.Callable[[T], typing.Any],
+    value: T,
+) -> typing.Any:
+    entry = cache.get(key, UNSET)
+
+    if entry is not UNSET:
+        result, mutable = entry
+        return copy.deepcopy(result) if mutable else result
+
+    result = func(value)
+    mutable = _is_mutable(result)
+    cache.set(key, (copy.deepcopy(result) if mutable else result, mutable))
+
+    return result
+
+
+_SHARED_MAGIC = b"12fc"
+
+_SHARED_HEADER = struct.Struct("<4sH16s16sII")
+
+_CACHE_MAGIC = b"12fp"
+
+_CACHE_FORMAT = 1
+
+_CACHE_HEADER = struct.Struct("<4sH16s16s")
+
+_MISSING_SEPARATOR = """\
+def _missing_separator(item, separator):
+    error = "Missing {0!r} in {1!r}".format(separator, item.strip(" "))
+    raise ValueError(error)"""
+
+_PICKLE_ERRORS = (pickle.PicklingError, TypeError, AttributeError)
+
+_ADDRESS = re.compile(r" at 0x[0-9a-fA-F]+")
+
+_DOTENV = r"""
+    ^[ \t]*(?:
+        (?:export[ \t]+)?([A-Za-z_][A-Za-z0-9_.]*)[ \t]*=[ \t]*
+        (?:
+            (?<=[ \t])\#[^\n]*
+            |('[^']*'|"(?:[^"\\]+|\\[\s\S])*"|[^\n]*)
+        )
+        |([^\s\#][^\n]*)
+    )
+"""
+
+_DOTENV_TEXT = re.compile(_DOTENV, re.MULTILINE | re.VERBOSE)
+
+_DOTENV_BYTES = re.compile(_DOTENV.encode(), re.MULTILINE | re.VERBOSE)
+
+_DOTENV_COMMENT = re.compile(r"[ \t]\#")
+
+_DOTENV_ESCAPES = {"n": "\n", "r": "\r", "t": "\t", '"': '"', "\\": "\\"}
+
+_DOTENV_ESCAPE = re.compile(r"\\(.)", re.S)
+
+
+def parse_dotenv(
+    text: typing.Union[str, bytes, mmap.mmap],
+) -> typing.Dict[str, str]:
+    """
+    Parse the contents of a :code:`.env` file.
+
+    The contents are tokenized in a single pass, supporting :code:`export`
+    prefixes, comments, single quoted literal values, and double quoted values
+    with escapes which may span multiple lines.
+
+    .. code-block:: python
+
+       >>> parse_dotenv('export DEBUG=true # comment\\nSECRET_KEY="a\\\\nb"')
+       <<< {'DEBUG': 'true', 'SECRET_KEY': 'a\\nb'}
+
+    :param text: the contents of the file, bytes are decoded as UTF-8
+    :return: a dictionary of the variables defined
+    :raises ConfigError: when a line can not be parsed
+
+    """
+    if isinstance(text, str):
+        tokens = _DOTENV_TEXT.findall(text)
+    else:
+        tokens = [
+            tuple(t.decode("utf-8") for t in token)
+            for token in _DOTENV_BYTES.findall(text)
+        ]
+
+    values = {}
+
+    for key, value, error in tokens:
+        if error:
+            raise ConfigError(
+                "Invalid .env line {0}: {1}".format(_line(text, error), error)
+            )
+
+        value = value.rstrip()
+
+        if "#" in value or value[:1] in ("'", '"'):
+            value = _dotenv_value(value)
+
+        values[key] = value
+
+    return values
+
+
+def read_dotenv(
+    path: typing.Union[str, "os.PathLike[str]"],
+) -> typing.Dict[str, str]:
+    """
+    Read a :code:`.env` file.
+
+    Files larger than :data:`MMAP_THRESHOLD` bytes are memory mapped and
+    tokenized without decoding the whole file.
+
+    :param path: the path of the file
+    :return: a dictionary of the variables defined
+    :raises ConfigError: when a line can not be parsed
+
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+            return parse_dotenv(f.read().decode("utf-8"))
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return parse_dotenv(data)
+
+
+def dotenv(
+    path: typing.Union[str, "os.PathLike[str]"],
+    environ: typing.Optional[typing.Mapping[str, str]] = None,
+    override: bool = False,
+) -> typing.Mapping[str, str]:
+    """
+    Layer the variables of a :code:`.env` file with the environment.
+
+    .. code-block:: python
+
+       >>> parser = Config(environ=dotenv('.env'))
+
+    :param path: the path of the file
+    :param environ: environment dictionary, defaults to :data:`os.environ`
+    :param override: give the file precedence over the environment
+    :return: a mapping looking up variables in both
+
+    """
+    values = read_dotenv(path)
+    environ = environ if environ is not None else os.environ
+    layers = [values, environ] if override else [environ, values]
+
+    return collections.ChainMap(*layers)  # type: ignore
+
+
+def _evaluate(
+    getters: typing.Mapping[str, Getter],
+    environ: typing.Mapping[str, str],
+    executor: Executor,
+) -> typing.Dict[str, typing.Any]:
+    if isinstance(executor, int):
+        with concurrent.futures.ThreadPoolExecutor(executor) as pool:
+            return _evaluate(getters, environ, pool)
+
+    futures = {
+        key: executor.submit(getter, environ)
+        for key, getter in getters.items()
+    }
+
+    return {key: _result(key, future) for key, future in futures.items()}
+
+
+def _result(
+    key: str, future: "concurrent.futures.Future[typing.Any]"
+) -> typing.Any:
+    try:
+        return future.result()
+    except Exception as e:
+        raise ConfigError("{0}: {1}".format(key, e)) from e
+
+
+async def _fetch(source: AsyncSource, key: str) -> typing.Mapping[str, str]:
+    value = await source(key)
+
+    return {} if value is None else {key: value}
+
+
+async def _maybe_await(value: typing.Any) -> typing.Any:
+    return await value if inspect.isawaitable(value) else value
+
+
+def _after_fork(ref: "weakref.ref[Preloader]") -> None:
+    preloader = ref()
+
+    if preloader is not None:
+        preloader.after_fork()
+
+
+def _reset_locks(config: Config) -> None:
+    global _mapper_caches_lock
+
+    holders: typing.List[object] = [
+        config.cache,
+        config.files,
+        config.observer,
+    ]
+    holders += [config.registry, config.source, *_mapper_caches.values()]
+
+    for holder in holders:
+        if hasattr(holder, "lock"):
+            setattr(holder, "lock", threading.Lock())
+
+    _mapper_caches_lock = threading.Lock()
+
+
+def _fingerprint(
+    config: Config,
+    schema: Schema,
+    describer: typing.Optional[
+        typing.Callable[[object], typing.Optional[str]]
+    ] = None,
+) -> bytes:
+    lookup = describer or _describer()
+
+    def describe(value: object) -> str:
+        description = lookup(value)
+
+        if description is None:
+            raise ConfigError(
+                "Unable to fingerprint {0!r}, it is not identified by its "
+                "import path, code or value".format(value)
+            )
+
+        return description
+
+    parsers = sorted(
+        (describe(t), describe(p)) for t, p in config.registry.parsers.items()
+    )
+    items = [
+        (
+            (name, sorted((k, describe(v)) for k, v in item.items()))
+            if isinstance(item, collections.abc.Mapping)
+            else (name, describe(item))
+        )
+        for name, item in schema.items()
+    ]
+    description = repr(
+        (describe(type(config)), config.TRUE_STRINGS, parsers, items)
+    )
+
+    return hashlib.blake2b(
+        description.encode("utf-8", "surrogatepass"), digest_size=16
+    ).digest()
+
+
+def _schema_keys(
+    schema: Schema,
+) -> typing.Tuple[typing.List[str], typing.List[str]]:
+    keys = []
+    files = []
+
+    for name, item in schema.items():
+        if not isinstance(item, collections.abc.Mapping):
+            keys.append(name)
+            continue
+
+        keys.append(item.get("key", name))
+
+        if item.get("file", False):
+            files.append(keys[-1])
+
+    return keys, files
+
+
+def _describer() -> typing.Callable[[object], typing.Optional[str]]:
+    described: typing.Dict[int, typing.Optional[str]] = {}
+
+    def describe(value: object) -> typing.Optional[str]:
+        try:
+            return described[id(value)]
+        except KeyError:
+            description = described[id(value)] = _describe(value)
+
+        return description
+
+    return describe
+
+
+def _describe(value: object) -> typing.Optional[str]:
+    literal = _literal(value)
+
+    if literal is not None:
+        return literal
+
+    if isinstance(value, types.FunctionType):
+        return _describe_function(value)
+
+    path = _import_path(value)
+
+    return _describe_object(value) if path is None else ".".join(path)
+
+
+def _describe_function(func: types.FunctionType) -> typing.Optional[str]:
+    if func.__closure__:  # captured values are not part of the code
+        return None
+
+    defaults = [_describe(v) for v in func.__defaults__ or ()]
+
+    if None in defaults:
+        return None
+
+    return "{0}.{1}:{2}:{3}".format(
+        func.__module__,
+        func.__qualname__,
+        _code_digest(func.__code__),
+        defaults,
+    )
+
+
+def _describe_object(value: object) -> typing.Optional[str]:
+    if isinstance(value, (set, frozenset)):
+        items = typing.cast(typing.AbstractSet[object], value)
+        description = "{0}({1})".format(
+            type(value).__name__, sorted(repr(v) for v in items)
+        )
+    else:
+        description = repr(value)
+
+    return None if _ADDRESS.search(description) else description
+
+
+def _code_digest(code: types.CodeType) -> str:
+    return hashlib.blake2b(
+        _describe_code(code).encode("utf-8", "surrogatepass"), digest_size=8
+    ).hexdigest()
+
+
+def _describe_code(code: types.CodeType) -> str:
+    consts = [
+        (
+            _describe_code(c)
+            if isinstance(c, types.CodeType)
+            else _describe_object(c) or repr(c)
+        )
+        for c in code.co_consts
+    ]
+
+    return repr((code.co_code, code.co_names, consts))
+
+
+def _environ_digest(
+    environ: typing.Mapping[str, str], keys: typing.Iterable[str]
+) -> bytes:
+    raw = repr([environ.get(key) for key in keys])
+
+    return hashlib.blake2b(
+        raw.encode("utf-8", "surrogatepass"), digest_size=16
+    ).digest()
+
+
+def _share(
+    values: typing.Mapping[str, typing.Any],
+    fingerprint: bytes,
+    digest: bytes,
+    name: typing.Optional[str],
+) -> "shared_memory.SharedMemory":
+    if shared_memory is None:  # pragma: no cover
+        raise ConfigError("Shared config requires Python 3.8 or later")
+
+    payloads = []
+    index = {}
+    offset = _SHARED_HEADER.size
+
+    for key, value in values.items():
+        payloads.append(_pickle(key, value))
+        index[key] = (offset, offset + len(payloads[-1]))
+        offset += len(payloads[-1])
+
+    payloads.append(pickle.dumps(index, pickle.HIGHEST_PROTOCOL))
+
+    header = _SHARED_HEADER.pack(
+        _SHARED_MAGIC,
+        SHARED_FORMAT,
+        fingerprint,
+        digest,
+        offset,
+        len(payloads[-1]),
+    )
+    start = len(header)
+    size = offset + len(payloads[-1])
+    memory = shared_memory.SharedMemory(name, create=True, size=size)
+    buf = typing.cast(memoryview, memory.buf)
+
+    buf[start:size] = b"".join(payloads)
+    buf[:start] = header
+
+    return memory
+
+
+def _pickle(key: str, value: object) -> bytes:
+    try:
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    except _PICKLE_ERRORS as e:
+        raise ConfigError("Unable to pickle {0}: {1}".format(key, e)) from e
+
+
+def _attach(name: str) -> "shared_memory.SharedMemory":
+    if shared_memory is None:  # pragma: no cover
+        raise ConfigError("Shared config requires Python 3.8 or later")
+
+    try:
+        if sys.version_info >= (3, 13):  # pragma: no cover
+            return shared_memory.SharedMemory(name, track=False)
+
+        return shared_memory.SharedMemory(name)
+    except FileNotFoundError:
+        raise ConfigError("Unknown shared config block: {0}".format(name))
+
+
+def _shared_index(
+    buf: memoryview, name: str, fingerprint: bytes, digest: bytes
+) -> typing.Dict[str, typing.Tuple[int, int]]:
+    try:
+        *check, start, end = _shared_header(buf)
+
+        if check == [fingerprint, digest]:
+            # the block was written by _share, not by untrusted input
+            index = pickle.loads(buf[start:end])  # nosec B301
+            return typing.cast(typing.Dict[str, typing.Tuple[int, int]], index)
+    except (struct.error, ValueError, pickle.UnpicklingError):
+        raise ConfigError("Invalid shared config block: {0}".format(name))
+
+    raise ConfigError("Stale shared config block: {0}".format(name))
+
+
+def _shared_header(buf: memoryview) -> typing.Tuple[bytes, bytes, int, int]:
+    magic, version, fingerprint, digest, start, size = (
+        _SHARED_HEADER.unpack_from(buf)
+    )
+
+    if magic != _SHARED_MAGIC or version != SHARED_FORMAT:
+        raise ValueError("Unsupported shared config block format")
+
+    if start + size > len(buf):
+        raise ValueError("Truncated shared config block")
+
+    return fingerprint, digest, start, start + size
+
+
+def _persisted(
+    schema: Schema, describe: typing.Callable[[object], typing.Optional[str]]
+) -> typing.List[str]:
+    return [
+        name for name, item in schema.items() if _persistable(item, describe)
+    ]
+
+
+def _persistable(
+    item: typing.Union[typing.Type[typing.Any], SchemaItem],
+    describe: typing.Callable[[object], typing.Optional[str]],
+) -> bool:
+    if not isinstance(item, collections.abc.Mapping):
+        return describe(item) is not None
+
+    return bool(item.get("persist", True)) and all(
+        describe(v) is not None for v in item.values()
+    )
+
+
+def _cache_fingerprint(
+    config: Config,
+    schema: Schema,
+    version: str,
+    describer: typing.Callable[[object], typing.Optional[str]],
+) -> bytes:
+    fingerprint = _fingerprint(config, schema, describer)
+
+    return hashlib.blake2b(
+        fingerprint + version.encode("utf-8", "surrogatepass"), digest_size=16
+    ).digest()
+
+
+def _cache_path(
+    directory: typing.Union[str, "os.PathLike[str]"], fingerprint: bytes
+) -> str:
+    return os.path.join(
+        directory,
+        "{0}.{1}.pickle".format(
+            fingerprint.hex(), sys.implementation.cache_tag
+        ),
+    )
+
+
+def _read_cache(
+    path: str, fingerprint: bytes, digest: bytes
+) -> typing.Optional[typing.Dict[str, typing.Any]]:
+    header = _CACHE_HEADER.pack(
+        _CACHE_MAGIC, _CACHE_FORMAT, fingerprint, digest
+    )
+
+    try:
+        with open(path, "rb") as f:
+            if f.read(len(header)) != header:
+                return None
+
+            # the file was written by _write_cache in a trusted directory
+            values = pickle.load(f)  # nosec B301
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        return None
+    except (AttributeError, ImportError):  # pickled classes have changed
+        return None
+
+    return typing.cast(typing.Dict[str, typing.Any], values)
+
+
+def _write_cache(
+    path: str,
+    fingerprint: bytes,
+    digest: bytes,
+    values: typing.Mapping[str, typing.Any],
+) -> None:
+    header = _CACHE_HEADER.pack(
+        _CACHE_MAGIC, _CACHE_FORMAT, fingerprint, digest
+    )
+    data = header + _pickle_picklable(values)
+    directory = os.path.dirname(path) or os.curdir
+
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, temp = tempfile.mkstemp(".tmp", ".", directory)
+    except OSError:
+        return
+
+    try:
+        with open(fd, "wb") as f:
+            f.write(data)
+
+        os.replace(temp, path)
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.unlink(temp)
+
+
+def _pickle_picklable(values: typing.Mapping[str, typing.Any]) -> bytes:
+    try:
+        return pickle.dumps(dict(values), pickle.HIGHEST_PROTOCOL)
+    except _PICKLE_ERRORS:
+        pass
+
+    picklable = {}
+
+    for key, value in values.items():
+        with contextlib.suppress(*_PICKLE_ERRORS):
+            pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            picklable[key] = value
+
+    return pickle.dumps(picklable, pickle.HIGHEST_PROTOCOL)
+
+
+def _freeze(value: T) -> typing.Any:
+    if type(value) in (list, tuple):
+        return tuple(map(_freeze, typing.cast(typing.Iterable[object], value)))
+
+    if type(value) is set:
+        return frozenset(typing.cast(typing.Set[object], value))
+
+    if type(value) is dict:
+        items = typing.cast(typing.Dict[object, object], value).items()
+        return types.MappingProxyType({k: _freeze(v) for k, v in items})
+
+    return value
+
+
+def _signature(path: str) -> Signature:
+    try:
+        stat = os.stat(path)
+    except OSError as e:
+        raise ConfigError(
+            "Unable to read file {0}: {1}".format(path, e.strerror)
+        )
+
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _line(text: typing.Union[str, bytes, mmap.mmap], error: str) -> int:
+    if isinstance(text, str):
+        return text[: text.index(error)].count("\n") + 1
+
+    encoded = error.encode("utf-8")
+
+    return text[: text.find(encoded)].count(b"\n") + 1
+
+
+def _dotenv_value(value: str) -> str:
+    if len(value) > 1 and value[0] == value[-1] == '"':
+        return _unescape(value[1:-1])
+
+    if len(value) > 1 and value[0] == value[-1] == "'":
+        return value[1:-1]
+
+    comment = _DOTENV_COMMENT.search(value)
+
+    return value[: comment.start()].rstrip() if comment else value
+
+
+def _unescape(value: str) -> str:
+    if "\\" not in value:
+        return value
+
+    return _DOTENV_ESCAPE.sub(_replace_escape, value)
+
+
+def _replace_escape(match: typing.Match[str]) -> str:
+    return _DOTENV_ESCAPES.get(match.group(1), match.group(0))
+
+
+class ByteSize(int):
+    """
+    A number of bytes, parsed from sizes such as :code:`512MB`.
+
+    Units are case insensitive, :code:`KB`, :code:`MB`, :code:`GB`,
+    :code:`TB`, and :code:`PB` are powers of 1000, and :code:`KiB`,
+    :code:`MiB`, :code:`GiB`, :code:`TiB`, and :code:`PiB` are powers of
+    1024. The trailing :code:`B` is optional and values without a unit are
+    bytes.
+
+    .. code-block:: python
+
+        >>> config.parse('1.5KiB', ByteSize)
+        <<< 1536
+
+    """
+
+
+_LITERAL = getattr(typing, "Literal", None)
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(us|ms|s|m|h|d|w)")
+
+_DURATION_VALID = re.compile(r"(?:\d+(?:\.\d+)?(?:us|ms|s|m|h|d|w))+")
+
+_DURATION_UNITS = {
+    "us": "microseconds",
+    "ms": "milliseconds",
+    "s": "seconds",
+    "m": "minutes",
+    "h": "hours",
+    "d": "days",
+    "w": "weeks",
+}
+
+_BYTE_SIZE = re.compile(r"(\d+(?:\.\d+)?)[ \t]*(?:([kmgtp])(i)?)?b?", re.I)
+
+
+def _parse_isoformat(value: str, type_: typing.Any) -> typing.Any:
+    if not hasattr(type_, "fromisoformat"):  # pragma: no cover
+        raise ValueError(
+            "Parsing {0} requires Python 3.7 or later".format(type_.__name__)
+        )
+
+    return type_.fromisoformat(value)
+
+
+def _parse_timedelta(value: str, type_: typing.Any) -> typing.Any:
+    try:
+        return _duration(value.replace(" ", ""), type_)
+    except OverflowError as e:
+        raise ValueError(*e.args)
+
+
+def _duration(value: str, type_: typing.Any) -> typing.Any:
+    try:
+        return type_(seconds=float(value))
+    except ValueError:
+        pass
+
+    if not _DURATION_VALID.fullmatch(value):
+        raise ValueError("Invalid duration: {0!r}".format(value))
+
+    return sum(
+        (
+            type_(**{_DURATION_UNITS[unit]: float(number)})
+            for number, unit in _DURATION.findall(value)
+        ),
+        type_(),
+    )
+
+
+def _parse_decimal(value: str, type_: typing.Any) -> typing.Any:
+    try:
+        return type_(value)
+    except decimal.InvalidOperation:
+        raise ValueError("Invalid decimal: {0!r}".format(value))
+
+
+def _parse_path(value: str, type_: typing.Any) -> typing.Any:
+    return type_(value)
+
+
+def _parse_byte_size(value: str, type_: typing.Any) -> typing.Any:
+    match = _BYTE_SIZE.fullmatch(value.strip())
+
+    if match is None:
+        raise ValueError("Invalid byte size: {0!r}".format(value))
+
+    number, unit, binary = match.groups()
+    power = "_kmgtp".index(unit.lower()) if unit else 0
+
+    return type_(decimal.Decimal(number) * (1024 if binary else 1000) ** power)
+
+
+def _parse_enum(value: str, type_: typing.Any) -> typing.Any:
+    try:
+        return type_[value]
+    except KeyError:
+        pass
+
+    for member in type_:
+        if str(member.value) == value:
+            return member
+
+    raise ValueError("{0!r} is not a valid {1}".format(value, type_.__name__))
+
+
+def _parse_literal(value: str, type_: typing.Any) -> typing.Any:
+    for option in type_.__args__:
+        if str(option) == value:
+            return option
+
+    raise ValueError("{0!r} is not one of {1!r}".format(value, type_.__args__))
+
+
+parsers = ParserRegistry()
+
+parsers.register(datetime.date, _parse_isoformat)
+parsers.register(datetime.time, _parse_isoformat)
+parsers.register(datetime.timedelta, _parse_timedelta)
+parsers.register(decimal.Decimal, _parse_decimal)
+parsers.register(pathlib.PurePath, _parse_path)
+parsers.register(ByteSize, _parse_byte_size)
+parsers.register(enum.Enum, _parse_enum)
+
+if _LITERAL is not None:
+    parsers.register(_LITERAL, _parse_literal)
 
+register_parser = parsers.register
 
 config = Config()